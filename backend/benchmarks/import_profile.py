@@ -0,0 +1,98 @@
+"""
+Import-time profile of the backend, i.e. what a worker pays on cold start
+before it can serve its first request.
+
+Imports a module (src.main by default) in fresh interpreters with
+`python -X importtime`. Reports the median wall time and the time spent
+importing each top-level package, and flags any heavy SDK that is imported
+eagerly even though it should be loaded on first use (see src/utils/lazy.py).
+Run from backend/:
+
+    uv run python -m benchmarks.import_profile
+    uv run python -m benchmarks.import_profile --runs 10 --json > imports.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# SDKs that should only be imported when a route actually uses them
+DEFERRED = ("openai", "supabase", "supabase_auth", "gspread", "google.oauth2", "opencage")
+
+_CHILD = """
+import json, sys, time
+started = time.perf_counter()
+import {module}
+elapsed = time.perf_counter() - started
+print(json.dumps([elapsed, [name for name in {deferred!r} if name in sys.modules]]))
+"""
+
+
+def profile_once(module: str) -> tuple[float, dict[str, float], list[str]]:
+    env = {
+        **os.environ,
+        "SUPABASE_URL": os.getenv("SUPABASE_URL", "http://localhost:54321"),
+        "SUPABASE_KEY": os.getenv("SUPABASE_KEY", "profile"),
+    }
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD.format(module=module, deferred=DEFERRED)],
+        capture_output=True, text=True, cwd=BACKEND_DIR, env=env, check=True,
+    )
+    elapsed, loaded = json.loads(result.stdout.strip().splitlines()[-1])
+
+    # "import time: self [us] | cumulative | imported package" lines
+    by_package: dict[str, float] = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        package = name.strip().split(".")[0]
+        by_package[package] = by_package.get(package, 0) + int(self_us) / 1000
+    return elapsed * 1000, by_package, loaded
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="src.main")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="packages to list")
+    parser.add_argument("--json", action="store_true", help="print a JSON report")
+    args = parser.parse_args()
+
+    totals, packages, loaded = [], {}, set()
+    for _ in range(args.runs):
+        elapsed, by_package, eager = profile_once(args.module)
+        totals.append(elapsed)
+        loaded.update(eager)
+        for package, ms in by_package.items():
+            packages.setdefault(package, []).append(ms)
+
+    report = {
+        "module": args.module,
+        "runs": args.runs,
+        "median_ms": round(statistics.median(totals), 1),
+        "min_ms": round(min(totals), 1),
+        "packages_ms": {
+            package: round(statistics.median(times), 1)
+            for package, times in sorted(packages.items(), key=lambda item: -statistics.median(item[1]))[:args.top]
+        },
+        "eagerly_imported": sorted(loaded),
+    }
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"import {args.module}: median {report['median_ms']}ms, best {report['min_ms']}ms over {args.runs} runs\n")
+    for package, ms in report["packages_ms"].items():
+        print(f"  {package:<24} {ms:>8.1f}ms")
+    if loaded:
+        print(f"\nImported at startup but meant to be lazy: {', '.join(sorted(loaded))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Load test for the backend against a throwaway local MongoDB.
+
+Starts mongod on a free port with a temporary data directory (or uses
+--mongo-uri), seeds a synthetic catalog, and drives the app in-process
+through httpx's ASGI transport, so results measure the backend and MongoDB
+rather than the network. Supabase auth, geocoding and OpenAI are replaced
+with local fakes.
+
+Run from backend/:
+
+    uv run python -m benchmarks.load_test --resources 10000 --concurrency 32 --output results.json
+    uv run python -m benchmarks.load_test --scenarios list_resources,get_resource --compare results.json
+
+Prints (or writes) a JSON report with throughput and latency percentiles
+per scenario. With --compare, also prints the change against an earlier
+report, e.g. one produced on the previous commit.
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from typing import Callable
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+BENCH_DB = "the-contributor-bench"
+ADMIN_TOKEN = "bench-admin"
+
+
+@contextmanager
+def local_mongod(binary: str):
+    """Run a disposable mongod and yield its URI."""
+    if shutil.which(binary) is None:
+        sys.exit(f"{binary} not found; install MongoDB or pass --mongo-uri")
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+
+    data_dir = tempfile.mkdtemp(prefix="bench-mongod-")
+    process = subprocess.Popen(
+        [binary, "--dbpath", data_dir, "--port", str(port), "--bind_ip", "127.0.0.1", "--quiet"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    try:
+        yield f"mongodb://127.0.0.1:{port}/?directConnection=true"
+    finally:
+        process.terminate()
+        process.wait(timeout=30)
+        shutil.rmtree(data_dir, ignore_errors=True)
+
+
+def wait_for_mongo(uri: str, timeout: float = 30):
+    from pymongo import MongoClient
+
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            with MongoClient(uri, serverSelectionTimeoutMS=500) as client:
+                client.admin.command("ping")
+                return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.2)
+
+
+def seed(uri: str, args) -> dict:
+    """Fill the benchmark database and return the ids the scenarios need."""
+    from pymongo import MongoClient
+    from benchmarks import synthetic
+
+    rng = random.Random(args.seed)
+    with MongoClient(uri) as client:
+        client.drop_database(BENCH_DB)
+        db = client[BENCH_DB]
+
+        resources = synthetic.catalog(args.resources, seed=args.seed)
+        for start in range(0, len(resources), 5000):
+            db["resources"].insert_many(resources[start:start + 5000])
+        db["resources"].create_index("org_name")
+
+        # one pending submission per approve request
+        pending = []
+        for i in range(args.requests):
+            doc = synthetic.resource(args.resources + i, rng)
+            doc.pop("removed"), doc.pop("coordinates"), doc.pop("created_at")
+            pending.append({**doc, "add": True, "submitted_at": datetime.now(timezone.utc)})
+        pending_ids = [str(_id) for _id in db["pending"].insert_many(pending).inserted_ids]
+
+        db["admins"].insert_one({"supabase_id": "admin-0", "email": "bench@thecontributor.org", "name": "Bench Admin"})
+        db["vendors"].insert_many([
+            {
+                "vendor_id": f"{i:04d}",
+                "supabase_id": f"vendor-{i}",
+                "name": f"Vendor {i}",
+                "is_clocked_in": True,
+                "clocked_in_at": datetime.now(timezone.utc),
+                "location": {"latitude": synthetic.CENTER_LAT, "longitude": synthetic.CENTER_LNG},
+            }
+            for i in range(args.vendors)
+        ])
+
+        resource_ids = [str(doc["_id"]) for doc in db["resources"].find({"removed": False}, {"_id": 1})]
+        org_names = [doc["org_name"] for doc in db["resources"].find({"removed": False}, {"org_name": 1})]
+
+    return {"resource_ids": resource_ids, "org_names": org_names, "pending_ids": pending_ids}
+
+
+def install_fakes(app):
+    """Replace Supabase auth, geocoding and OpenAI with local stand-ins."""
+    import hashlib
+    import httpx
+    from openai import AsyncOpenAI
+    import src.utils.utils as utils
+    import src.chatbot.service as chatbot_service
+    from src.admin import middleware as admin_middleware
+    from src.vendor import middleware as vendor_middleware
+    from src.chatbot import stub_server
+    from fastapi import Depends
+    from fastapi.security import HTTPBearer
+
+    bearer = HTTPBearer()
+
+    # tokens are the Supabase user ids themselves
+    async def fake_verify_token(credentials=Depends(bearer)):
+        token = credentials.credentials
+        email = "bench@thecontributor.org" if token == ADMIN_TOKEN else f"{token}@internal.contributor"
+        return SimpleNamespace(id="admin-0" if token == ADMIN_TOKEN else token, email=email)
+
+    app.dependency_overrides[admin_middleware.verify_token] = fake_verify_token
+    app.dependency_overrides[vendor_middleware.verify_token] = fake_verify_token
+
+    # deterministic coordinates near Nashville instead of calling OpenCage
+    def fake_geocode(address: str):
+        digest = hashlib.blake2b(address.encode(), digest_size=4).digest()
+        return {"lat": 36.0 + digest[0] / 1000, "lng": -86.9 + digest[1] / 1000}
+
+    utils._geocode_address = fake_geocode
+
+    stub_server.STUB_FIRST_TOKEN_MS = float(os.getenv("STUB_FIRST_TOKEN_MS", "50"))
+    stub_server.STUB_TOKEN_MS = float(os.getenv("STUB_TOKEN_MS", "5"))
+    chatbot_service._client = AsyncOpenAI(
+        api_key="stub",
+        base_url="http://stub/v1",
+        max_retries=0,
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=stub_server.app)),
+    )
+
+
+@dataclass
+class Scenario:
+    name: str
+    # request number -> (method, url, httpx request kwargs)
+    request: Callable[[int], tuple[str, str, dict]]
+
+
+def scenarios(data: dict, args) -> dict[str, Scenario]:
+    from benchmarks import synthetic
+
+    rng = random.Random(args.seed)
+    resource_ids, org_names, pending_ids = data["resource_ids"], data["org_names"], data["pending_ids"]
+    admin = {"Authorization": f"Bearer {ADMIN_TOKEN}"}
+
+    def vendor(i: int) -> dict:
+        return {"Authorization": f"Bearer vendor-{i % args.vendors}"}
+
+    def form(i: int):
+        raw = synthetic.jotform_raw_request(10_000_000 + i, rng)
+        return "POST", "/resources/form", {"data": synthetic.jotform_form_fields(raw)}
+
+    def location(i: int):
+        body = {
+            "latitude": synthetic.CENTER_LAT + rng.uniform(-0.1, 0.1),
+            "longitude": synthetic.CENTER_LNG + rng.uniform(-0.1, 0.1),
+        }
+        return "PATCH", "/auth/location", {"json": body, "headers": vendor(i)}
+
+    def event(i: int):
+        body = {"id": f"device-{rng.randrange(10_000)}", "event": "resource_viewed", "resource_id": rng.choice(resource_ids)}
+        return "POST", "/api/analytics/event", {"json": body}
+
+    return {s.name: s for s in [
+        Scenario("list_resources", lambda i: ("GET", "/resources/", {})),
+        Scenario("get_resource", lambda i: ("GET", f"/resources/{rng.choice(resource_ids)}", {})),
+        Scenario("get_resource_by_name", lambda i: ("GET", f"/resources/{rng.choice(org_names)}", {"params": {"search_by": "org_name"}})),
+        Scenario("form_intake", form),
+        Scenario("approve", lambda i: ("POST", f"/resources/pending/{pending_ids[i % len(pending_ids)]}/approve", {"headers": admin})),
+        Scenario("vendor_location", location),
+        Scenario("vendors_nearest", lambda i: ("GET", "/vendors/nearest", {"params": {"lat": synthetic.CENTER_LAT, "lng": synthetic.CENTER_LNG, "k": 10}})),
+        Scenario("analytics_event", event),
+        Scenario("chatbot", lambda i: ("POST", "/chatbot/", {"json": {"message": f"where can I get food {i % 50}"}})),
+    ]}
+
+
+def percentile(sorted_values: list[float], q: float) -> float | None:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, max(0, round(q * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+async def run_scenario(client, scenario: Scenario, requests: int, concurrency: int, warmup: int) -> dict:
+    for i in range(warmup):
+        method, url, kwargs = scenario.request(i)
+        await client.request(method, url, **kwargs)
+
+    latencies: list[float] = []
+    statuses: dict[str, int] = {}
+    next_request = warmup
+
+    async def worker():
+        nonlocal next_request
+        while next_request < warmup + requests:
+            i = next_request
+            next_request += 1
+            method, url, kwargs = scenario.request(i)
+            started = time.perf_counter()
+            response = await client.request(method, url, **kwargs)
+            await response.aread()
+            latencies.append(time.perf_counter() - started)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    ms = lambda value: None if value is None else round(value * 1000, 2)
+    return {
+        "requests": len(latencies),
+        "errors": sum(n for status, n in statuses.items() if not status.startswith("2")),
+        "statuses": statuses,
+        "throughput_rps": round(len(latencies) / elapsed, 1),
+        "mean_ms": ms(sum(latencies) / len(latencies)) if latencies else None,
+        "p50_ms": ms(percentile(latencies, 0.50)),
+        "p90_ms": ms(percentile(latencies, 0.90)),
+        "p99_ms": ms(percentile(latencies, 0.99)),
+        "max_ms": ms(latencies[-1]) if latencies else None,
+    }
+
+
+async def drive(args, data: dict) -> dict:
+    import httpx
+    from src.main import app
+
+    install_fakes(app)
+    available = scenarios(data, args)
+    selected = args.scenarios.split(",") if args.scenarios else list(available)
+    unknown = [name for name in selected if name not in available]
+    if unknown:
+        sys.exit(f"Unknown scenario(s): {', '.join(unknown)}. Available: {', '.join(available)}")
+
+    results = {}
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+            for name in selected:
+                # approvals use up pending submissions, so they get no warm-up
+                warmup = 0 if name == "approve" else args.warmup
+                results[name] = await run_scenario(client, available[name], args.requests, args.concurrency, warmup)
+                print(f"{name}: {results[name]['throughput_rps']} req/s, p50 {results[name]['p50_ms']}ms, "
+                      f"p99 {results[name]['p99_ms']}ms", file=sys.stderr)
+    return results
+
+
+def git_commit() -> str | None:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=BACKEND_DIR, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def compare(report: dict, baseline: dict):
+    print(f"\nAgainst {baseline['meta'].get('commit')}:", file=sys.stderr)
+    for name, result in report["results"].items():
+        before = baseline["results"].get(name)
+        if not before:
+            continue
+        changes = []
+        for key in ("throughput_rps", "p50_ms", "p99_ms"):
+            if before.get(key) and result.get(key) is not None:
+                changes.append(f"{key} {(result[key] / before[key] - 1) * 100:+.1f}%")
+        print(f"  {name}: {', '.join(changes)}", file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--resources", type=int, default=1000, help="catalog size (default 1000)")
+    parser.add_argument("--vendors", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=500, help="measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=20, help="unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--scenarios", help="comma-separated scenario names (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--mongo-uri", help="use this MongoDB instead of starting mongod")
+    parser.add_argument("--mongod", default=os.getenv("MONGOD", "mongod"), help="mongod binary")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    parser.add_argument("--compare", help="earlier JSON report to compare against")
+    args = parser.parse_args()
+
+    # the app reads these at import time
+    os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+    os.environ.setdefault("SUPABASE_KEY", "bench")
+    os.environ.setdefault("OPENAI_API_KEY", "stub")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+    with (local_mongod(args.mongod) if not args.mongo_uri else _existing(args.mongo_uri)) as uri:
+        wait_for_mongo(uri)
+        os.environ["MONGODB_URI"] = uri
+        data = seed(uri, args)
+
+        import src.config.database as db_module
+        db_module.mongo_key = uri
+        db_module.DB_NAME = BENCH_DB
+
+        results = asyncio.run(drive(args, data))
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "resources": args.resources,
+            "vendors": args.vendors,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(report, json.load(f))
+
+
+@contextmanager
+def _existing(uri: str):
+    yield uri
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+A small pytest-benchmark-style fixture, kept in-tree so the suite needs no
+extra dependency.
+
+`bench(func, *args)` measures the ops/sec of one call (best of several
+timed rounds) and the peak memory it allocates (with tracemalloc), and
+compares both with the baseline saved by an earlier `--bench-save` run.
+The benchmark fails if it got slower, or allocates more, by more than
+--bench-threshold (default 20%).
+
+Baselines depend on the machine, so they aren't committed: save one on the
+base commit, then run the suite on your change.
+"""
+import gc
+import json
+import os
+import sys
+import timeit
+import tracemalloc
+
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+# the app reads these at import time; none of the benchmarks talk to Supabase
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+os.environ.setdefault("SUPABASE_KEY", "bench")
+os.environ.setdefault("LOG_LEVEL", "WARNING")
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".baseline.json")
+
+ROUNDS = 5
+
+
+def pytest_addoption(parser):
+    parser.addoption("--bench-save", action="store_true", help="save the results as the new baseline")
+    parser.addoption("--bench-baseline", default=DEFAULT_BASELINE, help="baseline JSON file")
+    parser.addoption("--bench-threshold", type=float, default=0.2,
+                     help="fail when ops/sec drops, or allocations grow, by more than this fraction")
+
+
+def pytest_configure(config):
+    config._bench_results = {}
+
+
+def pytest_sessionfinish(session, exitstatus):
+    config = session.config
+    results = config._bench_results
+    if not results:
+        return
+
+    width = max(len(name) for name in results)
+    lines = [f"{'benchmark':<{width}}  {'ops/sec':>12}  {'peak alloc':>12}"]
+    for name, result in sorted(results.items()):
+        lines.append(f"{name:<{width}}  {result['ops_per_sec']:>12,.0f}  {result['peak_bytes']:>10,} B")
+    print("\n" + "\n".join(lines))
+
+    if config.getoption("--bench-save"):
+        path = config.getoption("--bench-baseline")
+        baseline = _load(path)
+        baseline.update(results)
+        with open(path, "w") as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+        print(f"Saved baseline to {path}")
+
+
+def _load(path: str) -> dict:
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+
+
+def _measure(func, args) -> dict:
+    timer = timeit.Timer(lambda: func(*args))
+    # enough calls per round to take at least 0.2s
+    number, _ = timer.autorange()
+    best = min(timer.repeat(repeat=ROUNDS, number=number)) / number
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        func(*args)  # warm up caches so they aren't counted
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        func(*args)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {"ops_per_sec": round(1 / best, 1), "peak_bytes": peak - before}
+
+
+@pytest.fixture
+def bench(request):
+    config = request.config
+    name = request.node.name
+    baseline = _load(config.getoption("--bench-baseline")).get(name)
+    threshold = config.getoption("--bench-threshold")
+
+    def run(func, *args):
+        result = _measure(func, args)
+        config._bench_results[name] = result
+
+        if baseline and not config.getoption("--bench-save"):
+            slower = 1 - result["ops_per_sec"] / baseline["ops_per_sec"]
+            if slower > threshold:
+                pytest.fail(f"{name}: {result['ops_per_sec']:,.0f} ops/sec is {slower:.0%} slower "
+                            f"than the baseline's {baseline['ops_per_sec']:,.0f}")
+            # a few hundred bytes of noise shouldn't fail tiny allocations
+            if result["peak_bytes"] > baseline["peak_bytes"] * (1 + threshold) + 512:
+                pytest.fail(f"{name}: allocates {result['peak_bytes']:,} bytes at peak, "
+                            f"up from {baseline['peak_bytes']:,}")
+        return result
+
+    return run
@@ -0,0 +1,146 @@
+"""Per-row and per-request transforms on the resource read and intake paths."""
+import asyncio
+import random
+
+import pytest
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from benchmarks import synthetic
+from src.controllers.resource_controller import get_resources, parse_fields
+from src.schemas.resource import Resource
+from src.utils.responses import FastJSONResponse
+from src.utils.utils import extract_field_data, normalize_sheet_resource
+
+CATALOG_SIZE = 1000
+LARGE_CATALOG_SIZE = 10_000
+
+
+@pytest.fixture(scope="module")
+def catalog():
+    return [{"_id": ObjectId(), **doc} for doc in synthetic.catalog(CATALOG_SIZE, seed=1)]
+
+
+@pytest.fixture(scope="module")
+def large_catalog():
+    return [{"_id": ObjectId(), **doc} for doc in synthetic.catalog(LARGE_CATALOG_SIZE, seed=1)]
+
+
+class _Cursor:
+    """Stands in for an AsyncCursor, handing out fresh dicts as the driver would decode them."""
+
+    def __init__(self, docs):
+        self._docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return dict(next(self._docs))
+        except StopIteration:
+            raise StopAsyncIteration
+
+    async def to_list(self, length=None):
+        return [doc async for doc in self]
+
+
+class _Collection:
+    def __init__(self, docs):
+        self.docs = docs
+        # projection -> what the server would send back for it
+        self._aggregated: dict[tuple | None, list[dict]] = {}
+
+    def find(self, query=None, projection=None):
+        return _Cursor(self.docs)
+
+    async def aggregate(self, pipeline):
+        projection = next((stage["$project"] for stage in pipeline if "$project" in stage), None)
+        return _Cursor(self.aggregated(projection))
+
+    def aggregated(self, projection: dict | None) -> list[dict]:
+        """
+        Apply the $project and the $toString on _id, as the server would. Done
+        once per projection, so call it before timing: it isn't part of what
+        we measure.
+        """
+        key = None if projection is None else tuple(sorted(projection))
+        if key not in self._aggregated:
+            docs = self.docs
+            if projection is not None:
+                docs = [{k: v for k, v in doc.items() if k in projection} for doc in docs]
+            self._aggregated[key] = [{**doc, "_id": str(doc["_id"])} for doc in docs]
+        return self._aggregated[key]
+
+
+def _projection(fields: list[str] | None) -> dict | None:
+    """The $project get_resources sends for `fields`."""
+    return None if fields is None else {field: 1 for field in fields}
+
+
+async def _get_resources_per_document(collection):
+    """GET /resources/ before the aggregate and FastJSONResponse, for comparison."""
+    resources = []
+    async for document in collection.find({}):
+        document["_id"] = str(document["_id"])
+        resources.append(document)
+    return JSONResponse(jsonable_encoder({"success": True, "active": False, "resources": resources}))
+
+
+def bench_normalize_sheet_resource(bench):
+    row = synthetic.sheet_row(0, random.Random(1))
+    bench(normalize_sheet_resource, row)
+
+
+def bench_extract_field_data(bench):
+    raw = synthetic.jotform_raw_request(0, random.Random(1))
+    bench(extract_field_data, raw)
+
+
+def bench_resource_validate(bench, catalog):
+    doc = {k: v for k, v in catalog[0].items() if k != "_id"}
+    bench(lambda: Resource(**doc))
+
+
+def bench_resource_model_dump(bench, catalog):
+    resource = Resource(**{k: v for k, v in catalog[0].items() if k != "_id"})
+    bench(resource.model_dump)
+
+
+def bench_get_resources_loop(bench, catalog):
+    """The whole catalog through get_resources, minus the database round trip."""
+    collection = _Collection(catalog)
+    collection.aggregated(None)
+    loop = asyncio.new_event_loop()
+    try:
+        bench(lambda: loop.run_until_complete(get_resources(collection, active=False, check_removed=True)))
+    finally:
+        loop.close()
+
+
+def bench_list_response_per_document(bench, large_catalog):
+    """Baseline for bench_list_response: rewrite each document, then jsonable_encoder."""
+    collection = _Collection(large_catalog)
+    loop = asyncio.new_event_loop()
+    try:
+        bench(lambda: loop.run_until_complete(_get_resources_per_document(collection)).body)
+    finally:
+        loop.close()
+
+
+@pytest.mark.parametrize("fields", ["full", "summary"])
+def bench_list_response(bench, large_catalog, fields):
+    """GET /resources/ at 10k resources, from the cursor to the encoded body."""
+    collection = _Collection(large_catalog)
+    projection = parse_fields(fields)
+    collection.aggregated(_projection(projection))
+    loop = asyncio.new_event_loop()
+
+    async def respond():
+        return FastJSONResponse(await get_resources(collection, active=False, check_removed=True, fields=projection))
+
+    try:
+        bench(lambda: loop.run_until_complete(respond()).body)
+    finally:
+        loop.close()
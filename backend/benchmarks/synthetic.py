@@ -0,0 +1,146 @@
+"""
+Synthetic but realistically shaped data for the benchmarks: catalog
+resources, Google Sheets rows and JotForm webhook payloads.
+
+Everything is generated from a seeded random.Random, so the same size and
+seed always produce the same data and runs on different commits compare
+like for like.
+"""
+import json
+import random
+from datetime import datetime, timezone
+
+from src.schemas.resource import CategoryChoices, GroupChoices
+from src.utils.utils import _SUBCATEGORY_TO_CATEGORY
+
+# subcategories whose category is one the Resource schema accepts
+SUBCATEGORIES = sorted(
+    sub for sub, cat in _SUBCATEGORY_TO_CATEGORY.items() if cat in {c.value for c in CategoryChoices}
+)
+GROUPS = [group.value for group in GroupChoices]
+
+# downtown Nashville; resources are scattered around it
+CENTER_LAT, CENTER_LNG = 36.1627, -86.7816
+
+_WORDS = (
+    "free meals showers laundry clothing shelter beds case management counseling legal aid id "
+    "replacement birth certificates bus passes job training resume help food boxes pantry "
+    "medical clinic dental care prescriptions recovery support groups housing vouchers rent "
+    "assistance utilities childcare tutoring veterans services translation phone charging mail"
+).split()
+_STREETS = ["Charlotte Ave", "Broadway", "Lafayette St", "Dickerson Pike", "Nolensville Pike", "Gallatin Ave", "Jefferson St"]
+_HOURS = ["Mon-Fri 8am-4pm", "Daily 6pm-7am", "Tue & Thu 9am-12pm", "Mon-Sat 7am-3pm", "24/7"]
+
+
+def _sentence(rng: random.Random, low: int, high: int) -> str:
+    return " ".join(rng.choices(_WORDS, k=rng.randint(low, high))).capitalize() + "."
+
+
+def _address(rng: random.Random) -> str:
+    return f"{rng.randint(100, 4999)} {rng.choice(_STREETS)}"
+
+
+def resource(i: int, rng: random.Random) -> dict:
+    """A resource document as stored in the resources collection (without _id)."""
+    subcategory = rng.choice(SUBCATEGORIES)
+    return {
+        "name": f"Contact {i}",
+        "email": f"contact{i}@example.org",
+        "phone": 6150000000 + i,
+        "org_name": f"Synthetic Org {i:06d}",
+        "page": rng.randint(1, 40),
+        "category": _SUBCATEGORY_TO_CATEGORY[subcategory],
+        "subcategory": subcategory,
+        "group": rng.choice(GROUPS),
+        "bus_line": f"{rng.randint(1, 56)} {rng.choice(_STREETS)}",
+        "hours": rng.choice(_HOURS),
+        "services": _sentence(rng, 10, 40),
+        "id_required": rng.random() < 0.3,
+        "requirements": _sentence(rng, 3, 15),
+        "app_process": _sentence(rng, 3, 15),
+        "other": _sentence(rng, 0, 10) if rng.random() < 0.5 else None,
+        "address": _address(rng),
+        "city": "Nashville",
+        "state": "TN",
+        "zip_code": f"372{rng.randint(0, 99):02d}",
+        "website": f"https://org{i}.example.org",
+        "org_phones": f"(615) {rng.randint(200, 999)}-{rng.randint(1000, 9999)}",
+        "org_email": f"info@org{i}.example.org",
+        "removed": rng.random() < 0.05,
+        "coordinates": {
+            "latitude": CENTER_LAT + rng.uniform(-0.15, 0.15),
+            "longitude": CENTER_LNG + rng.uniform(-0.15, 0.15),
+        },
+        "created_at": datetime(2025, 1, 1, tzinfo=timezone.utc),
+    }
+
+
+def catalog(size: int, seed: int = 0) -> list[dict]:
+    rng = random.Random(seed)
+    return [resource(i, rng) for i in range(size)]
+
+
+def sheet_row(i: int, rng: random.Random) -> dict:
+    """A row as returned by gspread's get_all_records(), with the tab name injected as subcategory."""
+    doc = resource(i, rng)
+    return {
+        "Category": doc["group"],
+        "Org Name": doc["org_name"],
+        "Bus Line": doc["bus_line"],
+        "Hours": doc["hours"],
+        "Services Provided": doc["services"],
+        "Requirements": doc["requirements"],
+        "Application Process": doc["app_process"],
+        "Other": doc["other"] or "",
+        "Address": doc["address"],
+        "City": doc["city"],
+        "State": doc["state"],
+        "Zip": doc["zip_code"],
+        "Website": doc["website"],
+        "Phone": doc["org_phones"],
+        "subcategory": doc["subcategory"],
+    }
+
+
+def jotform_raw_request(i: int, rng: random.Random, adding: bool = True, org_name: str | None = None) -> dict:
+    """The decoded rawRequest of a JotForm webhook submission."""
+    doc = resource(i, rng)
+    raw = {
+        "slug": "submit/250000000000000",
+        "event_id": f"{i}_{rng.randint(0, 10**9)}",
+        "q5_yourName": {"first": "Pat", "last": f"Submitter{i}"},
+        "q6_yourEmail": doc["email"],
+        "q7_yourPhone": {"full": f"(615) 555-{i % 10000:04d}"},
+        "q8_yourOrganization": org_name or doc["org_name"],
+        "q9_editOrAdd": "I am adding a new resource" if adding else "I am editing an existing resource",
+        "q11_pageNumber": str(doc["page"]),
+        "q27_category": doc["category"],
+        "q13_orgPhones": doc["org_phones"],
+        "q14_orgAddress": doc["address"],
+        "q15_orgWebsite": doc["website"],
+        "q16_orgEmail": doc["org_email"],
+        "q17_hoursOpen": doc["hours"],
+        "q18_services": doc["services"],
+        "q19_requirements": doc["requirements"],
+        "q20_appProcess": doc["app_process"],
+        "q23_city": doc["city"],
+        "q24_state": doc["state"],
+        "q25_zipCode": doc["zip_code"],
+        "q26_other": doc["other"] or "",
+        "q28_busLine": doc["bus_line"],
+        "q22_upatedOrgName": "",
+    }
+    # the form has one subcategory and one group question per category; only one of each is answered
+    for key in ["q35_subcategoryUnder", "q36_typeA36", "q37_subcategoryUnder37",
+                "q39_subcategoryUnder39", "q40_subcategoryUnder40", "q41_subcategoryUnder41"]:
+        raw[key] = ""
+    for n in range(42, 72):
+        raw["q42_groupUnder" if n == 42 else f"q{n}_groupUnder{n}"] = ""
+    raw["q35_subcategoryUnder"] = doc["subcategory"]
+    raw["q42_groupUnder"] = doc["group"]
+    return raw
+
+
+def jotform_form_fields(raw_request: dict) -> dict:
+    """The multipart form fields JotForm posts to POST /resources/form."""
+    return {"formID": "250000000000000", "submissionID": raw_request["event_id"], "rawRequest": json.dumps(raw_request)}
@@ -1,15 +1,17 @@
 from fastapi import HTTPException, Depends
 from fastapi.security import HTTPBearer
-from supabase_auth.errors import AuthApiError
+from src.utils.lazy import LazyModule
 from src.config.database import get_admin_collection, supabase
 
+auth_errors = LazyModule("supabase_auth.errors")
+
 bearer_scheme = HTTPBearer()
 
 
 async def verify_token(credentials=Depends(bearer_scheme)):
     try:
         user_response = supabase.auth.get_user(credentials.credentials)
-    except AuthApiError:
+    except auth_errors.AuthApiError:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
 
     if not user_response.user:
@@ -1,10 +1,15 @@
 import os
-from fastapi import APIRouter, HTTPException, status, Depends
+from datetime import datetime, timedelta, timezone
+from fastapi import APIRouter, HTTPException, status, Depends, Query
 from typing import List
-from supabase_auth.errors import AuthApiError
+from src.utils.lazy import LazyModule
 from src.schemas.user import AdminRegisterRequest, AdminLoginRequest, AdminChangePasswordRequest, VendorCreateRequest
 from src.admin.middleware import get_current_admin
 from src.config.database import get_admin_collection, get_vendor_users_collection, supabase, supabase_admin
+from src.vendor.spatial_index import active_vendor_index
+from src.vendor.location_history import get_vendor_track
+
+auth_errors = LazyModule("supabase_auth.errors")
 
 VENDOR_TEMP_PASSWORD = os.getenv("VENDOR_TEMP_PASSWORD")
 
@@ -19,7 +24,7 @@ async def admin_register(body: AdminRegisterRequest):
 
     try:
         auth_response = supabase.auth.sign_up({"email": body.email, "password": body.password})
-    except AuthApiError as e:
+    except auth_errors.AuthApiError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
     if not auth_response.user:
@@ -44,7 +49,7 @@ async def admin_login(body: AdminLoginRequest):
 
     try:
         auth_response = supabase.auth.sign_in_with_password({"email": email, "password": body.password})
-    except AuthApiError:
+    except auth_errors.AuthApiError:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
     admin = await get_admin_collection().find_one({"supabase_id": auth_response.user.id}, {"_id": 0})
@@ -73,7 +78,7 @@ async def admin_change_password(body: AdminChangePasswordRequest, current_admin:
     supabase_id = current_admin["supabase_id"]
     try:
         supabase_admin.auth.admin.update_user_by_id(supabase_id, {"password": body.password})
-    except AuthApiError as e:
+    except auth_errors.AuthApiError as e:
         raise HTTPException(status_code=400, detail=str(e))
     auth_response = supabase.auth.sign_in_with_password({"email": current_admin["email"], "password": body.password})
     return {"access_token": auth_response.session.access_token, "refresh_token": auth_response.session.refresh_token}
@@ -89,7 +94,7 @@ async def create_vendor(data: VendorCreateRequest, current_admin: dict = Depends
     try:
         auth_response = supabase.auth.sign_up({"email": internal_email, "password": VENDOR_TEMP_PASSWORD})
         supabase_id = auth_response.user.id
-    except AuthApiError as e:
+    except auth_errors.AuthApiError as e:
         raise HTTPException(status_code=400, detail=str(e))
 
     try:
@@ -129,6 +134,34 @@ async def get_vendor_by_id(vendor_id: str, current_admin: dict = Depends(get_cur
     return {"vendor": vendor}
 
 
+@router.get("/vendors/{vendor_id}/track", status_code=status.HTTP_200_OK)
+async def get_vendor_location_track(
+    vendor_id: str,
+    start: datetime | None = None,
+    end: datetime | None = None,
+    max_points: int = Query(500, ge=2, le=5000),
+    current_admin: dict = Depends(get_current_admin)
+):
+    """
+    Get where a vendor has been between `start` and `end` (default: the last 24 hours),
+    simplified to at most `max_points` points. Datetimes without a timezone are read as UTC.
+
+    Example:
+        GET /admin/vendors/0001/track?start=2025-11-01T08:00:00Z&end=2025-11-01T18:00:00Z&max_points=200
+    """
+    end = end or datetime.now(timezone.utc)
+    start = start or end - timedelta(hours=24)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+
+    return await get_vendor_track(vendor_id, start, end, max_points)
+
+
 @router.delete("/vendors/{vendor_id}", status_code=status.HTTP_200_OK)
 async def delete_vendor(vendor_id: str, current_admin: dict = Depends(get_current_admin)):
     vendors = get_vendor_users_collection()
@@ -140,4 +173,5 @@ async def delete_vendor(vendor_id: str, current_admin: dict = Depends(get_curren
         supabase_admin.auth.admin.delete_user(vendor["supabase_id"])
 
     await vendors.delete_one({"vendor_id": vendor_id})
+    active_vendor_index.remove(vendor_id)
     return {"message": "Vendor deleted successfully"}
@@ -0,0 +1,226 @@
+import math
+import os
+import random
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from src.config.database import get_resource_engagement_collection, get_resources_collection
+from src.config.logger import get_logger
+from src.utils.background import PeriodicTask
+from src.utils.cache import TTLCache
+from src.utils.geo import KM_PER_DEGREE, haversine_km
+
+logger = get_logger(__name__)
+
+ENGAGEMENT_FLUSH_SECONDS = float(os.getenv("ENGAGEMENT_FLUSH_SECONDS", "30"))
+
+# each resource's counts are spread over this many documents so that busy
+# resources don't turn into a single hot document that every flush contends on
+ENGAGEMENT_SHARDS = int(os.getenv("ENGAGEMENT_SHARDS", "8"))
+
+# how long the popularity ranking is reused before it is aggregated again
+POPULAR_CACHE_SECONDS = float(os.getenv("POPULAR_CACHE_SECONDS", "60"))
+
+# most popular resources read when filtering by distance; the bounding box
+# match in the aggregation returns a few from its corners that are dropped after
+POPULAR_CANDIDATES = 500
+
+POPULAR_CACHE_MAX_ENTRIES = int(os.getenv("POPULAR_CACHE_MAX_ENTRIES", "256"))
+
+# "popular near you" without a radius_km searches this far
+POPULAR_NEAR_RADIUS_KM = float(os.getenv("POPULAR_NEAR_RADIUS_KM", "10"))
+
+# engagement event -> counter field
+ENGAGEMENT_FIELDS = {
+    "resource_viewed": "views",
+    "resource_called": "calls",
+    "resource_directions": "directions",
+}
+
+# calling or navigating to a resource says more than opening it
+ENGAGEMENT_WEIGHTS = {"views": 1, "calls": 3, "directions": 3}
+
+
+class EngagementCounters:
+    """
+    In-memory per-resource engagement counters, flushed periodically as $inc
+    bulk updates.
+
+    Every flush writes each resource's counts to one of ENGAGEMENT_SHARDS
+    documents picked at random, so concurrent flushes from different workers
+    rarely touch the same document. Reads sum the shards.
+    """
+
+    def __init__(self):
+        # resource_id -> counter field -> count
+        self._counts: dict[str, dict[str, int]] = {}
+        self._task = PeriodicTask("resource-engagement-flush", ENGAGEMENT_FLUSH_SECONDS, self.flush)
+
+    def add(self, resource_id: str, event: str):
+        counts = self._counts.setdefault(resource_id, {})
+        field = ENGAGEMENT_FIELDS[event]
+        counts[field] = counts.get(field, 0) + 1
+
+    async def flush(self) -> int:
+        """Write the counts gathered since the last flush. Returns the number of resources updated."""
+        if not self._counts:
+            return 0
+
+        batch, self._counts = self._counts, {}
+        try:
+            known = await self._existing(list(batch))
+        except Exception:
+            self._merge_back(batch)
+            raise
+
+        ops = []
+        for resource_id, counts in batch.items():
+            # anyone can post events, so don't create counters for resources that don't exist
+            if resource_id not in known:
+                continue
+            shard = random.randrange(ENGAGEMENT_SHARDS)
+            increments = {f"counts.{field}": n for field, n in counts.items()}
+            increments["score"] = sum(ENGAGEMENT_WEIGHTS[field] * n for field, n in counts.items())
+            ops.append(UpdateOne(
+                {"_id": f"{resource_id}:{shard}"},
+                {"$inc": increments, "$setOnInsert": {"resource_id": resource_id, "shard": shard}},
+                upsert=True
+            ))
+
+        if len(known) < len(batch):
+            logger.warning(f"Dropped engagement counts for {len(batch) - len(known)} unknown resource id(s)")
+        if not ops:
+            return 0
+
+        try:
+            await get_resource_engagement_collection().bulk_write(ops, ordered=False)
+        except Exception:
+            self._merge_back({resource_id: batch[resource_id] for resource_id in known})
+            raise
+
+        logger.debug(f"Flushed engagement counts for {len(ops)} resources")
+        return len(ops)
+
+    @staticmethod
+    async def _existing(resource_ids: list[str]) -> set[str]:
+        ids = [ObjectId(resource_id) for resource_id in resource_ids if ObjectId.is_valid(resource_id)]
+        return {str(doc["_id"]) async for doc in get_resources_collection().find({"_id": {"$in": ids}}, {"_id": 1})}
+
+    def _merge_back(self, batch: dict[str, dict[str, int]]):
+        # merge the counts back so they go out with the next flush
+        for resource_id, counts in batch.items():
+            merged = self._counts.setdefault(resource_id, {})
+            for field, n in counts.items():
+                merged[field] = merged.get(field, 0) + n
+
+    def start(self):
+        self._task.start()
+
+    async def stop(self):
+        await self._task.stop()
+        await self.flush()
+
+
+engagement_counters = EngagementCounters()
+
+# (category, subcategory, latitude, longitude, radius_km, limit) -> popular resources
+_popular = TTLCache(POPULAR_CACHE_MAX_ENTRIES, POPULAR_CACHE_SECONDS)
+
+_PROJECTION = {"org_name": 1, "category": 1, "subcategory": 1, "group": 1, "address": 1, "city": 1, "coordinates": 1}
+
+
+def _bounding_box(latitude: float, longitude: float, radius_km: float) -> dict:
+    """A $match on the coordinates of resources that could be within `radius_km`; a superset of the circle."""
+    lat_span = radius_km / KM_PER_DEGREE
+    lng_scale = math.cos(math.radians(min(89.0, abs(latitude) + lat_span)))
+    lng_span = min(180.0, radius_km / (KM_PER_DEGREE * max(lng_scale, 1e-6)))
+    return {
+        "coordinates.latitude": {"$gte": latitude - lat_span, "$lte": latitude + lat_span},
+        "coordinates.longitude": {"$gte": longitude - lng_span, "$lte": longitude + lng_span},
+    }
+
+
+async def get_popular_resources(
+    limit: int,
+    category: str | None = None,
+    subcategory: str | None = None,
+    latitude: float | None = None,
+    longitude: float | None = None,
+    radius_km: float | None = None
+) -> list[dict]:
+    """
+    Get the most engaged-with active resources, optionally only those in a
+    category/subcategory or within `radius_km` (POPULAR_NEAR_RADIUS_KM if not
+    given) of a point. Results are cached for POPULAR_CACHE_SECONDS.
+
+    Returns:
+        list of dicts: resource summary with its engagement counts (and
+        distance_km when a point is given), most popular first
+    """
+    near = latitude is not None and longitude is not None
+    if near and radius_km is None:
+        radius_km = POPULAR_NEAR_RADIUS_KM
+
+    key = (category, subcategory, latitude, longitude, radius_km, limit)
+    popular = _popular.get(key)
+    if popular is not None:
+        return popular
+
+    # the filters run inside the aggregation, before $limit, so a niche category
+    # still finds its resources however far down the overall ranking they are
+    resource_filter = {"removed": False}
+    if category:
+        resource_filter["category"] = category
+    if subcategory:
+        resource_filter["subcategory"] = subcategory
+    if near:
+        resource_filter |= _bounding_box(latitude, longitude, radius_km)
+
+    pipeline = [
+        {"$group": {
+            "_id": "$resource_id",
+            "score": {"$sum": "$score"},
+            "views": {"$sum": "$counts.views"},
+            "calls": {"$sum": "$counts.calls"},
+            "directions": {"$sum": "$counts.directions"}
+        }},
+        {"$lookup": {
+            "from": get_resources_collection().name,
+            "let": {"resource_id": {"$convert": {"input": "$_id", "to": "objectId", "onError": None}}},
+            "pipeline": [
+                {"$match": {"$expr": {"$eq": ["$_id", "$$resource_id"]}}},
+                {"$match": resource_filter},
+                {"$project": _PROJECTION}
+            ],
+            "as": "resource"
+        }},
+        {"$unwind": "$resource"},
+        {"$sort": {"score": -1}},
+        {"$limit": POPULAR_CANDIDATES if near else limit}
+    ]
+
+    popular = []
+    async for entry in await get_resource_engagement_collection().aggregate(pipeline):
+        resource = entry["resource"]
+        resource["_id"] = str(resource["_id"])
+
+        if near:
+            coordinates = resource["coordinates"]
+            distance = haversine_km(latitude, longitude, coordinates["latitude"], coordinates["longitude"])
+            if distance > radius_km:
+                continue
+            resource["distance_km"] = round(distance, 3)
+
+        resource["engagement"] = {
+            "score": entry["score"],
+            "views": entry["views"],
+            "calls": entry["calls"],
+            "directions": entry["directions"]
+        }
+        popular.append(resource)
+        if len(popular) == limit:
+            break
+
+    _popular.set(key, popular)
+    return popular
@@ -0,0 +1,92 @@
+import os
+from datetime import datetime, timezone
+
+from pymongo.errors import BulkWriteError
+
+from src.config.database import get_analytics_events_collection
+from src.config.logger import get_logger
+from src.utils.background import PeriodicTask
+
+logger = get_logger(__name__)
+
+# flush at least this often...
+ANALYTICS_FLUSH_SECONDS = float(os.getenv("ANALYTICS_FLUSH_SECONDS", "5"))
+
+# ...or as soon as this many events are waiting
+ANALYTICS_FLUSH_BATCH_SIZE = int(os.getenv("ANALYTICS_FLUSH_BATCH_SIZE", "1000"))
+
+# refuse new events past this point until a flush catches up
+ANALYTICS_BUFFER_MAX_EVENTS = int(os.getenv("ANALYTICS_BUFFER_MAX_EVENTS", "50000"))
+
+
+class EventBufferFull(Exception):
+    """Raised when the analytics buffer can't take more events until it is flushed."""
+
+
+class EventBuffer:
+    """
+    In-memory buffer for analytics events.
+
+    The event route only appends to a list and returns; a background task
+    writes the events to the analytics_events time-series collection with one
+    insert_many per flush. Each event is timestamped when it is accepted.
+    """
+
+    def __init__(self):
+        self._pending: list[dict] = []
+        self._task = PeriodicTask("analytics-event-flush", ANALYTICS_FLUSH_SECONDS, self.flush)
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def add(self, events: list[tuple[str, str, str | None]]):
+        """
+        Queue (device id, event, resource id or None) tuples for the next flush.
+
+        Raises:
+            EventBufferFull: if the events don't fit; none of them are queued
+        """
+        if len(self._pending) + len(events) > ANALYTICS_BUFFER_MAX_EVENTS:
+            # make sure a flush is on its way before asking the client to retry
+            self._task.trigger()
+            raise EventBufferFull()
+
+        now = datetime.now(timezone.utc)
+        for device_id, event, resource_id in events:
+            record = {"ts": now, "event": event, "device": device_id}
+            if resource_id is not None:
+                record["resource_id"] = resource_id
+            self._pending.append(record)
+        if len(self._pending) >= ANALYTICS_FLUSH_BATCH_SIZE:
+            self._task.trigger()
+
+    async def flush(self) -> int:
+        """Write all queued events to MongoDB. Returns the number of events written."""
+        if not self._pending:
+            return 0
+
+        batch, self._pending = self._pending, []
+        try:
+            await get_analytics_events_collection().insert_many(batch, ordered=False)
+        except BulkWriteError as e:
+            # the rest of the batch was inserted; only put back the events that weren't
+            failed = [batch[error["index"]] for error in e.details.get("writeErrors", [])]
+            self._pending = failed + self._pending
+            raise
+        except Exception:
+            # put the batch back in front of anything that arrived meanwhile
+            self._pending = batch + self._pending
+            raise
+
+        logger.debug(f"Flushed {len(batch)} analytics events")
+        return len(batch)
+
+    def start(self):
+        self._task.start()
+
+    async def stop(self):
+        await self._task.stop()
+        await self.flush()
+
+
+event_buffer = EventBuffer()
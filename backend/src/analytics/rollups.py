@@ -0,0 +1,180 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+from bson import Binary
+from pymongo import ASCENDING, UpdateOne
+
+from src.analytics.hyperloglog import HyperLogLog
+from src.config.database import (
+    ensure_time_series_collection,
+    get_analytics_events_collection,
+    get_analytics_rollups_collection
+)
+from src.config.logger import get_logger
+from src.utils.background import PeriodicTask
+from src.utils.locks import acquire_lease, release_lease
+
+logger = get_logger(__name__)
+
+ANALYTICS_ROLLUP_SECONDS = float(os.getenv("ANALYTICS_ROLLUP_SECONDS", "300"))
+
+# events are buffered before they are saved, so leave the newest ones for the next run
+ANALYTICS_ROLLUP_SETTLE_SECONDS = float(os.getenv("ANALYTICS_ROLLUP_SETTLE_SECONDS", "60"))
+
+# raw events are only needed until they are rolled up; rollups are kept forever
+ANALYTICS_EVENT_RETENTION_DAYS = int(os.getenv("ANALYTICS_EVENT_RETENTION_DAYS", "90"))
+
+_LEASE_NAME = "analytics-rollup"
+_WATERMARK_ID = "watermark"
+
+
+async def ensure_analytics_collections():
+    """Create the analytics_events time-series collection and the rollup index."""
+    await ensure_time_series_collection(
+        "analytics_events",
+        time_field="ts",
+        meta_field="event",
+        granularity="seconds",
+        expire_after_seconds=ANALYTICS_EVENT_RETENTION_DAYS * 24 * 3600
+    )
+    await get_analytics_rollups_collection().create_index([("granularity", ASCENDING), ("bucket", ASCENDING)])
+
+
+def _rollup_id(granularity: str, bucket: datetime, event: str) -> str:
+    return f"{granularity}|{bucket.strftime('%Y-%m-%dT%H')}|{event}"
+
+
+def _rollup_update(granularity: str, bucket: datetime, event: str, count: int, sketch: HyperLogLog) -> UpdateOne:
+    return UpdateOne(
+        {"_id": _rollup_id(granularity, bucket, event)},
+        {"$set": {
+            "granularity": granularity,
+            "bucket": bucket,
+            "event": event,
+            "count": count,
+            "unique_devices": sketch.count(),
+            "devices_hll": Binary(sketch.to_bytes())
+        }},
+        upsert=True
+    )
+
+
+async def _get_watermark(events, rollups) -> datetime | None:
+    doc = await rollups.find_one({"_id": _WATERMARK_ID})
+    if doc:
+        return doc["ts"].replace(tzinfo=timezone.utc)
+
+    # first run: start from the oldest event
+    oldest = await events.find_one({}, {"ts": 1}, sort=[("ts", ASCENDING)])
+    return oldest["ts"].replace(tzinfo=timezone.utc) if oldest else None
+
+
+async def run_rollup():
+    """
+    Recompute the hourly and daily rollups touched by events saved since the last run.
+
+    Each run rebuilds whole hours from the raw events (starting at the hour
+    the previous run stopped in) and whole days from their hourly rollups,
+    and overwrites the rollup documents. That makes a run safe to repeat
+    after a crash, and events that land late in an hour still get counted
+    the next time that hour is rebuilt.
+    """
+    if not await acquire_lease(_LEASE_NAME, ttl_seconds=ANALYTICS_ROLLUP_SECONDS * 2):
+        return
+
+    events = get_analytics_events_collection()
+    rollups = get_analytics_rollups_collection()
+
+    watermark = await _get_watermark(events, rollups)
+    if watermark is None:
+        return
+
+    start = watermark.replace(minute=0, second=0, microsecond=0)
+    end = datetime.now(timezone.utc) - timedelta(seconds=ANALYTICS_ROLLUP_SETTLE_SECONDS)
+    if end <= start:
+        return
+
+    # one row per (event, hour, device), so the sketches see each device once per hour
+    pipeline = [
+        {"$match": {"ts": {"$gte": start, "$lt": end}}},
+        {"$group": {
+            "_id": {
+                "event": "$event",
+                "hour": {"$dateTrunc": {"date": "$ts", "unit": "hour"}},
+                "device": "$device"
+            },
+            "count": {"$sum": 1}
+        }}
+    ]
+
+    hourly: dict[tuple[datetime, str], list] = {}
+    async for row in await events.aggregate(pipeline):
+        key = (row["_id"]["hour"], row["_id"]["event"])
+        if key not in hourly:
+            hourly[key] = [0, HyperLogLog()]
+        hourly[key][0] += row["count"]
+        hourly[key][1].add(row["_id"]["device"])
+
+    if hourly:
+        await rollups.bulk_write(
+            [_rollup_update("hour", hour, event, count, sketch) for (hour, event), (count, sketch) in hourly.items()],
+            ordered=False
+        )
+
+        daily_updates = []
+        for day in sorted({hour.replace(hour=0) for hour, _ in hourly}):
+            daily_updates.extend(await _rebuild_day(rollups, day))
+        await rollups.bulk_write(daily_updates, ordered=False)
+
+    await rollups.update_one({"_id": _WATERMARK_ID}, {"$set": {"ts": end}}, upsert=True)
+    logger.info(f"Rolled up analytics for {len(hourly)} hour/event buckets up to {end.isoformat()}")
+
+
+async def _rebuild_day(rollups, day: datetime) -> list[UpdateOne]:
+    daily: dict[str, list] = {}
+    async for doc in rollups.find({"granularity": "hour", "bucket": {"$gte": day, "$lt": day + timedelta(days=1)}}):
+        if doc["event"] not in daily:
+            daily[doc["event"]] = [0, HyperLogLog()]
+        daily[doc["event"]][0] += doc["count"]
+        daily[doc["event"]][1].merge(HyperLogLog.from_bytes(doc["devices_hll"]))
+
+    return [_rollup_update("day", day, event, count, sketch) for event, (count, sketch) in daily.items()]
+
+
+async def get_summary(start: datetime, end: datetime) -> dict:
+    """
+    Summarize analytics between two days (inclusive) from the daily rollups only.
+
+    Returns:
+        dict: Contains:
+            - 'days' (list of dicts): per-day counts and unique devices for each event type
+            - 'totals' (dict): event type -> count and estimated unique devices over the whole range
+    """
+    days: dict[str, dict] = {}
+    totals: dict[str, list] = {}
+
+    cursor = get_analytics_rollups_collection().find(
+        {"granularity": "day", "bucket": {"$gte": start, "$lte": end}}
+    ).sort("bucket", ASCENDING)
+
+    async for doc in cursor:
+        date = doc["bucket"].date().isoformat()
+        days.setdefault(date, {})[doc["event"]] = {"count": doc["count"], "unique_devices": doc["unique_devices"]}
+
+        if doc["event"] not in totals:
+            totals[doc["event"]] = [0, HyperLogLog()]
+        totals[doc["event"]][0] += doc["count"]
+        totals[doc["event"]][1].merge(HyperLogLog.from_bytes(doc["devices_hll"]))
+
+    return {
+        "days": [{"date": date, "events": events} for date, events in days.items()],
+        "totals": {
+            event: {"count": count, "unique_devices": sketch.count()}
+            for event, (count, sketch) in totals.items()
+        }
+    }
+
+
+rollup_task = PeriodicTask(
+    "analytics-rollup", ANALYTICS_ROLLUP_SECONDS, run_rollup, on_stop=lambda: release_lease(_LEASE_NAME)
+)
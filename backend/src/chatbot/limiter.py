@@ -0,0 +1,145 @@
+import asyncio
+import contextlib
+import math
+import os
+import random
+import time
+from typing import Awaitable, Callable
+
+from src.config.logger import get_logger
+from src.utils.lazy import LazyModule
+from src.utils.metrics import Counter, Gauge, Histogram, HistogramVec
+
+logger = get_logger(__name__)
+
+# only loaded with the OpenAI client, see get_client() in service.py
+openai = LazyModule("openai")
+
+# model calls running at once per worker, and callers allowed to wait for one
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "32"))
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "10"))
+
+# retries after a 429 or transient error from the provider, with exponential backoff and full jitter
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_RETRY_BASE_SECONDS = float(os.getenv("LLM_RETRY_BASE_SECONDS", "0.5"))
+LLM_RETRY_MAX_SECONDS = float(os.getenv("LLM_RETRY_MAX_SECONDS", "8"))
+
+
+class LLMOverloaded(Exception):
+    """Raised when a model call can't be made soon enough; `retry_after` is a hint in seconds."""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class LLMLimiter:
+    """
+    Bounds the number of concurrent model calls.
+
+    Callers beyond `max_concurrent` wait in a queue of at most `max_queue`
+    for up to `queue_timeout` seconds; when the queue is full they are turned
+    away immediately, so a spike fails fast instead of piling up.
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int, queue_timeout: float, wait_time: Histogram | None = None):
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._semaphore = asyncio.Semaphore(max_concurrent)
+        self.active = 0
+        self.queued = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.retries = 0
+        self.wait_time = wait_time or Histogram()
+        # how long a call holds its slot, used to estimate Retry-After
+        self.hold_time = Histogram()
+
+    def retry_after(self) -> int:
+        """Rough number of seconds until the current queue has drained."""
+        mean_hold = self.hold_time.sum / self.hold_time.count if self.hold_time.count else 1.0
+        return max(1, min(60, math.ceil(mean_hold * (self.queued + 1) / self.max_concurrent)))
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        """Wait for a free slot, or raise LLMOverloaded if the queue is full or the wait times out."""
+        if self._semaphore.locked() and self.queued >= self.max_queue:
+            self.rejected += 1
+            raise LLMOverloaded("The chatbot is busy, try again shortly.", self.retry_after())
+
+        self.queued += 1
+        started = time.perf_counter()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), timeout=self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise LLMOverloaded("The chatbot is busy, try again shortly.", self.retry_after())
+        finally:
+            self.queued -= 1
+            self.wait_time.observe(time.perf_counter() - started)
+
+        self.active += 1
+        acquired_at = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self.hold_time.observe(time.perf_counter() - acquired_at)
+            self._semaphore.release()
+
+    async def call(self, func: Callable[[], Awaitable]):
+        """
+        Run a model call, retrying with jittered backoff when the provider
+        rate-limits it or fails transiently.
+        """
+        for attempt in range(LLM_MAX_RETRIES + 1):
+            try:
+                return await func()
+            # errors the OpenAI client would otherwise retry itself (it's created with max_retries=0)
+            except (openai.RateLimitError, openai.InternalServerError, openai.APIConnectionError) as e:
+                retry_after = _retry_after_header(e)
+                if attempt == LLM_MAX_RETRIES:
+                    if not isinstance(e, openai.RateLimitError):
+                        raise
+                    logger.warning(f"Model call still rate limited after {attempt} retries")
+                    raise LLMOverloaded("The chatbot is busy, try again shortly.", retry_after or self.retry_after())
+
+                delay = random.uniform(0, min(LLM_RETRY_MAX_SECONDS, LLM_RETRY_BASE_SECONDS * 2 ** attempt))
+                # never retry sooner than the provider asked us to
+                delay = max(delay, min(LLM_RETRY_MAX_SECONDS, retry_after or 0))
+                self.retries += 1
+                await asyncio.sleep(delay)
+
+    def stats(self) -> dict:
+        return {
+            "active": self.active,
+            "queued": self.queued,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "retries": self.retries,
+            "wait_time": self.wait_time.snapshot(),
+        }
+
+
+def _retry_after_header(error: "openai.APIError") -> int | None:
+    response = getattr(error, "response", None)
+    value = response.headers.get("retry-after") if response is not None else None
+    try:
+        return max(1, math.ceil(float(value))) if value else None
+    except ValueError:
+        return None
+
+
+llm_limiter = LLMLimiter(
+    LLM_MAX_CONCURRENCY, LLM_MAX_QUEUE, LLM_QUEUE_TIMEOUT_SECONDS,
+    wait_time=HistogramVec("chatbot_llm_queue_wait_seconds", "Time model calls waited for a free slot.").labels(),
+)
+Gauge("chatbot_llm_calls_active", "Model calls in progress.", func=lambda: llm_limiter.active)
+Gauge("chatbot_llm_queue_depth", "Model calls waiting for a free slot.", func=lambda: llm_limiter.queued)
+Counter("chatbot_llm_rejected_total", "Model calls turned away because the queue was full.", func=lambda: llm_limiter.rejected)
+Counter("chatbot_llm_queue_timeouts_total", "Model calls that gave up waiting for a slot.", func=lambda: llm_limiter.timed_out)
+Counter("chatbot_llm_retries_total", "Model calls retried after a rate limit or transient error.", func=lambda: llm_limiter.retries)
@@ -0,0 +1,263 @@
+import asyncio
+import heapq
+import math
+import os
+import re
+import time
+
+from bson import ObjectId
+
+from src.config.database import get_resources_collection
+from src.config.logger import get_logger
+from src.utils.metrics import Gauge, Histogram, HistogramVec
+from src.utils.resource_events import on_resources_changed
+
+logger = get_logger(__name__)
+
+# how many resources to put in the prompt at most...
+CHATBOT_CONTEXT_RESOURCES = int(os.getenv("CHATBOT_CONTEXT_RESOURCES", "5"))
+
+# ...and how many tokens they may take up together
+CHATBOT_CONTEXT_TOKENS = int(os.getenv("CHATBOT_CONTEXT_TOKENS", "800"))
+
+# changes made by other workers only reach this worker's index through a full reload
+CHATBOT_INDEX_MAX_AGE_SECONDS = float(os.getenv("CHATBOT_INDEX_MAX_AGE_SECONDS", "600"))
+
+# fields that are indexed, with how much a match in each counts
+_FIELD_WEIGHTS = {
+    "org_name": 3,
+    "category": 2,
+    "subcategory": 3,
+    "group": 3,
+    "services": 1,
+    "requirements": 1,
+    "app_process": 1,
+    "hours": 1,
+    "address": 1,
+    "city": 1,
+    "bus_line": 1,
+}
+
+_PROJECTION = {field: 1 for field in _FIELD_WEIGHTS} | {"org_phones": 1, "website": 1, "removed": 1}
+
+# characters per summary field, and a rough characters-per-token ratio for budgeting
+_SUMMARY_FIELD_CHARS = 160
+_CHARS_PER_TOKEN = 4
+
+_STOPWORDS = {
+    "a", "an", "and", "are", "at", "be", "can", "do", "for", "from", "get", "has", "have", "how",
+    "i", "in", "is", "it", "me", "my", "near", "of", "on", "or", "the", "there", "to", "what",
+    "when", "where", "which", "who", "with", "you", "your", "any", "some", "need", "want", "help",
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# searches should take well under 20ms, so the buckets are finer than the default
+_SEARCH_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.02, 0.05, 0.1)
+
+# BM25 parameters
+_K1 = 1.2
+_B = 0.75
+
+
+def tokenize(text: str) -> list[str]:
+    tokens = []
+    for token in _TOKEN_RE.findall(text.lower()):
+        if token in _STOPWORDS:
+            continue
+        # crude plural folding so "shelters" matches "shelter"
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+
+class ResourceIndex:
+    """
+    BM25 term index over the active resources, used to ground chatbot replies.
+
+    Kept in memory and updated one resource at a time: write paths report
+    changed ids through src/utils/resource_events.py and the index re-reads
+    just those resources before the next search.
+    """
+
+    def __init__(self, search_latency: Histogram | None = None):
+        # term -> {resource id: weighted term frequency}
+        self._postings: dict[str, dict[str, int]] = {}
+        # resource id -> (terms, document length, summary)
+        self._docs: dict[str, tuple[dict[str, int], int, str]] = {}
+        self._total_length = 0
+
+        # bumped whenever the indexed content changes; re-reading an unchanged resource leaves it alone
+        self.version = 0
+
+        self._loaded_at: float | None = None
+        self._dirty: set[str] = set()
+        self._reload = False
+        self._lock = asyncio.Lock()
+        self.search_latency = search_latency or Histogram(_SEARCH_BUCKETS)
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def mark_dirty(self, resource_ids: list[str] | None):
+        if resource_ids is None:
+            self._reload = True
+        else:
+            self._dirty.update(resource_ids)
+
+    def upsert(self, resource: dict):
+        resource_id = str(resource["_id"])
+
+        terms: dict[str, int] = {}
+        for field, weight in _FIELD_WEIGHTS.items():
+            value = resource.get(field)
+            if value:
+                for token in tokenize(str(value)):
+                    terms[token] = terms.get(token, 0) + weight
+
+        length = sum(terms.values())
+        summary = summarize(resource)
+        indexed = self._docs.get(resource_id)
+        if indexed is not None and indexed[0] == terms and indexed[2] == summary:
+            return
+        self.remove(resource_id)
+
+        self._docs[resource_id] = (terms, length, summary)
+        self._total_length += length
+        for term, tf in terms.items():
+            self._postings.setdefault(term, {})[resource_id] = tf
+        self.version += 1
+
+    def remove(self, resource_id: str):
+        doc = self._docs.pop(resource_id, None)
+        if doc is None:
+            return
+
+        terms, length, _ = doc
+        self._total_length -= length
+        for term in terms:
+            postings = self._postings[term]
+            del postings[resource_id]
+            if not postings:
+                del self._postings[term]
+        self.version += 1
+
+    def search(self, query: str, k: int) -> list[tuple[float, str]]:
+        """Returns up to k (score, summary) pairs, best match first."""
+        if not self._docs:
+            return []
+
+        n = len(self._docs)
+        average_length = self._total_length / n or 1
+        scores: dict[str, float] = {}
+
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n - len(postings) + 0.5) / (len(postings) + 0.5))
+            for resource_id, tf in postings.items():
+                length = self._docs[resource_id][1]
+                score = idf * tf * (_K1 + 1) / (tf + _K1 * (1 - _B + _B * length / average_length))
+                scores[resource_id] = scores.get(resource_id, 0.0) + score
+
+        best = heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+        return [(score, self._docs[resource_id][2]) for resource_id, score in best]
+
+    async def refresh(self):
+        """Load the index on first use and apply pending changes before a search."""
+        stale = self._loaded_at is None or time.monotonic() - self._loaded_at >= CHATBOT_INDEX_MAX_AGE_SECONDS
+        if not (stale or self._reload or self._dirty):
+            return
+
+        async with self._lock:
+            collection = get_resources_collection()
+
+            if self._loaded_at is None or self._reload or \
+                    time.monotonic() - self._loaded_at >= CHATBOT_INDEX_MAX_AGE_SECONDS:
+                self._reload = False
+                self._dirty.clear()
+                resources = await collection.find({"removed": False}, _PROJECTION).to_list(length=None)
+
+                # update in place rather than starting over, so an unchanged catalog keeps its version
+                for resource_id in self._docs.keys() - {str(resource["_id"]) for resource in resources}:
+                    self.remove(resource_id)
+                for resource in resources:
+                    self.upsert(resource)
+                self._loaded_at = time.monotonic()
+                logger.info(f"Indexed {len(self._docs)} resources for the chatbot")
+
+            elif self._dirty:
+                dirty, self._dirty = self._dirty, set()
+                ids = [ObjectId(resource_id) for resource_id in dirty if ObjectId.is_valid(resource_id)]
+                found = set()
+                async for resource in collection.find({"_id": {"$in": ids}}, _PROJECTION):
+                    found.add(str(resource["_id"]))
+                    if resource.get("removed"):
+                        self.remove(str(resource["_id"]))
+                    else:
+                        self.upsert(resource)
+                for resource_id in dirty - found:
+                    self.remove(resource_id)
+
+
+def _clip(value, limit: int = _SUMMARY_FIELD_CHARS) -> str:
+    text = " ".join(str(value).split())
+    return text if len(text) <= limit else text[:limit - 1].rstrip() + "…"
+
+
+def summarize(resource: dict) -> str:
+    """One-line summary of a resource for the prompt."""
+    kind = resource.get("group") or resource.get("subcategory") or resource.get("category")
+    parts = [resource.get("org_name") or "Unnamed resource"]
+    if kind:
+        parts[0] += f" ({kind})"
+
+    address = ", ".join(str(p) for p in (resource.get("address"), resource.get("city")) if p)
+    for label, value in (
+        ("Services", resource.get("services")),
+        ("Hours", resource.get("hours")),
+        ("Requirements", resource.get("requirements")),
+        ("How to apply", resource.get("app_process")),
+        ("Address", address),
+        ("Bus", resource.get("bus_line")),
+        ("Phone", resource.get("org_phones")),
+        ("Website", resource.get("website")),
+    ):
+        if value:
+            parts.append(f"{label}: {_clip(value)}")
+
+    return " | ".join(parts)
+
+
+resource_index = ResourceIndex(
+    HistogramVec(
+        "chatbot_retrieval_seconds", "Time to find the resources matching a chatbot question.",
+        buckets=_SEARCH_BUCKETS,
+    ).labels()
+)
+Gauge("chatbot_indexed_resources", "Resources in the chatbot's retrieval index.", func=lambda: len(resource_index))
+on_resources_changed(resource_index.mark_dirty)
+
+
+async def retrieve_context(question: str) -> str | None:
+    """
+    Summaries of the resources that best match a question, within the
+    CHATBOT_CONTEXT_TOKENS budget, or None if nothing matches.
+    """
+    await resource_index.refresh()
+
+    started = time.perf_counter()
+    matches = resource_index.search(question, CHATBOT_CONTEXT_RESOURCES)
+
+    budget = CHATBOT_CONTEXT_TOKENS * _CHARS_PER_TOKEN
+    lines = []
+    for _, summary in matches:
+        if len(summary) + 3 > budget:
+            break
+        lines.append(f"- {summary}")
+        budget -= len(summary) + 3
+
+    resource_index.search_latency.observe(time.perf_counter() - started)
+    return "\n".join(lines) or None
@@ -1,8 +1,14 @@
+import json
+
 from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from .service import chat_completion
+from src.config.logger import get_logger
+from .limiter import LLMOverloaded
+from .service import chat_completion, stream_chat_completion, get_metrics
 
 router = APIRouter(prefix="/chatbot", tags=["chatbot"])
+logger = get_logger(__name__)
 
 class ChatRequest(BaseModel):
     message: str
@@ -11,9 +17,68 @@ class ChatResponse(BaseModel):
     reply: str
 
 @router.post("/", response_model=ChatResponse)
-def chatbot_endpoint(payload: ChatRequest):
+async def chatbot_endpoint(payload: ChatRequest):
     try:
-        reply = chat_completion(payload.message)
+        reply = await chat_completion(payload.message)
         return ChatResponse(reply=reply)
+    except LLMOverloaded as e:
+        raise _overloaded(e)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _overloaded(e: LLMOverloaded) -> HTTPException:
+    logger.warning(f"Chatbot request turned away: {e}")
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+
+def _sse(data: dict, event: str | None = None) -> str:
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(data)}\n\n"
+
+
+@router.post("/stream")
+async def chatbot_stream_endpoint(payload: ChatRequest):
+    """
+    Stream the reply as server-sent events while it is generated.
+
+    Each token arrives as `data: {"token": "..."}`. The stream ends with an
+    `event: done` message, or `event: error` with a `detail` if the model
+    call failed part-way. If the chatbot is too busy to take the request,
+    responds 503 with a Retry-After header before any event is sent.
+    """
+    tokens = stream_chat_completion(payload.message)
+    # wait for the first token here, so an overloaded chatbot can still answer with a plain 503
+    try:
+        first = await anext(tokens, None)
+    except LLMOverloaded as e:
+        raise _overloaded(e)
+    except Exception as e:
+        logger.error(f"Chatbot stream failed: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def events():
+        try:
+            if first is not None:
+                yield _sse({"token": first})
+                async for token in tokens:
+                    yield _sse({"token": token})
+            yield _sse({}, event="done")
+        except Exception as e:
+            logger.error(f"Chatbot stream failed: {e}", exc_info=True)
+            yield _sse({"detail": str(e)}, event="error")
+        finally:
+            # frees the model call's slot if the client went away mid-reply
+            await tokens.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/metrics")
+async def chatbot_metrics():
+    """Latency, cache and queue statistics of model calls since this worker started."""
+    return get_metrics()
@@ -1,17 +1,182 @@
 import os
-from openai import OpenAI
+import re
+import time
+from typing import TYPE_CHECKING, AsyncIterator
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from src.utils.cache import TTLCache
+from src.utils.metrics import Counter, Gauge, HistogramVec
+from src.utils.singleflight import SingleFlight
+from .limiter import llm_limiter
+from .retrieval import resource_index, retrieve_context
 
-SYSTEM_PROMPT = "You are a helpful chatbot."
+if TYPE_CHECKING:
+    from openai import AsyncOpenAI
 
-def chat_completion(user_message: str) -> str:
-    response = client.chat.completions.create(
-        model="gpt-4.1-mini",
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_message},
-        ],
-    )
+# point OPENAI_BASE_URL at src/chatbot/stub_server.py to run without the real API
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL")
+CHATBOT_MODEL = os.getenv("CHATBOT_MODEL", "gpt-4.1-mini")
+
+SYSTEM_PROMPT = (
+    "You are the assistant for The Contributor's resource guide for people experiencing "
+    "homelessness in Nashville. Answer briefly and plainly. When resources from the guide are "
+    "listed below, base your answer on them and include the details people need to get there "
+    "(address, hours, requirements, phone). Never invent resources, addresses, phone numbers or "
+    "hours; if the guide has nothing relevant, say so."
+)
+
+CHATBOT_CACHE_TTL_SECONDS = float(os.getenv("CHATBOT_CACHE_TTL_SECONDS", "3600"))
+CHATBOT_CACHE_MAX_ENTRIES = int(os.getenv("CHATBOT_CACHE_MAX_ENTRIES", "1000"))
+
+# replies keyed by (normalized question, catalog version)
+response_cache = TTLCache(CHATBOT_CACHE_MAX_ENTRIES, CHATBOT_CACHE_TTL_SECONDS)
+# model calls currently running, so identical questions asked at once share one
+in_flight = SingleFlight()
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+# time until the first token of a reply arrives, and until the whole reply has
+time_to_first_token = HistogramVec(
+    "chatbot_time_to_first_token_seconds", "Time until the first token of a streamed reply arrived."
+).labels()
+total_latency = HistogramVec("chatbot_model_call_seconds", "Time until a model reply was complete.").labels()
+
+Gauge("chatbot_cache_entries", "Replies in the chatbot response cache.", func=lambda: len(response_cache))
+Counter("chatbot_cache_hits_total", "Questions answered from the response cache.", func=lambda: response_cache.hits)
+Counter("chatbot_cache_misses_total", "Questions not found in the response cache.", func=lambda: response_cache.misses)
+Counter(
+    "chatbot_coalesced_requests_total", "Questions that shared an identical in-flight question's model call.",
+    func=lambda: in_flight.coalesced,
+)
+
+_client: "AsyncOpenAI | None" = None
+
+
+def get_client() -> "AsyncOpenAI":
+    """
+    Create the OpenAI client on first use, so importing the app doesn't need
+    an API key, or pay for importing the SDK.
+    """
+    global _client
+    if _client is None:
+        from openai import AsyncOpenAI
+        # retries (e.g. after a 429) are done by llm_limiter, with jittered backoff
+        _client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY"), base_url=OPENAI_BASE_URL, max_retries=0)
+    return _client
+
+
+async def _messages(user_message: str) -> list[dict]:
+    messages = [{"role": "system", "content": SYSTEM_PROMPT}]
+
+    context = await retrieve_context(user_message)
+    if context:
+        messages.append({"role": "system", "content": f"Resources from the guide:\n{context}"})
+
+    messages.append({"role": "user", "content": user_message})
+    return messages
+
+
+async def _complete(user_message: str) -> str:
+    messages = await _messages(user_message)
+
+    async with llm_limiter.slot():
+        started = time.perf_counter()
+        response = await llm_limiter.call(lambda: get_client().chat.completions.create(
+            model=CHATBOT_MODEL,
+            messages=messages,
+        ))
+        total_latency.observe(time.perf_counter() - started)
 
     return response.choices[0].message.content
+
+
+async def _stream(user_message: str) -> AsyncIterator[str]:
+    messages = await _messages(user_message)
+
+    # the slot is held until the whole reply has been streamed
+    async with llm_limiter.slot():
+        started = time.perf_counter()
+        first_token_at = None
+
+        stream = await llm_limiter.call(lambda: get_client().chat.completions.create(
+            model=CHATBOT_MODEL,
+            messages=messages,
+            stream=True,
+        ))
+        async for chunk in stream:
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                if first_token_at is None:
+                    first_token_at = time.perf_counter()
+                    time_to_first_token.observe(first_token_at - started)
+                yield delta
+
+        total_latency.observe(time.perf_counter() - started)
+
+
+def normalize_question(question: str) -> str:
+    """Lowercase and strip punctuation and extra whitespace, so trivially different phrasings share a cache entry."""
+    return " ".join(_WORD_RE.findall(question.lower()))
+
+
+async def _cache_key(user_message: str) -> tuple[str, int]:
+    # answers depend on the resources retrieved for the prompt, so they're only
+    # reused until the catalog changes
+    await resource_index.refresh()
+    return normalize_question(user_message), resource_index.version
+
+
+async def _complete_and_cache(key: tuple[str, int], user_message: str) -> str:
+    reply = await _complete(user_message)
+    response_cache.set(key, reply)
+    return reply
+
+
+async def chat_completion(user_message: str) -> str:
+    key = await _cache_key(user_message)
+    reply = response_cache.get(key)
+    if reply is not None:
+        return reply
+
+    return await in_flight.do(key, lambda: _complete_and_cache(key, user_message))
+
+
+async def stream_chat_completion(user_message: str) -> AsyncIterator[str]:
+    """
+    Yield the reply as it is generated, one text delta at a time.
+
+    A cached reply, or one already being generated for an identical
+    question, is yielded whole once it is available.
+    """
+    key = await _cache_key(user_message)
+    reply = response_cache.get(key)
+
+    if reply is None and in_flight.in_flight(key):
+        reply = await in_flight.do(key, lambda: _complete_and_cache(key, user_message))
+
+    if reply is not None:
+        yield reply
+        return
+
+    with in_flight.lead(key) as future:
+        parts = []
+        async for delta in _stream(user_message):
+            parts.append(delta)
+            yield delta
+
+        reply = "".join(parts)
+        response_cache.set(key, reply)
+        future.set_result(reply)
+
+
+def get_metrics() -> dict:
+    return {
+        "time_to_first_token": time_to_first_token.snapshot(),
+        "total_latency": total_latency.snapshot(),
+        "retrieval_latency": resource_index.search_latency.snapshot(),
+        "indexed_resources": len(resource_index),
+        "cache": response_cache.stats(),
+        "coalesced_requests": in_flight.coalesced,
+        "llm_queue": llm_limiter.stats(),
+    }
@@ -0,0 +1,81 @@
+"""
+Stand-in for the OpenAI chat completions API, for tests and benchmarks.
+
+Replies by echoing the user's message word by word, after a configurable
+delay before the first token and between tokens. Run it with
+
+    uv run uvicorn src.chatbot.stub_server:app --port 8001
+
+and start the backend with OPENAI_BASE_URL=http://localhost:8001/v1 and any
+OPENAI_API_KEY.
+"""
+import asyncio
+import json
+import os
+import time
+import uuid
+
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+STUB_FIRST_TOKEN_MS = float(os.getenv("STUB_FIRST_TOKEN_MS", "200"))
+STUB_TOKEN_MS = float(os.getenv("STUB_TOKEN_MS", "20"))
+
+app = FastAPI()
+
+
+class CompletionRequest(BaseModel):
+    model: str
+    messages: list[dict]
+    stream: bool = False
+
+
+def _reply_tokens(request: CompletionRequest) -> list[str]:
+    question = next((m["content"] for m in reversed(request.messages) if m["role"] == "user"), "")
+    words = f"You asked: {question}".split(" ")
+    return [words[0]] + [f" {word}" for word in words[1:]]
+
+
+def _chunk(completion_id: str, model: str, delta: dict, finish_reason: str | None = None) -> str:
+    chunk = {
+        "id": completion_id,
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": model,
+        "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+    }
+    return f"data: {json.dumps(chunk)}\n\n"
+
+
+@app.post("/v1/chat/completions")
+async def chat_completions(request: CompletionRequest):
+    completion_id = f"chatcmpl-{uuid.uuid4().hex}"
+    tokens = _reply_tokens(request)
+
+    if not request.stream:
+        await asyncio.sleep((STUB_FIRST_TOKEN_MS + STUB_TOKEN_MS * (len(tokens) - 1)) / 1000)
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": request.model,
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": "".join(tokens)},
+                "finish_reason": "stop",
+            }],
+            "usage": {"prompt_tokens": 0, "completion_tokens": len(tokens), "total_tokens": len(tokens)},
+        }
+
+    async def events():
+        await asyncio.sleep(STUB_FIRST_TOKEN_MS / 1000)
+        yield _chunk(completion_id, request.model, {"role": "assistant", "content": ""})
+        for i, token in enumerate(tokens):
+            if i:
+                await asyncio.sleep(STUB_TOKEN_MS / 1000)
+            yield _chunk(completion_id, request.model, {"content": token})
+        yield _chunk(completion_id, request.model, {}, finish_reason="stop")
+        yield "data: [DONE]\n\n"
+
+    return StreamingResponse(events(), media_type="text/event-stream")
@@ -1,11 +1,19 @@
 import os
+from typing import TYPE_CHECKING
 
 from dotenv import load_dotenv
 from pymongo import AsyncMongoClient
+from pymongo.errors import CollectionInvalid
 from pymongo.server_api import ServerApi
-from supabase import create_client, Client
+from src.config.logger import get_logger
+from src.config.mongo_monitoring import command_monitor
+from src.utils.lazy import LazyObject
+
+if TYPE_CHECKING:
+    from supabase import Client
 
 load_dotenv()
+logger = get_logger(__name__)
 mongo_key = os.getenv("MONGODB_URI")
 DB_NAME = "the-contributor"
 
@@ -17,15 +25,18 @@ supabase_service_key = os.getenv("SUPABASE_SERVICE_KEY")
 if not supabase_url or not supabase_key:
     raise RuntimeError("Missing SUPABASE_URL or SUPABASE_KEY")
 
+def _create_client(key: str) -> "Client":
+    from supabase import create_client
+    return create_client(supabase_url, key)
+
+# The clients (and the supabase SDK) are only loaded on first use, see src/utils/lazy.py
+
 # Regular client for user auth operations
-supabase: Client = create_client(supabase_url, supabase_key)
+supabase: "Client" = LazyObject(lambda: _create_client(supabase_key))
 
 # Admin client for admin operations (Deleting users)
 # Uses regular key if service key's not in the .env
-supabase_admin: Client = create_client(
-    supabase_url,
-    supabase_service_key or supabase_key
-)
+supabase_admin: "Client" = LazyObject(lambda: _create_client(supabase_service_key or supabase_key))
 
 class MongoDB:
     # client variable
@@ -36,13 +47,18 @@ class MongoDB:
     async def connect_db(cls):
         """Connect to MongoDB database and initialize "client" variable."""
         try:
-            cls.client = AsyncMongoClient(mongo_key, server_api = ServerApi('1'))
+            cls.client = AsyncMongoClient(
+                mongo_key,
+                server_api = ServerApi('1'),
+                event_listeners = [command_monitor]
+            )
+            command_monitor.client = cls.client
 
             # Test connection
             await cls.client.admin.command('ping')
-            print("MongoDB connected successfully!")
+            logger.info("MongoDB connected successfully!")
         except Exception as e:
-            print(f"Error connecting to MongoDB: {e}")
+            logger.error(f"Error connecting to MongoDB: {e}")
             raise
     
     @classmethod
@@ -51,7 +67,7 @@ class MongoDB:
         if cls.client:
             await cls.client.close()
             cls.client = None
-            print("MongoDB connection closed.")
+            logger.info("MongoDB connection closed.")
 
     @classmethod
     def get_client(cls) -> AsyncMongoClient:
@@ -82,6 +98,9 @@ class MongoDB:
         return cls._get_database(db_name)[col_name]
     
 # methods for getting certain collections
+def get_database():
+    return MongoDB._get_database(DB_NAME)
+
 def get_resources_collection():
     return MongoDB.get_collection("resources", DB_NAME)
 
@@ -95,4 +114,57 @@ def get_pending_collection():
     return MongoDB.get_collection("pending", DB_NAME)
 
 def get_announcements_collection():
-    return MongoDB.get_collection("announcements", DB_NAME)
\ No newline at end of file
+    return MongoDB.get_collection("announcements", DB_NAME)
+
+def get_analytics_events_collection():
+    return MongoDB.get_collection("analytics_events", DB_NAME)
+
+def get_analytics_rollups_collection():
+    return MongoDB.get_collection("analytics_rollups", DB_NAME)
+
+def get_resource_engagement_collection():
+    return MongoDB.get_collection("resource_engagement", DB_NAME)
+
+def get_locks_collection():
+    return MongoDB.get_collection("locks", DB_NAME)
+
+def get_vendor_locations_collection():
+    return MongoDB.get_collection("vendor_locations", DB_NAME)
+
+def get_resource_changes_collection():
+    return MongoDB.get_collection("resource_changes", DB_NAME)
+
+def get_counters_collection():
+    return MongoDB.get_collection("counters", DB_NAME)
+
+
+async def ensure_time_series_collection(
+    col_name: str,
+    time_field: str,
+    meta_field: str,
+    granularity: str = "seconds",
+    expire_after_seconds: int | None = None
+):
+    """
+    Create a time-series collection if it doesn't exist yet, and keep its
+    retention (expireAfterSeconds) in sync with the given value if it does.
+
+    Args:
+        - col_name (str): name of the collection
+        - time_field (str): field holding each measurement's datetime
+        - meta_field (str): field that identifies the series (documents are bucketed by it)
+        - granularity (str): "seconds", "minutes" or "hours", the expected gap between measurements
+        - expire_after_seconds (int | None): delete measurements older than this. None keeps them forever.
+    """
+    db = get_database()
+    if col_name not in await db.list_collection_names(filter={"name": col_name}):
+        options = {"timeseries": {"timeField": time_field, "metaField": meta_field, "granularity": granularity}}
+        if expire_after_seconds:
+            options["expireAfterSeconds"] = expire_after_seconds
+        try:
+            await db.create_collection(col_name, **options)
+        except CollectionInvalid:
+            # another worker created it first
+            pass
+    else:
+        await db.command("collMod", col_name, expireAfterSeconds=expire_after_seconds or "off")
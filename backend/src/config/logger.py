@@ -1,12 +1,146 @@
 # src/config/logger.py
+"""
+Logging setup for the backend.
+
+Log calls only put the record on a queue; a background thread formats and
+writes it, so a slow stdout doesn't hold up the event loop. Records carry the
+id of the request they were logged during (set by RequestIdMiddleware).
+
+Environment:
+    - LOG_LEVEL: DEBUG, INFO (default), WARNING, ...
+    - LOG_FORMAT: "json" (default) for one JSON object per line, or "text"
+    - LOG_SAMPLE_RATES: keep only a fraction of the DEBUG/INFO records of some
+      loggers, e.g. "backend.src.routes.resource_routes=0.1,httpx=0". Matches
+      the logger and its children; warnings and errors are always kept.
+"""
+import atexit
+import copy
+import json
 import logging
+import logging.handlers
+import os
+import queue
+import random
+import sys
+from contextvars import ContextVar
+from datetime import datetime, timezone
+
+LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+LOG_FORMAT = os.getenv("LOG_FORMAT", "json").lower()
+LOG_QUEUE_SIZE = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+
+# id of the request being handled, if any
+request_id_var: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+def _parse_sample_rates(value: str) -> dict[str, float]:
+    rates = {}
+    for item in value.split(","):
+        name, _, rate = item.partition("=")
+        if name.strip() and rate.strip():
+            rates[name.strip()] = min(1.0, max(0.0, float(rate)))
+    return rates
+
+
+class ContextFilter(logging.Filter):
+    """Drops sampled-out records and tags the rest with the current request id."""
+
+    def __init__(self, sample_rates: dict[str, float]):
+        super().__init__()
+        self.sample_rates = sample_rates
+        # logger name -> sample rate, resolved once per logger
+        self._rates: dict[str, float] = {}
+
+    def _rate(self, name: str) -> float:
+        rate = self._rates.get(name)
+        if rate is None:
+            rate = 1.0
+            # most specific configured prefix wins
+            for prefix in sorted(self.sample_rates, key=len, reverse=True):
+                if name == prefix or name.startswith(prefix + "."):
+                    rate = self.sample_rates[prefix]
+                    break
+            self._rates[name] = rate
+        return rate
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno < logging.WARNING and self.sample_rates:
+            rate = self._rate(record.name)
+            if rate < 1.0 and random.random() >= rate:
+                return False
+        record.request_id = request_id_var.get()
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if getattr(record, "request_id", None):
+            entry["request_id"] = record.request_id
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        request_id = getattr(record, "request_id", None)
+        return f"{line} [request_id={request_id}]" if request_id else line
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Enqueues records with their message merged but otherwise unformatted; the
+    listener thread does the rest. Drops records instead of blocking when the
+    queue is full.
+    """
+
+    dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # merge the args now: they may be mutable objects that change before the listener gets to them
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            _QueueHandler.dropped += 1
+
+
+def _configure() -> logging.handlers.QueueListener:
+    output = logging.StreamHandler(sys.stderr)
+    output.setFormatter(JsonFormatter() if LOG_FORMAT == "json" else TextFormatter())
+
+    handler = _QueueHandler(queue.Queue(LOG_QUEUE_SIZE))
+    handler.addFilter(ContextFilter(_parse_sample_rates(os.getenv("LOG_SAMPLE_RATES", ""))))
+
+    root = logging.getLogger()
+    root.setLevel(LOG_LEVEL)
+    for existing in root.handlers[:]:
+        root.removeHandler(existing)
+    root.addHandler(handler)
+
+    listener = logging.handlers.QueueListener(handler.queue, output)
+    listener.start()
+    # write out whatever is still queued when the process exits
+    atexit.register(listener.stop)
+    return listener
 
-LOG_LEVEL = logging.INFO  # Change to DEBUG for local debugging
 
-logging.basicConfig(
-    level=LOG_LEVEL,
-    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
-)
+_listener = _configure()
 
 logger = logging.getLogger("backend")
 
@@ -0,0 +1,183 @@
+import asyncio
+import json
+import os
+import time
+
+from pymongo import AsyncMongoClient, monitoring
+
+from src.config.logger import get_logger
+from src.utils.metrics import Counter, HistogramVec
+
+logger = get_logger(__name__)
+
+# commands slower than this are logged with the shape of their filter
+MONGO_SLOW_COMMAND_MS = float(os.getenv("MONGO_SLOW_COMMAND_MS", "100"))
+
+# also log the query plan of slow queries, at most once per query shape per interval
+MONGO_EXPLAIN_SLOW_QUERIES = os.getenv("MONGO_EXPLAIN_SLOW_QUERIES", "true").lower() == "true"
+MONGO_EXPLAIN_INTERVAL_SECONDS = float(os.getenv("MONGO_EXPLAIN_INTERVAL_SECONDS", "3600"))
+
+# commands that name their collection as their first value, and where their filter is
+_FILTER_PATHS = {
+    "find": ("filter",),
+    "aggregate": ("pipeline",),
+    "count": ("query",),
+    "distinct": ("query",),
+    "findAndModify": ("query",),
+    "update": ("updates", 0, "q"),
+    "delete": ("deletes", 0, "q"),
+    "insert": None,
+    "createIndexes": None,
+    "listIndexes": None,
+}
+
+# commands whose plan can be explained
+_EXPLAINABLE = {"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"}
+
+# fields the driver adds to commands, which explain must not be given again
+_DRIVER_FIELDS = {"lsid", "txnNumber", "$clusterTime", "$db", "$readPreference", "signature", "apiVersion", "apiStrict"}
+
+_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+command_duration = HistogramVec(
+    "mongodb_command_duration_seconds",
+    "Duration of MongoDB commands, by collection and command.",
+    ("collection", "command"),
+    buckets=_BUCKETS,
+)
+command_failures = Counter(
+    "mongodb_command_failures_total",
+    "MongoDB commands that returned an error.",
+    ("collection", "command"),
+)
+slow_commands = Counter(
+    "mongodb_slow_commands_total",
+    "MongoDB commands slower than MONGO_SLOW_COMMAND_MS.",
+    ("collection", "command"),
+)
+
+
+def redact(value):
+    """
+    The shape of a filter or pipeline: field names and operators are kept,
+    values are replaced with "?", so it can be logged without user data.
+    """
+    if isinstance(value, dict):
+        return {key: redact(item) for key, item in value.items()}
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        # e.g. $or clauses or pipeline stages
+        return [redact(item) for item in value]
+    return "?"
+
+
+def _filter(command_name: str, command: dict):
+    path = _FILTER_PATHS.get(command_name)
+    value = command
+    for key in path or ():
+        try:
+            value = value[key]
+        except (KeyError, IndexError, TypeError):
+            return None
+    return value if path else None
+
+
+class CommandMonitor(monitoring.CommandListener):
+    """
+    Records the duration of every collection command in per-collection,
+    per-command histograms, and logs slow commands with their redacted filter.
+
+    pymongo calls the listener inline for every command, so the fast path is
+    two dict operations and a histogram observe; filters are only redacted
+    for slow commands.
+    """
+
+    def __init__(self):
+        self.client: AsyncMongoClient | None = None
+        # (connection, request id) -> (collection, command name, command)
+        self._started: dict[tuple, tuple[str, str, dict]] = {}
+        # query shape -> when its plan was last explained
+        self._explained: dict[str, float] = {}
+
+    def started(self, event: monitoring.CommandStartedEvent):
+        if event.command_name not in _FILTER_PATHS:
+            return
+        collection = event.command.get(event.command_name)
+        if not isinstance(collection, str):
+            return
+
+        if len(self._started) > 10_000:
+            # replies that never arrived, e.g. after a dropped connection
+            self._started.clear()
+        self._started[(event.connection_id, event.request_id)] = (collection, event.command_name, event.command)
+
+    def succeeded(self, event: monitoring.CommandSucceededEvent):
+        self._finished(event, failed=False)
+
+    def failed(self, event: monitoring.CommandFailedEvent):
+        self._finished(event, failed=True)
+
+    def _finished(self, event, failed: bool):
+        started = self._started.pop((event.connection_id, event.request_id), None)
+        if started is None:
+            return
+
+        collection, command_name, command = started
+        duration = event.duration_micros / 1_000_000
+        command_duration.labels(collection, command_name).observe(duration)
+        if failed:
+            command_failures.inc(collection, command_name)
+
+        if duration * 1000 >= MONGO_SLOW_COMMAND_MS:
+            slow_commands.inc(collection, command_name)
+            shape = json.dumps(redact(_filter(command_name, command)), default=str)
+            logger.warning(
+                f"Slow MongoDB {command_name} on {collection}: {duration * 1000:.0f}ms, filter {shape}"
+            )
+            if MONGO_EXPLAIN_SLOW_QUERIES and command_name in _EXPLAINABLE:
+                self._maybe_explain(event.database_name, collection, command_name, command, shape)
+
+    def _maybe_explain(self, database: str, collection: str, command_name: str, command: dict, shape: str):
+        key = f"{collection}.{command_name}:{shape}"
+        now = time.monotonic()
+        if self.client is None or now - self._explained.get(key, -MONGO_EXPLAIN_INTERVAL_SECONDS) < MONGO_EXPLAIN_INTERVAL_SECONDS:
+            return
+        self._explained[key] = now
+
+        try:
+            asyncio.get_running_loop().create_task(self._explain(database, collection, command, shape))
+        except RuntimeError:
+            # not called from the event loop, e.g. a sync script
+            pass
+
+    async def _explain(self, database: str, collection: str, command: dict, shape: str):
+        explainable = {key: value for key, value in command.items() if key not in _DRIVER_FIELDS}
+        try:
+            result = await self.client[database].command({"explain": explainable, "verbosity": "queryPlanner"})
+        except Exception as e:
+            logger.warning(f"Could not explain slow query on {collection}: {e}")
+            return
+
+        logger.warning(f"Plan for slow query on {collection} {shape}: {' > '.join(_plan_stages(result))}")
+
+
+def _plan_stages(explain: dict) -> list[str]:
+    """Stage names of the winning plan from the root down, e.g. ["FETCH", "IXSCAN x_1"] or ["COLLSCAN"]."""
+    planner = explain.get("queryPlanner")
+    if planner is None:
+        # aggregations nest the planner output in their first stage
+        first_stage = (explain.get("stages") or [{}])[0]
+        planner = next(iter(first_stage.values()), {}).get("queryPlanner", {}) if first_stage else {}
+
+    stages = []
+    plan = planner.get("winningPlan", {})
+    plan = plan.get("queryPlan", plan)
+    while plan:
+        stage = plan.get("stage", "?")
+        if plan.get("indexName"):
+            stage += f" {plan['indexName']}"
+        stages.append(stage)
+        plan = plan.get("inputStage") or (plan.get("inputStages") or [None])[0]
+    return stages or ["?"]
+
+
+command_monitor = CommandMonitor()
@@ -0,0 +1,127 @@
+import asyncio
+import glob
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+
+from src.config.database import get_resources_collection
+from src.config.logger import get_logger
+from src.controllers.resource_changes import current_seq
+from src.utils.compression import ENCODINGS, compress
+from src.utils.responses import dumps
+from src.utils.singleflight import SingleFlight
+
+logger = get_logger(__name__)
+
+CATALOG_BUNDLE_DIR = os.getenv("CATALOG_BUNDLE_DIR", os.path.join(tempfile.gettempdir(), "the-contributor-catalog"))
+
+# bundles are built once per catalog change, so they can afford the slowest, smallest settings
+CATALOG_BUNDLE_LEVELS = {"gzip": 9, "br": 11}
+
+# superseded bundles are kept this long, for workers that looked up the
+# version just before it changed and are about to serve the old files
+CATALOG_BUNDLE_GRACE_SECONDS = float(os.getenv("CATALOG_BUNDLE_GRACE_SECONDS", "300"))
+
+# the submitter's contact details aren't part of the public catalog
+_EXCLUDED_FIELDS = {"name": 0, "email": 0, "removed": 0}
+
+# a plain copy is kept for clients that accept neither encoding
+_SUFFIXES = {"identity": "json", "gzip": "json.gz", "br": "json.br"}
+_BUNDLE_ENCODINGS = (*ENCODINGS, "identity")
+
+
+class CatalogBundle:
+    """
+    The active catalog as one precompressed JSON file per encoding, for the app
+    to keep offline.
+
+    Bundles are versioned by the change log's sequence number: the app can
+    download a bundle and then keep it current with
+    GET /resources/changes?since=<version>. A bundle is rebuilt on the first
+    request after the catalog changes, and only once however many requests
+    arrive while it is being built. The files are shared by all workers on the
+    host; each version is written once and the previous one is kept for
+    downloads still in progress.
+    """
+
+    def __init__(self, directory: str = CATALOG_BUNDLE_DIR):
+        self.directory = directory
+        self._builds = SingleFlight()
+
+    def path(self, version: int, encoding: str) -> str:
+        return os.path.join(self.directory, f"catalog-{version}.{_SUFFIXES[encoding]}")
+
+    async def current(self) -> tuple[int, dict[str, str]]:
+        """
+        Get the latest bundle, building it first if needed.
+
+        Returns:
+            tuple: the catalog version, and the file path for each available encoding
+                (including "identity" for the uncompressed file)
+        """
+        version = await current_seq()
+        files = {encoding: self.path(version, encoding) for encoding in _BUNDLE_ENCODINGS}
+        if not all(os.path.exists(path) for path in files.values()):
+            await self._builds.do(version, lambda: self._build(version))
+        return version, files
+
+    async def _build(self, version: int):
+        pipeline = [
+            {"$match": {"removed": False}},
+            {"$project": _EXCLUDED_FIELDS},
+            {"$addFields": {"_id": {"$toString": "$_id"}}}
+        ]
+        resources = await (await get_resources_collection().aggregate(pipeline)).to_list(length=None)
+
+        payload = dumps({
+            "version": version,
+            "generated_at": datetime.now(timezone.utc),
+            "resources": resources
+        })
+        await asyncio.to_thread(self._write, version, payload)
+        logger.info(f"Built catalog bundle version {version} with {len(resources)} resources ({len(payload)} bytes)")
+
+    def _write(self, version: int, payload: bytes):
+        os.makedirs(self.directory, exist_ok=True)
+        for encoding in _BUNDLE_ENCODINGS:
+            path = self.path(version, encoding)
+            if os.path.exists(path):
+                continue
+            # write to a temporary file and rename it, so nobody serves a half-written bundle
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(payload if encoding == "identity" else compress(payload, encoding, CATALOG_BUNDLE_LEVELS[encoding]))
+            os.replace(tmp_path, path)
+        self._prune(version)
+
+    def _prune(self, version: int):
+        """
+        Delete bundles older than `version` that were superseded more than
+        CATALOG_BUNDLE_GRACE_SECONDS ago. Newer ones belong to another worker.
+        """
+        bundles = {}
+        written_at: dict[int, float] = {}
+        for path in glob.glob(os.path.join(self.directory, "catalog-*.json*")):
+            try:
+                file_version = int(os.path.basename(path).split("-")[1].split(".")[0])
+                mtime = os.path.getmtime(path)
+            except (ValueError, FileNotFoundError):
+                continue
+            bundles[path] = file_version
+            written_at[file_version] = min(mtime, written_at.get(file_version, mtime))
+
+        # a version is superseded once the next one is written
+        versions = sorted(written_at)
+        superseded_at = {older: written_at[newer] for older, newer in zip(versions, versions[1:])}
+
+        now = time.time()
+        for path, file_version in bundles.items():
+            if file_version < version and now - superseded_at[file_version] >= CATALOG_BUNDLE_GRACE_SECONDS:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+
+catalog_bundle = CatalogBundle()
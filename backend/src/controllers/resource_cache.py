@@ -0,0 +1,99 @@
+import os
+from typing import Awaitable, Callable
+
+from src.utils.cache import TTLCache
+from src.utils.metrics import Counter, Gauge
+from src.utils.resource_events import on_resources_changed
+from src.utils.responses import dumps
+from src.utils.singleflight import SingleFlight
+
+RESOURCE_CACHE_MAX_ENTRIES = int(os.getenv("RESOURCE_CACHE_MAX_ENTRIES", "1000"))
+
+# each worker only hears about its own writes, so this bounds how long another
+# worker can keep serving a resource from before an update
+RESOURCE_CACHE_TTL_SECONDS = float(os.getenv("RESOURCE_CACHE_TTL_SECONDS", "300"))
+
+
+class ResourceCache:
+    """
+    Read-through LRU cache of single resources, for GET /resources/{identifier}.
+
+    Resources are cached by id, and org_names are mapped to the id they were
+    last found under, so a lookup by either one is served from the same entry.
+    An entry is dropped when its resource is written through this worker (see
+    resource_events), and expires after `ttl` seconds otherwise. Misses that
+    arrive together share one database read. Only resources that exist are
+    cached.
+
+    Cached documents are shared between requests and must not be modified.
+    """
+
+    def __init__(self, max_entries: int = RESOURCE_CACHE_MAX_ENTRIES, ttl: float = RESOURCE_CACHE_TTL_SECONDS):
+        # id -> (approximate size in bytes, resource)
+        self._resources = TTLCache(max_entries, ttl)
+        # org_name -> id
+        self._ids = TTLCache(max_entries, ttl)
+        self._loads = SingleFlight()
+        # bumped on every invalidation, so a read that started before a write doesn't cache what it read
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    @property
+    def size_bytes(self) -> int:
+        """Approximate memory held by the cached resources, measured as their JSON size."""
+        return sum(size for size, _ in self._resources.values())
+
+    async def get(self, search_by: str, identifier: str, load: Callable[[], Awaitable[dict | None]]) -> dict | None:
+        """
+        Get the resource whose `search_by` ("id" or "org_name") is `identifier`,
+        calling `load` to read it from the database on a miss.
+        """
+        resource_id = identifier if search_by == "id" else self._ids.get(identifier)
+        entry = self._resources.get(resource_id) if resource_id else None
+        # an org_name can point at an id whose resource has since been renamed
+        if entry and (search_by == "id" or entry[1].get("org_name") == identifier):
+            self.hits += 1
+            return entry[1]
+
+        self.misses += 1
+        generation = self._generation
+        resource = await self._loads.do((search_by, identifier, generation), load)
+        if resource and generation == self._generation:
+            self._resources.set(resource["_id"], (len(dumps(resource)), resource))
+            if resource.get("org_name"):
+                self._ids.set(resource["org_name"], resource["_id"])
+        return resource
+
+    def invalidate(self, resource_ids: list[str] | None):
+        """Drop the given resources, or everything if it isn't known which resources changed."""
+        self._generation += 1
+        if resource_ids is None:
+            self._resources.clear()
+            self._ids.clear()
+            return
+        # org_names pointing at these ids now miss, and are mapped again on the next read
+        for resource_id in resource_ids:
+            self._resources.pop(resource_id)
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self),
+            "bytes": self.size_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+
+resource_cache = ResourceCache()
+on_resources_changed(resource_cache.invalidate)
+
+Gauge("resource_cache_entries", "Resources in the single-resource cache.", func=lambda: len(resource_cache))
+Gauge("resource_cache_bytes", "Approximate size of the resources in the single-resource cache.", func=lambda: resource_cache.size_bytes)
+Counter("resource_cache_hits_total", "Single-resource lookups served from the cache.", func=lambda: resource_cache.hits)
+Counter("resource_cache_misses_total", "Single-resource lookups read from the database.", func=lambda: resource_cache.misses)
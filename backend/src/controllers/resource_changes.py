@@ -0,0 +1,214 @@
+import os
+from datetime import datetime, timedelta, timezone
+
+from bson import ObjectId
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+from src.config.database import (
+    get_counters_collection,
+    get_resource_changes_collection,
+    get_resources_collection
+)
+from src.config.logger import get_logger
+from src.utils.background import PeriodicTask
+from src.utils.locks import acquire_lease, release_lease
+
+logger = get_logger(__name__)
+
+# a change is only handed out once it is this old, so that a write which took
+# a sequence number but hasn't saved its entry yet can't be skipped over
+CHANGE_LOG_SETTLE_SECONDS = float(os.getenv("CHANGE_LOG_SETTLE_SECONDS", "2"))
+
+# how long tombstones (removed resources) stay in the change log; clients that
+# last synced before that have to start over
+CHANGE_LOG_TOMBSTONE_DAYS = int(os.getenv("CHANGE_LOG_TOMBSTONE_DAYS", "30"))
+
+CHANGE_LOG_COMPACTION_SECONDS = float(os.getenv("CHANGE_LOG_COMPACTION_SECONDS", "3600"))
+
+_COUNTER_ID = "resource_changes"
+_LEASE_NAME = "resource-changes-compaction"
+
+
+async def ensure_change_log():
+    """
+    Create the change log indexes. The first time, also add an entry for every
+    existing resource so a client syncing from 0 gets the whole catalog.
+    """
+    changes = get_resource_changes_collection()
+    await changes.create_index("resource_id", unique=True)
+    await changes.create_index("seq")
+
+    try:
+        await get_counters_collection().insert_one({"_id": _COUNTER_ID, "seq": 0, "floor": 0})
+    except DuplicateKeyError:
+        return
+
+    resource_ids = [str(doc["_id"]) async for doc in get_resources_collection().find({}, {"_id": 1})]
+    await record_changes(resource_ids)
+    logger.info(f"Started the resource change log with {len(resource_ids)} resource(s)")
+
+
+async def record_changes(resource_ids: list[str]):
+    """
+    Give each of the resources a new sequence number in the change log.
+
+    The log keeps one entry per resource, pointing at its latest change, so it
+    never grows past the size of the catalog plus the tombstones that haven't
+    been compacted yet. Whether a change is an upsert or a tombstone is decided
+    from the resource itself when the change is read.
+    """
+    resource_ids = list(dict.fromkeys(resource_ids))
+    if not resource_ids:
+        return
+
+    changed_at = datetime.now(timezone.utc)
+    counter = await get_counters_collection().find_one_and_update(
+        {"_id": _COUNTER_ID},
+        {"$inc": {"seq": len(resource_ids)}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    first_seq = counter["seq"] - len(resource_ids) + 1
+
+    await get_resource_changes_collection().bulk_write(
+        [
+            UpdateOne({"resource_id": resource_id}, {"$set": {"seq": first_seq + i, "changed_at": changed_at}}, upsert=True)
+            for i, resource_id in enumerate(resource_ids)
+        ],
+        ordered=False
+    )
+
+
+async def current_seq() -> int:
+    """The sequence number of the latest change, i.e. the version of the catalog."""
+    counter = await get_counters_collection().find_one({"_id": _COUNTER_ID}, {"seq": 1})
+    return counter["seq"] if counter else 0
+
+
+async def get_changes(since: int, limit: int, fields: list[str] | None = None) -> dict:
+    """
+    Get the resources changed after sequence number `since`, oldest change first.
+
+    Args:
+        since: the "seq" of the previous sync, or 0 for everything
+        limit: most changes to return; "has_more" is set if there are more
+        fields: fields to return for each upserted resource, or None for whole documents
+
+    Returns:
+        dict: Contains:
+            - 'success' (bool): True if the changes were read
+            - 'since' (int): the requested sequence number
+            - 'seq' (int): the sequence number to pass as `since` next time
+            - 'has_more' (bool): True if the limit was hit
+            - 'full_resync' (bool): True if `since` is too old (or unknown) to sync from; drop
+              the local copy and sync again from 0
+            - 'upserts' (list of dicts): resources that were created or updated
+            - 'deleted' (list of str): ids of resources that were removed
+    """
+    counter = await get_counters_collection().find_one({"_id": _COUNTER_ID}) or {}
+    latest, floor = counter.get("seq", 0), counter.get("floor", 0)
+
+    # tombstones up to `floor` have been compacted away, so a client that synced before
+    # them could be holding removed resources; since=0 is fine, it holds nothing yet
+    if 0 < since < floor or since > latest:
+        return {
+            "success": True,
+            "since": since,
+            "seq": 0,
+            "has_more": False,
+            "full_resync": True,
+            "upserts": [],
+            "deleted": []
+        }
+
+    cutoff = datetime.now(timezone.utc) - timedelta(seconds=CHANGE_LOG_SETTLE_SECONDS)
+    entries = []
+    has_more = False
+    cursor = get_resource_changes_collection().find(
+        {"seq": {"$gt": since}},
+        {"_id": 0, "resource_id": 1, "seq": 1, "changed_at": 1}
+    ).sort("seq", ASCENDING).limit(limit + 1)
+
+    async for entry in cursor:
+        # stop at the first change that's too new; it and everything after it comes next time
+        if entry["changed_at"].replace(tzinfo=timezone.utc) > cutoff:
+            break
+        if len(entries) == limit:
+            has_more = True
+            break
+        entries.append(entry)
+
+    documents = {}
+    if entries:
+        projection = None
+        if fields is not None:
+            projection = {field: 1 for field in fields}
+            projection["removed"] = 1
+
+        pipeline = [{"$match": {"_id": {"$in": [ObjectId(entry["resource_id"]) for entry in entries]}}}]
+        if projection:
+            pipeline.append({"$project": projection})
+        pipeline.append({"$addFields": {"_id": {"$toString": "$_id"}}})
+
+        async for document in await get_resources_collection().aggregate(pipeline):
+            documents[document["_id"]] = document
+
+    upserts, deleted = [], []
+    for entry in entries:
+        document = documents.get(entry["resource_id"])
+        if document is None or document.get("removed"):
+            deleted.append(entry["resource_id"])
+            continue
+        if fields is not None and "removed" not in fields:
+            document.pop("removed", None)
+        upserts.append(document)
+
+    return {
+        "success": True,
+        "since": since,
+        "seq": entries[-1]["seq"] if entries else since,
+        "has_more": has_more,
+        "full_resync": False,
+        "upserts": upserts,
+        "deleted": deleted
+    }
+
+
+async def compact_change_log():
+    """
+    Drop tombstones older than CHANGE_LOG_TOMBSTONE_DAYS and raise the floor past
+    them, so clients that haven't synced since then are told to start over.
+    """
+    if not await acquire_lease(_LEASE_NAME, ttl_seconds=CHANGE_LOG_COMPACTION_SECONDS * 2):
+        return
+
+    changes = get_resource_changes_collection()
+    cutoff = datetime.now(timezone.utc) - timedelta(days=CHANGE_LOG_TOMBSTONE_DAYS)
+    old = [entry async for entry in changes.find({"changed_at": {"$lt": cutoff}}, {"resource_id": 1, "seq": 1})]
+    if not old:
+        return
+
+    live = {
+        str(doc["_id"])
+        async for doc in get_resources_collection().find(
+            {"_id": {"$in": [ObjectId(entry["resource_id"]) for entry in old]}, "removed": {"$ne": True}},
+            {"_id": 1}
+        )
+    }
+    tombstones = [entry for entry in old if entry["resource_id"] not in live]
+    if not tombstones:
+        return
+
+    # raise the floor first: a crash in between only makes some clients resync early
+    await get_counters_collection().update_one(
+        {"_id": _COUNTER_ID},
+        {"$max": {"floor": max(entry["seq"] for entry in tombstones)}}
+    )
+    await changes.delete_many({"_id": {"$in": [entry["_id"] for entry in tombstones]}})
+    logger.info(f"Compacted {len(tombstones)} tombstone(s) from the resource change log")
+
+
+change_log_compaction_task = PeriodicTask(
+    "resource-changes-compaction", CHANGE_LOG_COMPACTION_SECONDS, compact_change_log, on_stop=lambda: release_lease(_LEASE_NAME)
+)
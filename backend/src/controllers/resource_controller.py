@@ -23,15 +23,60 @@ from src.utils.utils import (
     normalize_sheet_resource
 )
 from src.utils.email_notifications import send_submission_status_email
+from src.utils.resource_events import resources_changed
+from src.controllers.resource_cache import resource_cache
+from src.controllers.resource_changes import record_changes
+from src.config.logger import get_logger
 
+logger = get_logger(__name__)
 
-async def get_resources(collection, active: bool, check_removed: bool):
+# most resources POST /resources/batch looks up in one request
+RESOURCE_BATCH_MAX_ITEMS = int(os.getenv("RESOURCE_BATCH_MAX_ITEMS", "100"))
+
+# fields a resource list can be narrowed to with ?fields=
+RESOURCE_FIELDS = frozenset(Resource.model_fields) | {"_id"}
+
+# what the list and map views need; the long free-text fields and the submitter's
+# contact details are left for GET /resources/{identifier}
+SUMMARY_FIELDS = (
+    "_id", "org_name", "category", "subcategory", "group", "id_required",
+    "hours", "bus_line", "address", "city", "state", "zip_code", "website", "coordinates",
+)
+
+
+def parse_fields(fields: str) -> list[str] | None:
+    """
+    Turn a ?fields= value into the list of fields to project.
+
+    "full" means the whole document (None). "summary" stands for SUMMARY_FIELDS,
+    and can be combined with other field names, e.g. "summary,services,phone".
+    Raises a 400 for unknown fields.
+    """
+    requested = [f.strip() for f in fields.split(",") if f.strip()]
+    if not requested:
+        raise HTTPException(status_code=400, detail="fields must not be empty")
+    if "full" in requested:
+        return None
+
+    projected = []
+    for field in requested:
+        expanded = SUMMARY_FIELDS if field == "summary" else (field,)
+        for name in expanded:
+            if name not in RESOURCE_FIELDS:
+                raise HTTPException(status_code=400, detail=f"Unknown field '{name}'")
+            if name not in projected:
+                projected.append(name)
+    return projected
+
+
+async def get_resources(collection, active: bool, check_removed: bool, fields: list[str] | None = None):
     """
     Retrieve all resources from the database where "removed" is false.
 
     Args:
         collection: MongoDB collection instance ("resources")
         active: True if only "active" resources are to be fetched, False if all resources are to be fetched
+        fields: Fields to return for each resource (see parse_fields), or None for whole documents
 
     Returns:
         dict: Contains:
@@ -40,22 +85,21 @@ async def get_resources(collection, active: bool, check_removed: bool):
             - 'resources' (list of dicts): a list of Resource documents
     """
     try:
-        resources = []
-        
         # find active/all resources depending on "active" boolean parameter
-        if check_removed: 
+        if check_removed:
             query = {"removed": False} if active else {}
         else:
             query = {}
-            
-        cursor = collection.find(query)
-        
-        # add all valid queries into list
-        async for document in cursor:
-            # convert ObjectId to json
-            document["_id"] = str(document["_id"])
-            resources.append(document)
-        
+
+        pipeline = [{"$match": query}]
+        if fields is not None:
+            pipeline.append({"$project": {field: 1 for field in fields}})
+        # have the server convert ObjectId to a string so the documents can be returned as they are
+        pipeline.append({"$addFields": {"_id": {"$toString": "$_id"}}})
+
+        cursor = await collection.aggregate(pipeline)
+        resources = await cursor.to_list(length=None)
+
         # return success message and resources as a list of dicts
         return {
             "success": True, 
@@ -63,7 +107,7 @@ async def get_resources(collection, active: bool, check_removed: bool):
             "resources": resources
         }
     except Exception as e:
-        print(f"Error in get_all_resources controller: {e}")
+        logger.error(f"Error in get_all_resources controller: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error.")
     
 
@@ -89,16 +133,19 @@ async def create_resource(resource: Resource, collection):
 
         # return result with id for client use
         resource_dict["_id"] = str(result.inserted_id)
+        resources_changed([resource_dict["_id"]])
+        await record_changes([resource_dict["_id"]])
 
         return {"success": True, "resource": resource_dict}
     except Exception as e:
-        print(f"Error in create_resource controller: {e}")
+        logger.error(f"Error in create_resource controller: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error.")
     
 
 async def get_resource(identifier: str, collection, search_by: str = "id"):
     """
-    Get a resource based on its id or org_name.
+    Get a resource based on its id or org_name. Resources that were looked up
+    recently are served from the resource cache.
 
     Args:
         identifier (str): Either a MongoDB ObjectId string or an org_name
@@ -111,27 +158,111 @@ async def get_resource(identifier: str, collection, search_by: str = "id"):
             - 'resource' (dict or None): Resource document or None if not found
     """
     try:
-        if search_by == "id":
-            # search by ObjectId
-            object_id = ObjectId(identifier)
-            resource = await collection.find_one({"_id": object_id})
-        elif search_by == "org_name":
-            # search by org_name
-            resource = await collection.find_one({"org_name": identifier})
-        else:
+        if search_by not in ("id", "org_name"):
             raise HTTPException(status_code=400, detail="search_by must be 'id' or 'org_name'")
 
-        if resource:
-            resource["_id"] = str(resource["_id"])
+        async def load():
+            if search_by == "id":
+                # search by ObjectId
+                resource = await collection.find_one({"_id": ObjectId(identifier)})
+            else:
+                # search by org_name
+                resource = await collection.find_one({"org_name": identifier})
+
+            if resource:
+                resource["_id"] = str(resource["_id"])
+            return resource
+
+        resource = await resource_cache.get(search_by, identifier, load)
 
         return {"success": True, "resource": resource}
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in get_resource controller: {e}")
+        logger.error(f"Error in get_resource controller: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error.")
     
 
+async def get_resources_batch(
+    collection,
+    ids: list[str],
+    org_names: list[str],
+    fields: list[str] | None = None,
+    active: bool = True
+):
+    """
+    Get several resources by id and/or org_name in one query.
+
+    Args:
+        collection: MongoDB collection instance ("resources")
+        ids: MongoDB ObjectId strings
+        org_names: org_names to look up
+        fields: Fields to return for each resource (see parse_fields), or None for whole documents
+        active: True to only return resources that haven't been removed
+
+    Returns:
+        dict: Contains:
+            - 'success' (bool): True if the lookup ran
+            - 'resources' (list of dicts): found resources, in the order they were asked for (ids first)
+            - 'missing' (dict): the 'ids' and 'org_names' that matched no resource (or only removed
+              ones, if `active`)
+    """
+    if not ids and not org_names:
+        raise HTTPException(status_code=400, detail="Provide ids or org_names")
+    if len(ids) + len(org_names) > RESOURCE_BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {RESOURCE_BATCH_MAX_ITEMS} resources per batch")
+
+    try:
+        # ids that aren't valid ObjectIds can't match anything, they just end up in 'missing'
+        object_ids = {identifier: ObjectId(identifier) for identifier in ids if ObjectId.is_valid(identifier)}
+
+        clauses = []
+        if object_ids:
+            clauses.append({"_id": {"$in": list(object_ids.values())}})
+        if org_names:
+            clauses.append({"org_name": {"$in": org_names}})
+
+        by_id, by_org_name = {}, {}
+        if clauses:
+            query = {"$or": clauses}
+            if active:
+                query["removed"] = False
+            pipeline = [{"$match": query}]
+            if fields is not None:
+                # org_name is needed to put the results back in request order
+                projection = {field: 1 for field in fields}
+                if org_names:
+                    projection["org_name"] = 1
+                pipeline.append({"$project": projection})
+            pipeline.append({"$addFields": {"_id": {"$toString": "$_id"}}})
+
+            cursor = await collection.aggregate(pipeline)
+            async for document in cursor:
+                by_id[document["_id"]] = document
+                by_org_name.setdefault(document.get("org_name"), document)
+
+        resources = []
+        missing = {"ids": [], "org_names": []}
+        for identifier in ids:
+            object_id = object_ids.get(identifier)
+            document = by_id.get(str(object_id)) if object_id else None
+            if document:
+                resources.append(document)
+            else:
+                missing["ids"].append(identifier)
+        for org_name in org_names:
+            document = by_org_name.get(org_name)
+            if document:
+                resources.append(document)
+            else:
+                missing["org_names"].append(org_name)
+
+        return {"success": True, "resources": resources, "missing": missing}
+    except Exception as e:
+        logger.error(f"Error in get_resources_batch controller: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Internal server error.")
+
+
 async def update_resource(resource_id: str, updates: dict, collection):
     """
     Update a resource with the provided fields.
@@ -160,6 +291,10 @@ async def update_resource(resource_id: str, updates: dict, collection):
         if result.matched_count == 0:
             raise HTTPException(status_code=404, detail="Resource not found")
 
+        resources_changed([resource_id])
+        # this is also how resources are removed (removed=True); readers of the change log see those as tombstones
+        await record_changes([resource_id])
+
         return {
             "success": True,
             "message": "Resource updated successfully.",
@@ -169,7 +304,7 @@ async def update_resource(resource_id: str, updates: dict, collection):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in update_resource controller: {e}")
+        logger.error(f"Error in update_resource controller: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error.")
     
 
@@ -214,9 +349,14 @@ async def seed_db(resources: List[dict], collection):
             else:
                 results.append({"org_name": resource["org_name"], "status": "inserted"})
 
+        resources_changed()
+
+        seeded = collection.find({"org_name": {"$in": [r["org_name"] for r in results]}}, {"_id": 1})
+        await record_changes([str(doc["_id"]) async for doc in seeded])
+
         return {"success": True, "results": results}
     except Exception as e:
-        print(f"Error in seed_db_from_sheets controller: {e}")
+        logger.error(f"Error in seed_db_from_sheets controller: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error.")
     
 
@@ -268,13 +408,13 @@ async def receive_form(request: Request, pending_collection, resource_collection
                     "resource": updated_resource.model_dump()
                 }
             else:
-                print(f"Error: no existing resource with org_name {resource_data.get('org_name')}")
+                logger.warning(f"No existing resource with org_name {resource_data.get('org_name')}")
                 raise HTTPException(status_code=422, detail=f"Cannot update: No existing resource with org_name='{resource_data.get('org_name')}'")
 
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in receive_form controller: {e}")
+        logger.error(f"Error in receive_form controller: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error.")
     
 
@@ -377,7 +517,7 @@ async def approve_submission(submission_id: str, pending_collection, resource_co
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in approve_submission controller: {e}")
+        logger.error(f"Error in approve_submission controller: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error.")
 
 
@@ -427,7 +567,7 @@ async def deny_submission(submission_id: str, pending_collection):
     except HTTPException:
         raise
     except Exception as e:
-        print(f"Error in deny_submission controller: {e}")
+        logger.error(f"Error in deny_submission controller: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Internal server error.")
     
 
@@ -6,10 +6,22 @@ backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if backend_dir not in sys.path:
     sys.path.insert(0, backend_dir)
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from contextlib import asynccontextmanager
 from src.config.database import MongoDB
 from src.config.logger import get_logger
+from src.middleware.compression import CompressionMiddleware
+from src.middleware.metrics import MetricsMiddleware
+from src.middleware.request_id import RequestIdMiddleware
+from src.utils.metrics import REGISTRY
+from src.vendor.spatial_index import refresh_active_vendor_index
+from src.vendor.location_buffer import location_buffer
+from src.vendor.sweeper import auto_clock_out_task, ensure_clock_in_index
+from src.vendor.location_history import location_history, ensure_location_history_collection
+from src.analytics.event_buffer import event_buffer
+from src.analytics.rollups import rollup_task, ensure_analytics_collections
+from src.analytics.engagement import engagement_counters
+from src.controllers.resource_changes import change_log_compaction_task, ensure_change_log
 
 from src.vendor.routes import router, vendor_public_router
 from src.utils.util_routes import router as util_routes
@@ -18,6 +30,7 @@ from src.routes.resource_routes import router as resource_router
 from src.routes.resource_helper_routes import router as resource_helper_router
 from src.routes.announcement_routes import router as announcement_router
 from src.routes.analytics import router as analytics_router
+from src.chatbot.router import router as chatbot_router
 
 logger = get_logger(__name__)
 
@@ -26,13 +39,52 @@ async def lifespan(app: FastAPI):
     # connect to MongoDB, initialize client
     await MongoDB.connect_db()
 
+    # create indexes and collections used by background jobs
+    await ensure_clock_in_index()
+    await ensure_location_history_collection()
+    await ensure_analytics_collections()
+    await ensure_change_log()
+
+    # load clocked-in vendors into the nearest-vendor index
+    await refresh_active_vendor_index(force=True)
+
+    # start background jobs
+    location_buffer.start()
+    auto_clock_out_task.start()
+    location_history.start()
+    event_buffer.start()
+    rollup_task.start()
+    engagement_counters.start()
+    change_log_compaction_task.start()
+
     # stop here until server shuts down
     yield
 
-    # close connection, set client to null
-    await MongoDB.close_db()
+    # stop background jobs, flushing anything still buffered. One that fails
+    # to stop (e.g. MongoDB went away mid-flush) mustn't keep the rest from
+    # saving what they hold
+    try:
+        for name, stop in (
+            ("auto clock-out sweeper", auto_clock_out_task.stop),
+            ("location buffer", location_buffer.stop),
+            ("location history", location_history.stop),
+            ("analytics event buffer", event_buffer.stop),
+            ("analytics rollups", rollup_task.stop),
+            ("engagement counters", engagement_counters.stop),
+            ("change log compaction", change_log_compaction_task.stop),
+        ):
+            try:
+                await stop()
+            except Exception:
+                logger.error(f"Failed to stop {name}", exc_info=True)
+    finally:
+        # close connection, set client to null
+        await MongoDB.close_db()
 
 app = FastAPI(lifespan = lifespan)
+app.add_middleware(CompressionMiddleware)
+app.add_middleware(MetricsMiddleware)
+app.add_middleware(RequestIdMiddleware)
 
 app.include_router(admin_router)
 app.include_router(router)
@@ -42,8 +94,14 @@ app.include_router(resource_router)
 app.include_router(announcement_router)
 app.include_router(resource_helper_router)
 app.include_router(analytics_router)
+app.include_router(chatbot_router)
 
 @app.get("/")
 def root():
     return {"message": "Hello, World!"}
 
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """Request, chatbot and MongoDB metrics of this worker, in the Prometheus text format."""
+    return Response(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
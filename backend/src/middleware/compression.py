@@ -0,0 +1,139 @@
+import asyncio
+import os
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.utils.cache import TTLCache
+from src.utils.compression import compress, negotiate
+from src.utils.metrics import Counter, Gauge
+
+# smaller bodies aren't worth the CPU, and may not even shrink
+COMPRESSION_MIN_BYTES = int(os.getenv("COMPRESSION_MIN_BYTES", "1024"))
+
+COMPRESSION_CACHE_MAX_ENTRIES = int(os.getenv("COMPRESSION_CACHE_MAX_ENTRIES", "64"))
+COMPRESSION_CACHE_TTL_SECONDS = float(os.getenv("COMPRESSION_CACHE_TTL_SECONDS", "3600"))
+
+# bodies at least this big are compressed in a thread instead of on the event loop
+_THREAD_MIN_BYTES = 256 * 1024
+
+_COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml", "image/svg+xml")
+
+# (path, query string, ETag, encoding) -> compressed body
+compressed_bodies = TTLCache(COMPRESSION_CACHE_MAX_ENTRIES, COMPRESSION_CACHE_TTL_SECONDS)
+
+compressed_responses = Counter(
+    "http_compressed_responses_total",
+    "Responses sent compressed, by encoding.",
+    ("encoding",),
+)
+Gauge("http_compression_cache_entries", "Compressed bodies in the compression cache.", func=lambda: len(compressed_bodies))
+Counter("http_compression_cache_hits_total", "Compressed bodies served from the cache.", func=lambda: compressed_bodies.hits)
+Counter("http_compression_cache_misses_total", "Cacheable bodies that had to be compressed.", func=lambda: compressed_bodies.misses)
+
+
+class CompressionMiddleware:
+    """
+    Compresses response bodies with brotli or gzip, whichever the client prefers.
+
+    Only whole bodies of at least `minimum_size` bytes with a text-like content
+    type are compressed. Streamed responses (e.g. the chatbot's server-sent
+    events) and responses that are already encoded (e.g. the catalog bundle)
+    pass through untouched.
+
+    Responses with an ETag are compressed once per ETag and encoding and then
+    served from a cache, so a hot response like GET /resources/ is only
+    compressed again when the catalog changes. Their ETag is made weak, as the
+    compressed bytes differ from the uncompressed ones.
+    """
+
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_BYTES, cache: TTLCache = compressed_bodies):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding"))
+        if encoding is None:
+            async def send_identity(message: Message):
+                if message["type"] == "http.response.start":
+                    # another client could have been sent this compressed
+                    _vary(MutableHeaders(raw=message["headers"]))
+                await send(message)
+
+            await self.app(scope, receive, send_identity)
+            return
+
+        start: Message | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message):
+            nonlocal start, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                # hold the headers back until we know whether the body gets compressed
+                start = message
+                return
+            if message["type"] != "http.response.body":
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            headers = MutableHeaders(raw=start["headers"])
+            body = message.get("body", b"")
+            _vary(headers)
+            if message.get("more_body", False) or not self._compressible(start["status"], headers, body):
+                passthrough = True
+                await send(start)
+                await send(message)
+                return
+
+            etag = headers.get("etag")
+            key = (scope["path"], scope["query_string"], etag, encoding) if etag and start["status"] == 200 else None
+            compressed = self.cache.get(key) if key else None
+            if compressed is None:
+                if len(body) >= _THREAD_MIN_BYTES:
+                    compressed = await asyncio.to_thread(compress, body, encoding)
+                else:
+                    compressed = compress(body, encoding)
+                if key:
+                    self.cache.set(key, compressed)
+
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            if etag and not etag.startswith("W/"):
+                headers["etag"] = f"W/{etag}"
+            compressed_responses.inc(encoding)
+
+            await send(start)
+            await send({"type": "http.response.body", "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
+
+    def _compressible(self, status: int, headers: MutableHeaders, body: bytes) -> bool:
+        if status < 200 or status in (204, 206, 304) or "content-encoding" in headers:
+            return False
+        if len(body) < self.minimum_size:
+            return False
+        return _compressible_type(headers)
+
+
+def _compressible_type(headers: MutableHeaders) -> bool:
+    return headers.get("content-type", "").startswith(_COMPRESSIBLE_TYPES)
+
+
+def _vary(headers: MutableHeaders):
+    """
+    Add Vary: Accept-Encoding to any response that is compressed for some
+    clients, including the ones sent uncompressed (too small, or a client
+    that doesn't accept an encoding), so shared caches keep the two apart.
+    """
+    if _compressible_type(headers) and "content-encoding" not in headers:
+        headers.add_vary_header("Accept-Encoding")
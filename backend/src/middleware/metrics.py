@@ -0,0 +1,64 @@
+import time
+
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from src.utils.metrics import Counter, Gauge, HistogramVec
+
+request_duration = HistogramVec(
+    "http_request_duration_seconds",
+    "Time from receiving a request until its response has been sent.",
+    ("method", "route"),
+)
+requests_total = Counter(
+    "http_requests_total",
+    "Requests handled, by response status.",
+    ("method", "route", "status"),
+)
+requests_in_progress = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled.",
+    ("method",),
+)
+
+# label for paths that don't match any route, so 404 scans don't create a series per path
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+class MetricsMiddleware:
+    """
+    Records request counts, status codes and latency per route, labelled by the
+    route's path template (e.g. /resources/{identifier}) rather than the raw
+    path, and the number of requests in progress.
+
+    A plain ASGI middleware rather than BaseHTTPMiddleware, which would add a
+    task and a stream copy to every request.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        started = time.perf_counter()
+
+        async def send_with_status(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        requests_in_progress.inc(method)
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            requests_in_progress.dec(method)
+            # the router records the route it matched in the scope; the route is only known
+            # after routing, which is why requests in progress are counted per method only
+            route = getattr(scope.get("route"), "path", UNMATCHED_ROUTE)
+            request_duration.labels(method, route).observe(time.perf_counter() - started)
+            requests_total.inc(method, route, str(status))
@@ -1,30 +1,115 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Depends, Query
 from src.config.logger import get_logger
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, model_validator
 from typing import Literal
-from src.config.database import MongoDB
+from bson import ObjectId
+from datetime import date, datetime, time, timedelta, timezone
+from src.analytics.event_buffer import event_buffer, EventBufferFull, ANALYTICS_FLUSH_SECONDS
+from src.analytics.rollups import get_summary
+from src.analytics.engagement import engagement_counters, get_popular_resources, ENGAGEMENT_FIELDS
+from src.admin.middleware import get_current_admin
 
 logger = get_logger(__name__)
 router = APIRouter(prefix="/api/analytics", tags=["analytics"])
 
 
-def _analytics_collection():
-    return MongoDB.get_collection("analytics")
-
-
 class EventBody(BaseModel):
     id: str
     event: Literal[
         "device_registered",
-        "app_entered"
+        "app_entered",
+        "resource_viewed",
+        "resource_called",
+        "resource_directions"
     ]
+    resource_id: str | None = None
+
+    @model_validator(mode="after")
+    def check_resource_id(self):
+        if self.event in ENGAGEMENT_FIELDS and not ObjectId.is_valid(self.resource_id or ""):
+            raise ValueError(f"{self.event} events need a valid resource_id")
+        return self
+
+class EventBatch(BaseModel):
+    events: list[EventBody] = Field(..., min_length=1, max_length=500)
 
 @router.post("/event")
-async def event(body: EventBody):
+async def event(body: EventBody | EventBatch):
+    """
+    Record one event, or several with {"events": [...]}.
+
+    Events are buffered and written to MongoDB in batches, so a success
+    response means the event was accepted, not that it was saved yet.
+    """
+    events = body.events if isinstance(body, EventBatch) else [body]
+    try:
+        event_buffer.add([(e.id, e.event, e.resource_id) for e in events])
+    except EventBufferFull:
+        logger.warning(f"Analytics buffer full, rejected {len(events)} event(s)")
+        raise HTTPException(
+            503,
+            "Too many events, try again later.",
+            headers={"Retry-After": str(max(1, round(ANALYTICS_FLUSH_SECONDS)))}
+        )
+
+    for e in events:
+        if e.event in ENGAGEMENT_FIELDS:
+            engagement_counters.add(e.resource_id, e.event)
+
+    return { "status": "success", "accepted": len(events) }
+
+@router.get("/summary")
+async def summary(
+    from_date: date | None = Query(None, alias="from"),
+    to_date: date | None = Query(None, alias="to"),
+    current_admin: dict = Depends(get_current_admin)
+):
+    """
+    Daily event counts and estimated unique devices between two dates
+    (inclusive, UTC), read from the pre-aggregated daily rollups.
+    Defaults to the last 30 days.
+
+    Example:
+        GET /api/analytics/summary?from=2025-11-01&to=2025-11-30
+    """
+    to_date = to_date or datetime.now(timezone.utc).date()
+    from_date = from_date or to_date - timedelta(days=29)
+
+    if from_date > to_date:
+        raise HTTPException(400, "from must not be after to.")
+    if (to_date - from_date).days > 366:
+        raise HTTPException(400, "Date range can't be longer than a year.")
+
+    result = await get_summary(datetime.combine(from_date, time()), datetime.combine(to_date, time()))
+    return { "from": from_date, "to": to_date, **result }
+
+@router.get("/popular")
+async def popular(
+    category: str | None = None,
+    subcategory: str | None = None,
+    lat: float | None = Query(None, ge=-90, le=90),
+    lng: float | None = Query(None, ge=-180, le=180),
+    radius_km: float | None = Query(None, gt=0),
+    limit: int = Query(10, ge=1, le=50)
+):
+    """
+    Most viewed/called/navigated-to resources, optionally in a category or
+    subcategory ("popular in category") or within radius_km of lat/lng
+    ("popular near you", 10 km unless given). Rankings are refreshed about
+    once a minute.
+
+    Examples:
+        GET /api/analytics/popular?category=Urgent%20Needs
+        GET /api/analytics/popular?lat=36.16&lng=-86.78&radius_km=5
+    """
+    if (lat is None) != (lng is None):
+        raise HTTPException(400, "lat and lng must be given together.")
+    if radius_km is not None and lat is None:
+        raise HTTPException(400, "radius_km needs lat and lng.")
+
     try:
-        db = _analytics_collection()
-        await db.update_one({ "id": body.id }, { "$push": { "events": body.event }}, upsert=True)
-        return { "status": "success" }
+        resources = await get_popular_resources(limit, category, subcategory, lat, lng, radius_km)
+        return { "resources": resources }
     except Exception as e:
-        logger.error(f"Failed to update events for {body.id}: {str(e)}")
-        raise HTTPException(500, "Failed to post event.")
\ No newline at end of file
+        logger.error(f"Failed to get popular resources: {str(e)}")
+        raise HTTPException(500, "Failed to get popular resources.")
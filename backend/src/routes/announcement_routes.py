@@ -5,18 +5,25 @@ from bson import ObjectId
 from src.config.database import get_announcements_collection
 from src.admin.middleware import get_current_admin
 from src.schemas.announcement import AnnouncementCreate
+from src.utils.coalesce import coalesce, note_write
 
 router = APIRouter(prefix="/announcements")
 
+_GET_ALL_ROUTE = "/announcements/getAll"
+
+async def _load_announcements():
+    announcements = get_announcements_collection()
+    all_announcements = []
+    async for announcement in announcements.find().sort("created_at", 1):
+        announcement["id"] = str(announcement.pop("_id"))
+        all_announcements.append(announcement)
+    return {"announcements": all_announcements}
+
+
 @router.get("/getAll", status_code=status.HTTP_200_OK)
 async def get_announcements():
     try:
-        announcements = get_announcements_collection()
-        all_announcements = []
-        async for announcement in announcements.find().sort("created_at", 1):
-            announcement["id"] = str(announcement.pop("_id"))
-            all_announcements.append(announcement)
-        return {"announcements": all_announcements}
+        return await coalesce(_GET_ALL_ROUTE, None, _load_announcements)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -27,6 +34,7 @@ async def create_announcement(data: AnnouncementCreate, current_admin: dict = De
         announcements = get_announcements_collection()
         new_announcement = {"content": data.content, "created_at": datetime.now()}
         result = await announcements.insert_one(new_announcement)
+        note_write(_GET_ALL_ROUTE)
         return {"id": str(result.inserted_id), "created_at": new_announcement["created_at"]}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -37,6 +45,7 @@ async def delete_announcement(announcement_id: str, current_admin: dict = Depend
     try:
         announcements = get_announcements_collection()
         deleted = await announcements.delete_one({"_id": ObjectId(announcement_id)})
+        note_write(_GET_ALL_ROUTE)
         if deleted.deleted_count == 0:
             raise HTTPException(status_code=404, detail="No announcement deleted: not found")
         return {"message": "Announcement deleted"}
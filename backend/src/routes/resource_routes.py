@@ -1,6 +1,8 @@
+import hashlib
 import os
 import sys
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import FileResponse
 
 
 # Add the backend directory to sys.path so 'src' module can be found
@@ -8,33 +10,47 @@ backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__
 if backend_dir not in sys.path:
     sys.path.insert(0, backend_dir)
 
-from src.schemas.resource import Resource
+from src.schemas.resource import Resource, ResourceBatchRequest
 from src.controllers.resource_controller import (
     get_resources,
+    parse_fields,
     create_resource,
     get_resource,
+    get_resources_batch,
     update_resource,
     receive_form,
     approve_submission,
     deny_submission
 )
+from src.controllers.resource_changes import current_seq, get_changes
+from src.controllers.resource_bundle import catalog_bundle
 from src.config.database import get_resources_collection, get_pending_collection
 from src.config.logger import get_logger
 from src.admin.middleware import get_current_admin
+from src.utils.responses import FastJSONResponse, etag_matches
+from src.utils.compression import accepts_identity, negotiate
+from src.utils.coalesce import coalesce
 
 router = APIRouter(prefix="/resources", tags=["Resources"])
 logger = get_logger(__name__)
 
 @router.get("/")
-async def route_get_resources(active: bool = True):
+async def route_get_resources(request: Request, active: bool = True, fields: str = "summary"):
     """
     Retrieve resources from MongoDB.
 
     Args:
         active: True if only "active" resources are to be fetched, False if all resources are to be fetched
+        fields: "summary" (default) for the fields the list and map views use, "full" for whole
+            documents, or a comma-separated list of field names, which may include "summary"
 
-    Example: 
+    Examples:
         GET /resources?active=false
+        GET /resources?fields=summary,services,phone
+        GET /resources?fields=full
+
+    The response has an ETag that changes with the catalog; send it back in
+    If-None-Match to get a 304 when nothing has changed.
 
     Returns:
         JSON object containing:
@@ -44,10 +60,27 @@ async def route_get_resources(active: bool = True):
     """
     logger.info("Fetching all active resources...")
     try:
+        projection = parse_fields(fields)
+
+        # read the version before the resources, so the ETag is never newer than the body
+        version = await current_seq()
+        selection = "full" if projection is None else ",".join(projection)
+        etag = f'"resources-{version}-{int(active)}-{hashlib.sha1(selection.encode()).hexdigest()[:12]}"'
+        headers = {"ETag": etag, "Cache-Control": "no-cache"}
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
         collection = get_resources_collection()
-        resources = await get_resources(collection, active=active, check_removed=True)
+        # only share reads of the same version, or a body read before a write would go out under the newer ETag
+        resources = await coalesce(
+            "/resources/",
+            (version, active, selection),
+            lambda: get_resources(collection, active=active, check_removed=True, fields=projection)
+        )
         logger.info(f"Successfully retrieved {len(resources.get('resources', []))} {'active ' if active else ''} resources.")
-        return resources
+        return FastJSONResponse(resources, headers=headers)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Error retrieving resources: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to retrieve resources")
@@ -70,6 +103,107 @@ async def route_create_resource(resource: Resource):
         raise HTTPException(status_code=500, detail="Failed to create resource")
 
 
+@router.get("/changes")
+async def route_get_resource_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=5000),
+    fields: str = "summary"
+):
+    """
+    Get the resources created, updated or removed since the last sync.
+
+    Args:
+        since: "seq" from the previous response, or 0 to get every resource
+        limit: most changes per response; keep calling with the new "seq" while "has_more" is true
+        fields: as in GET /resources/, for the upserted resources
+
+    If "full_resync" is true, `since` is older than the change log goes back:
+    drop the local copy and sync again from 0.
+
+    Example:
+        GET /resources/changes?since=1520&fields=summary,services,phone
+    """
+    logger.info(f"Getting resource changes since {since}")
+    try:
+        projection = parse_fields(fields)
+        changes = await get_changes(since, limit, projection)
+        logger.info(f"Returning {len(changes['upserts'])} upsert(s) and {len(changes['deleted'])} deletion(s) since {since}")
+        return FastJSONResponse(changes)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving resource changes since {since}: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to retrieve resource changes")
+
+
+@router.get("/bundle")
+async def route_get_resource_bundle(request: Request):
+    """
+    Download the whole active catalog as one precompressed JSON file, for offline use.
+
+    The body is {"version", "generated_at", "resources"}, sent with Content-Encoding
+    br or gzip depending on Accept-Encoding, or uncompressed if the client takes
+    neither (406 if it refuses that too). Pass the ETag back in If-None-Match to
+    get a 304 if the catalog hasn't changed, and use Range to resume a download.
+    Afterwards, keep the copy current with GET /resources/changes?since=<version>.
+    """
+    try:
+        version, files = await catalog_bundle.current()
+        accept_encoding = request.headers.get("accept-encoding")
+        encoding = negotiate(accept_encoding, tuple(e for e in files if e != "identity"))
+        if encoding is None:
+            if not accepts_identity(accept_encoding):
+                raise HTTPException(status_code=406, detail="The catalog bundle is only available as br, gzip or uncompressed")
+            encoding = "identity"
+
+        etag = f'"catalog-{version}-{encoding}"'
+        headers = {
+            "ETag": etag,
+            "Vary": "Accept-Encoding",
+            "Cache-Control": "no-cache",
+            "X-Catalog-Version": str(version)
+        }
+
+        if etag_matches(request.headers.get("if-none-match"), etag):
+            return Response(status_code=304, headers=headers)
+
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        return FileResponse(files[encoding], media_type="application/json", headers=headers)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error serving the catalog bundle: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to retrieve the catalog bundle")
+
+
+@router.post("/batch")
+async def route_get_resources_batch(body: ResourceBatchRequest):
+    """
+    Get up to RESOURCE_BATCH_MAX_ITEMS resources by id and/or org_name in one request.
+
+    Resources come back in the order they were asked for (ids first), and anything
+    not found is listed under "missing". `fields` works as in GET /resources/ but
+    defaults to "full". Removed resources count as missing unless "active" is false.
+
+    Example request body:
+        {"org_names": ["Acme Foundation", "Nashville Food Project"], "fields": "summary,services,phone"}
+    """
+    logger.info(f"Getting batch of {len(body.ids)} id(s) and {len(body.org_names)} org_name(s)")
+    try:
+        projection = parse_fields(body.fields)
+        collection = get_resources_collection()
+        result = await get_resources_batch(collection, body.ids, body.org_names, projection, active=body.active)
+
+        logger.info(f"Found {len(result['resources'])} resource(s) in batch")
+        return FastJSONResponse(result)
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving resource batch: {e}", exc_info=True)
+        raise HTTPException(status_code=500, detail="Failed to retrieve resources")
+
+
 @router.get("/{identifier}")
 async def route_get_resource(identifier: str, search_by: str = "id"):
     """
@@ -250,7 +384,7 @@ async def route_get_pending(current_admin: dict = Depends(get_current_admin)):
         pend_col = get_pending_collection()
         items = await get_resources(pend_col, active=False, check_removed=False)
         logger.info(f"Successfully retrieved {len(items.get('resources', []))} pending items.")
-        return items
+        return FastJSONResponse(items)
     except Exception as e:
         logger.error(f"Error retrieving pending items: {e}", exc_info=True)
         raise HTTPException(status_code=500, detail="Failed to retrieve pending items")
\ No newline at end of file
@@ -1,4 +1,4 @@
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 from enum import Enum
@@ -262,3 +262,14 @@ class PendingResource(ResourceBase):
     # metadata
     original_resource_id: str | None  = None
     submitted_at: datetime | None = None
+
+
+class ResourceBatchRequest(BaseModel):
+    """
+    Body of POST /resources/batch: resources to look up by id and/or org_name
+    """
+    ids: list[str] = Field(default_factory=list)
+    org_names: list[str] = Field(default_factory=list)
+    fields: str = "full"
+    # like GET /resources/, only resources that haven't been removed unless this is false
+    active: bool = True
@@ -83,3 +83,7 @@ class TestAdminProtectedRoutes:
     def test_delete_vendor_without_token(self, client):
         response = client.delete("/admin/vendors/T001")
         assert response.status_code in [401, 403]
+
+    def test_vendor_track_without_token(self, client):
+        response = client.get("/admin/vendors/T001/track")
+        assert response.status_code in [401, 403]
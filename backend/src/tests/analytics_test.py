@@ -0,0 +1,445 @@
+import asyncio
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pymongo.errors import BulkWriteError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import src.analytics.engagement as engagement
+import src.analytics.event_buffer as event_buffer_module
+import src.analytics.rollups as rollups
+from src.admin.middleware import get_current_admin
+from src.analytics.engagement import EngagementCounters, get_popular_resources
+from src.analytics.event_buffer import EventBuffer, EventBufferFull
+from src.routes.analytics import router as analytics_router
+
+NASHVILLE = (36.1627, -86.7816)
+MEMPHIS = (35.1495, -90.0490)
+
+
+class FakeCursor:
+    def __init__(self, rows):
+        self.rows = rows
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for row in self.rows:
+            yield row
+
+
+class FakeResources:
+    """The resources collection: answers _id lookups and knows its name for $lookup."""
+    name = "resources"
+
+    def __init__(self, ids=()):
+        self.ids = {str(resource_id) for resource_id in ids}
+        self.fail = False
+
+    def find(self, query, projection):
+        if self.fail:
+            raise ConnectionError("MongoDB is down")
+        return FakeCursor([{"_id": i} for i in query["_id"]["$in"] if str(i) in self.ids])
+
+
+class FakeEngagement:
+    """The resource_engagement collection: records writes and pipelines, and returns canned rows."""
+
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.bulk_writes = []
+        self.pipelines = []
+        self.fail = False
+
+    async def bulk_write(self, ops, ordered=True):
+        if self.fail:
+            raise ConnectionError("MongoDB is down")
+        self.bulk_writes.append(ops)
+
+    async def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return FakeCursor([dict(row, resource=dict(row["resource"])) for row in self.rows])
+
+
+def popular_row(org_name, score, latitude, longitude, category="Food"):
+    resource = {
+        "_id": ObjectId(),
+        "org_name": org_name,
+        "category": category,
+        "coordinates": {"latitude": latitude, "longitude": longitude}
+    }
+    return {"_id": str(resource["_id"]), "score": score, "views": score, "calls": 0, "directions": 0, "resource": resource}
+
+
+@pytest.fixture
+def collections(monkeypatch):
+    resources, counters = FakeResources(), FakeEngagement()
+    monkeypatch.setattr(engagement, "get_resources_collection", lambda: resources)
+    monkeypatch.setattr(engagement, "get_resource_engagement_collection", lambda: counters)
+    monkeypatch.setattr(engagement, "_popular", engagement.TTLCache(16, 60))
+    return resources, counters
+
+
+class FakeEvents:
+    """The analytics_events collection; fails the documents at `failing` indexes like an unordered insert_many."""
+
+    def __init__(self):
+        self.inserted = []
+        self.failing: list[int] = []
+        self.down = False
+
+    async def insert_many(self, documents, ordered=True):
+        if self.down:
+            raise ConnectionError("MongoDB is down")
+        self.inserted.extend(doc for i, doc in enumerate(documents) if i not in self.failing)
+        if self.failing:
+            raise BulkWriteError({
+                "writeErrors": [{"index": i, "code": 11000, "errmsg": "failed"} for i in self.failing],
+                "nInserted": len(documents) - len(self.failing)
+            })
+
+
+@pytest.fixture
+def events(monkeypatch):
+    fake = FakeEvents()
+    monkeypatch.setattr(event_buffer_module, "get_analytics_events_collection", lambda: fake)
+    return fake
+
+
+class TestEventBuffer:
+    def test_flush(self, events):
+        buffer = EventBuffer()
+        resource_id = str(ObjectId())
+        buffer.add([("device-1", "app_entered", None), ("device-1", "resource_viewed", resource_id)])
+
+        assert asyncio.run(buffer.flush()) == 2
+        assert len(buffer) == 0
+        assert "resource_id" not in events.inserted[0]
+        assert events.inserted[1]["resource_id"] == resource_id
+        assert asyncio.run(buffer.flush()) == 0
+
+    def test_partial_failure_requeues_only_failed_events(self, events):
+        buffer = EventBuffer()
+        buffer.add([(f"device-{i}", "app_entered", None) for i in range(4)])
+        events.failing = [1, 3]
+
+        with pytest.raises(BulkWriteError):
+            asyncio.run(buffer.flush())
+        assert len(buffer) == 2
+
+        events.failing = []
+        asyncio.run(buffer.flush())
+        assert sorted(event["device"] for event in events.inserted) == [f"device-{i}" for i in range(4)]
+
+    def test_failed_flush_requeues_batch_first(self, events):
+        buffer = EventBuffer()
+        buffer.add([("device-1", "app_entered", None)])
+        events.down = True
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(buffer.flush())
+        buffer.add([("device-2", "app_entered", None)])
+
+        events.down = False
+        asyncio.run(buffer.flush())
+        assert [event["device"] for event in events.inserted] == ["device-1", "device-2"]
+
+    def test_full_buffer_rejects_events(self, monkeypatch):
+        monkeypatch.setattr(event_buffer_module, "ANALYTICS_BUFFER_MAX_EVENTS", 2)
+        buffer = EventBuffer()
+        buffer.add([("device-1", "app_entered", None)])
+
+        with pytest.raises(EventBufferFull):
+            buffer.add([("device-2", "app_entered", None), ("device-3", "app_entered", None)])
+        assert len(buffer) == 1
+
+    def test_stop_drains_buffer(self, events):
+        buffer = EventBuffer()
+
+        async def main():
+            buffer.start()
+            buffer.add([("device-1", "app_entered", None)])
+            await buffer.stop()
+
+        asyncio.run(main())
+        assert len(events.inserted) == 1
+        assert len(buffer) == 0
+
+
+class TestEngagementCounters:
+    def test_flush_increments_known_resources(self, collections):
+        resources, counters = collections
+        known, unknown = str(ObjectId()), str(ObjectId())
+        resources.ids = {known}
+
+        buffer = EngagementCounters()
+        buffer.add(known, "resource_viewed")
+        buffer.add(known, "resource_called")
+        buffer.add(unknown, "resource_viewed")
+
+        assert asyncio.run(buffer.flush()) == 1
+        [op] = counters.bulk_writes[0]
+        assert op._filter["_id"].startswith(f"{known}:")
+        assert op._doc["$inc"] == {"counts.views": 1, "counts.calls": 1, "score": 4}
+        assert asyncio.run(buffer.flush()) == 0
+
+    def test_unknown_resources_are_not_written(self, collections):
+        _, counters = collections
+        buffer = EngagementCounters()
+        buffer.add(str(ObjectId()), "resource_viewed")
+
+        assert asyncio.run(buffer.flush()) == 0
+        assert counters.bulk_writes == []
+
+    def test_failed_flush_keeps_counts(self, collections):
+        resources, counters = collections
+        resource_id = str(ObjectId())
+        resources.ids = {resource_id}
+        buffer = EngagementCounters()
+        buffer.add(resource_id, "resource_viewed")
+
+        counters.fail = True
+        with pytest.raises(ConnectionError):
+            asyncio.run(buffer.flush())
+        buffer.add(resource_id, "resource_viewed")
+
+        resources.fail = True
+        with pytest.raises(ConnectionError):
+            asyncio.run(buffer.flush())
+
+        counters.fail = resources.fail = False
+        asyncio.run(buffer.flush())
+        assert counters.bulk_writes[0][0]._doc["$inc"]["counts.views"] == 2
+
+
+class TestPopularResources:
+    def test_category_is_filtered_before_the_limit(self, collections):
+        _, counters = collections
+        counters.rows = [popular_row("Legal Aid", 3, *NASHVILLE, category="Legal")]
+
+        popular = asyncio.run(get_popular_resources(5, category="Legal"))
+
+        assert [resource["org_name"] for resource in popular] == ["Legal Aid"]
+        assert popular[0]["engagement"]["score"] == 3
+        stages = [next(iter(stage)) for stage in counters.pipelines[0]]
+        assert stages.index("$lookup") < stages.index("$limit")
+        lookup = counters.pipelines[0][stages.index("$lookup")]["$lookup"]
+        assert {"$match": {"removed": False, "category": "Legal"}} in lookup["pipeline"]
+        assert counters.pipelines[0][-1] == {"$limit": 5}
+
+    def test_near_you_defaults_to_a_radius(self, collections):
+        _, counters = collections
+        counters.rows = [
+            popular_row("Far Away", 10, *MEMPHIS),
+            popular_row("Close By", 5, NASHVILLE[0] + 0.01, NASHVILLE[1]),
+        ]
+
+        popular = asyncio.run(get_popular_resources(5, latitude=NASHVILLE[0], longitude=NASHVILLE[1]))
+
+        assert [resource["org_name"] for resource in popular] == ["Close By"]
+        assert 1.0 < popular[0]["distance_km"] < 1.2
+        lookup = counters.pipelines[0][1]["$lookup"]
+        assert "coordinates.latitude" in lookup["pipeline"][1]["$match"]
+
+    def test_results_are_cached(self, collections):
+        _, counters = collections
+        counters.rows = [popular_row("Second Harvest", 3, *NASHVILLE)]
+
+        asyncio.run(get_popular_resources(5))
+        asyncio.run(get_popular_resources(5))
+        asyncio.run(get_popular_resources(5, category="Food"))
+
+        assert len(counters.pipelines) == 2
+
+
+class TestPopularEndpoint:
+    @pytest.fixture
+    def client(self, collections):
+        app = FastAPI()
+        app.include_router(analytics_router)
+        return TestClient(app)
+
+    def test_popular(self, client, collections):
+        _, counters = collections
+        counters.rows = [popular_row("Second Harvest", 7, *NASHVILLE)]
+
+        response = client.get("/api/analytics/popular?lat=36.16&lng=-86.78&radius_km=5&limit=3")
+
+        assert response.status_code == 200
+        [resource] = response.json()["resources"]
+        assert resource["org_name"] == "Second Harvest"
+        assert resource["engagement"] == {"score": 7, "views": 7, "calls": 0, "directions": 0}
+        assert "distance_km" in resource
+
+    def test_lat_and_lng_go_together(self, client):
+        assert client.get("/api/analytics/popular?lat=36.16").status_code == 400
+        assert client.get("/api/analytics/popular?radius_km=5").status_code == 400
+
+
+class FakeRawEvents:
+    """The analytics_events collection, running the rollup's $match/$group in Python."""
+
+    def __init__(self, events):
+        self.events = events
+
+    async def find_one(self, query, projection, sort):
+        return min(self.events, key=lambda event: event["ts"], default=None)
+
+    async def aggregate(self, pipeline):
+        window = pipeline[0]["$match"]["ts"]
+        groups = {}
+        for event in self.events:
+            if window["$gte"] <= event["ts"] < window["$lt"]:
+                hour = event["ts"].replace(minute=0, second=0, microsecond=0)
+                key = (event["event"], hour, event["device"])
+                groups[key] = groups.get(key, 0) + 1
+        return FakeCursor([
+            {"_id": {"event": event, "hour": hour, "device": device}, "count": count}
+            for (event, hour, device), count in groups.items()
+        ])
+
+
+class FakeRollups:
+    """The analytics_rollups collection, keyed by _id, applying $set upserts."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def find_one(self, query):
+        return self.docs.get(query["_id"])
+
+    async def update_one(self, query, update, upsert=False):
+        self.docs.setdefault(query["_id"], {"_id": query["_id"]}).update(update["$set"])
+
+    async def bulk_write(self, ops, ordered=True):
+        for op in ops:
+            await self.update_one(op._filter, op._doc, upsert=True)
+
+    def find(self, query):
+        # MongoDB compares dates as UTC instants whether or not they carry a timezone
+        bucket = {op: value.replace(tzinfo=timezone.utc) for op, value in query["bucket"].items()}
+        rows = [
+            doc for doc in self.docs.values()
+            if doc.get("granularity") == query["granularity"]
+            and doc["bucket"] >= bucket["$gte"]
+            and (doc["bucket"] < bucket["$lt"] if "$lt" in bucket else doc["bucket"] <= bucket["$lte"])
+        ]
+        cursor = FakeCursor(rows)
+        cursor.sort = lambda field, direction: FakeCursor(sorted(rows, key=lambda doc: doc[field]))
+        return cursor
+
+
+@pytest.fixture
+def analytics_db(monkeypatch):
+    start = (datetime.now(timezone.utc) - timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
+    events = FakeRawEvents([
+        {"ts": start + timedelta(minutes=5), "event": "app_entered", "device": "device-1"},
+        {"ts": start + timedelta(minutes=20), "event": "app_entered", "device": "device-1"},
+        {"ts": start + timedelta(minutes=30), "event": "app_entered", "device": "device-2"},
+        {"ts": start + timedelta(hours=1, minutes=5), "event": "app_entered", "device": "device-3"},
+        {"ts": start + timedelta(minutes=40), "event": "resource_viewed", "device": "device-2"},
+    ])
+    store = FakeRollups()
+
+    async def lease(name, ttl_seconds):
+        return True
+
+    monkeypatch.setattr(rollups, "get_analytics_events_collection", lambda: events)
+    monkeypatch.setattr(rollups, "get_analytics_rollups_collection", lambda: store)
+    monkeypatch.setattr(rollups, "acquire_lease", lease)
+    return start, events, store
+
+
+def rollup_counts(store):
+    return {
+        doc_id: (doc["count"], doc["unique_devices"])
+        for doc_id, doc in store.docs.items() if doc_id != "watermark"
+    }
+
+
+class TestRollups:
+    def test_rollup(self, analytics_db):
+        start, _, store = analytics_db
+        asyncio.run(rollups.run_rollup())
+
+        counts = rollup_counts(store)
+        assert counts[rollups._rollup_id("hour", start, "app_entered")] == (3, 2)
+        assert counts[rollups._rollup_id("hour", start + timedelta(hours=1), "app_entered")] == (1, 1)
+        assert counts[rollups._rollup_id("day", start.replace(hour=0), "app_entered")] == (4, 3)
+        assert counts[rollups._rollup_id("day", start.replace(hour=0), "resource_viewed")] == (1, 1)
+
+    def test_rerunning_a_bucket_does_not_double_count(self, analytics_db):
+        start, events, store = analytics_db
+        asyncio.run(rollups.run_rollup())
+        first = rollup_counts(store)
+
+        # the next run starts over from the hour the last one stopped in...
+        asyncio.run(rollups.run_rollup())
+        assert rollup_counts(store) == first
+
+        # ...and a run repeated after losing the watermark (a crash) rebuilds the same buckets
+        del store.docs["watermark"]
+        asyncio.run(rollups.run_rollup())
+        assert rollup_counts(store) == first
+
+    def test_late_event_is_counted_when_its_hour_is_rebuilt(self, analytics_db):
+        start, events, store = analytics_db
+        asyncio.run(rollups.run_rollup())
+
+        events.events.append({"ts": start + timedelta(minutes=50), "event": "app_entered", "device": "device-4"})
+        store.docs["watermark"]["ts"] = start
+        asyncio.run(rollups.run_rollup())
+
+        counts = rollup_counts(store)
+        assert counts[rollups._rollup_id("hour", start, "app_entered")] == (4, 3)
+        assert counts[rollups._rollup_id("day", start.replace(hour=0), "app_entered")] == (5, 4)
+
+
+class TestSummaryEndpoint:
+    @pytest.fixture
+    def client(self, analytics_db):
+        app = FastAPI()
+        app.include_router(analytics_router)
+        app.dependency_overrides[get_current_admin] = lambda: {"email": "test@thecontributor.org", "role": "admin"}
+        asyncio.run(rollups.run_rollup())
+        return TestClient(app)
+
+    def test_summary(self, client, analytics_db):
+        start, _, _ = analytics_db
+        day = start.date().isoformat()
+
+        response = client.get(f"/api/analytics/summary?from={day}&to={day}")
+
+        assert response.status_code == 200
+        assert response.json() == {
+            "from": day,
+            "to": day,
+            "days": [{
+                "date": day,
+                "events": {
+                    "app_entered": {"count": 4, "unique_devices": 3},
+                    "resource_viewed": {"count": 1, "unique_devices": 1}
+                }
+            }],
+            "totals": {
+                "app_entered": {"count": 4, "unique_devices": 3},
+                "resource_viewed": {"count": 1, "unique_devices": 1}
+            }
+        }
+
+    def test_empty_range(self, client, analytics_db):
+        start, _, _ = analytics_db
+        day = (start + timedelta(days=5)).date().isoformat()
+
+        response = client.get(f"/api/analytics/summary?from={day}&to={day}")
+        assert response.json()["days"] == [] and response.json()["totals"] == {}
+
+    def test_invalid_range(self, client):
+        assert client.get("/api/analytics/summary?from=2025-11-30&to=2025-11-01").status_code == 400
+        assert client.get("/api/analytics/summary?from=2023-01-01&to=2025-01-01").status_code == 400
@@ -0,0 +1,110 @@
+import asyncio
+import sys
+import os
+
+import httpx
+import pytest
+from bson import ObjectId
+from fastapi import FastAPI
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import src.routes.announcement_routes as announcement_routes
+from src.admin.middleware import get_current_admin
+
+
+class FakeAnnouncements:
+    """The announcements collection; reads wait on `release` once they have taken their snapshot."""
+
+    def __init__(self):
+        self.docs = []
+        self.release: asyncio.Event | None = None
+
+    def find(self):
+        return self
+
+    def sort(self, field, direction):
+        return self._iterate()
+
+    async def _iterate(self):
+        snapshot = [dict(doc) for doc in self.docs]
+        if self.release is not None:
+            await self.release.wait()
+        for doc in snapshot:
+            yield doc
+
+    async def insert_one(self, doc):
+        doc["_id"] = ObjectId()
+        self.docs.append(doc)
+
+        class Result:
+            inserted_id = doc["_id"]
+        return Result()
+
+    async def delete_one(self, query):
+        before = len(self.docs)
+        self.docs = [doc for doc in self.docs if doc["_id"] != query["_id"]]
+
+        class Result:
+            deleted_count = before - len(self.docs)
+        return Result()
+
+
+@pytest.fixture
+def announcements(monkeypatch):
+    fake = FakeAnnouncements()
+    monkeypatch.setattr(announcement_routes, "get_announcements_collection", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def app():
+    app = FastAPI()
+    app.include_router(announcement_routes.router)
+    app.dependency_overrides[get_current_admin] = lambda: {"name": "Test Admin", "role": "admin"}
+    return app
+
+
+def contents(response):
+    return [announcement["content"] for announcement in response.json()["announcements"]]
+
+
+class TestGetAll:
+    def test_read_after_a_write_sees_it(self, announcements, app):
+        async def main():
+            announcements.release = asyncio.Event()
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                # a read that started before the write and is still waiting on MongoDB
+                earlier = asyncio.create_task(client.get("/announcements/getAll"))
+                await asyncio.sleep(0.01)
+
+                created = await client.post("/announcements/create", json={"content": "Shelter opens at 6"})
+                assert created.status_code == 201
+
+                later = asyncio.create_task(client.get("/announcements/getAll"))
+                await asyncio.sleep(0.01)
+                announcements.release.set()
+                return await earlier, await later
+
+        earlier, later = asyncio.run(main())
+        assert contents(earlier) == []
+        assert contents(later) == ["Shelter opens at 6"]
+
+    def test_read_after_a_delete_does_not_see_it(self, announcements, app):
+        async def main():
+            async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+                created = await client.post("/announcements/create", json={"content": "Shelter opens at 6"})
+
+                announcements.release = asyncio.Event()
+                earlier = asyncio.create_task(client.get("/announcements/getAll"))
+                await asyncio.sleep(0.01)
+
+                await client.delete(f"/announcements/{created.json()['id']}")
+
+                later = asyncio.create_task(client.get("/announcements/getAll"))
+                await asyncio.sleep(0.01)
+                announcements.release.set()
+                return await earlier, await later
+
+        earlier, later = asyncio.run(main())
+        assert contents(earlier) == ["Shelter opens at 6"]
+        assert contents(later) == []
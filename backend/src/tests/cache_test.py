@@ -0,0 +1,208 @@
+import asyncio
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.controllers.resource_cache import ResourceCache
+from src.utils.cache import TTLCache
+from src.utils.coalesce import coalesce, coalesced_requests, note_write
+from src.utils.singleflight import SingleFlight
+
+
+class TestTTLCache:
+    def test_get_set(self):
+        cache = TTLCache(max_entries=10, ttl=60)
+        assert cache.get("a") is None
+        cache.set("a", 1)
+        assert cache.get("a") == 1
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_expiry(self):
+        cache = TTLCache(max_entries=10, ttl=0)
+        cache.set("a", 1)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self):
+        cache = TTLCache(max_entries=2, ttl=60)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_share_result(self):
+        flight = SingleFlight()
+        calls = 0
+
+        async def work():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        async def main():
+            return await asyncio.gather(*(flight.do("key", work) for _ in range(5)))
+
+        assert asyncio.run(main()) == [1] * 5
+        assert calls == 1
+        assert flight.coalesced == 4
+        assert not flight.in_flight("key")
+
+    def test_exception_is_shared(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        async def main():
+            return await asyncio.gather(*(flight.do("key", work) for _ in range(3)), return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in asyncio.run(main()))
+
+    def test_followers_take_over_when_leader_is_cancelled(self):
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.01)
+            return "done"
+
+        async def main():
+            leader = asyncio.create_task(flight.do("key", work))
+            await asyncio.sleep(0)
+            follower = asyncio.create_task(flight.do("key", work))
+            await asyncio.sleep(0)
+            leader.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await leader
+            return await follower
+
+        assert asyncio.run(main()) == "done"
+
+
+class TestCoalesce:
+    def test_identical_requests_share_one_read(self):
+        calls = 0
+
+        async def load():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return {"items": [1, 2]}
+
+        async def main():
+            return await asyncio.gather(
+                *(coalesce("/test/coalesce", "key", load) for _ in range(4)),
+                coalesce("/test/coalesce", "other", load)
+            )
+
+        results = asyncio.run(main())
+        assert results == [{"items": [1, 2]}] * 5
+        assert calls == 2
+        assert coalesced_requests.values[("/test/coalesce",)] == 3
+
+    def test_sequential_requests_are_not_coalesced(self):
+        async def load():
+            return "fresh"
+
+        async def main():
+            return [await coalesce("/test/sequential", None, load) for _ in range(2)]
+
+        assert asyncio.run(main()) == ["fresh", "fresh"]
+        assert ("/test/sequential",) not in coalesced_requests.values
+
+    def test_read_after_a_write_does_not_join_an_earlier_read(self):
+        data = ["before"]
+
+        async def load():
+            snapshot = list(data)
+            await asyncio.sleep(0.01)
+            return snapshot
+
+        async def main():
+            earlier = asyncio.create_task(coalesce("/test/write", None, load))
+            await asyncio.sleep(0)
+            data.append("after")
+            note_write("/test/write")
+            later = await coalesce("/test/write", None, load)
+            return await earlier, later
+
+        earlier, later = asyncio.run(main())
+        assert earlier == ["before"]
+        assert later == ["before", "after"]
+        assert ("/test/write",) not in coalesced_requests.values
+
+
+class TestResourceCache:
+    def make_loader(self, resource):
+        calls = []
+
+        async def load():
+            calls.append(1)
+            return dict(resource) if resource else None
+
+        return load, calls
+
+    def test_lookups_by_id_and_org_name_share_an_entry(self):
+        cache = ResourceCache(max_entries=10, ttl=60)
+        load, calls = self.make_loader({"_id": "a1", "org_name": "Shelter"})
+
+        async def main():
+            first = await cache.get("id", "a1", load)
+            assert await cache.get("id", "a1", load) is first
+            assert await cache.get("org_name", "Shelter", load) is first
+
+        asyncio.run(main())
+        assert len(calls) == 1
+        assert (cache.hits, cache.misses) == (2, 1)
+        assert cache.size_bytes > 0
+
+    def test_invalidate(self):
+        cache = ResourceCache(max_entries=10, ttl=60)
+        load, calls = self.make_loader({"_id": "a1", "org_name": "Shelter"})
+
+        async def main():
+            await cache.get("org_name", "Shelter", load)
+            cache.invalidate(["a1"])
+            await cache.get("org_name", "Shelter", load)
+            await cache.get("id", "a1", load)
+            cache.invalidate(None)
+            await cache.get("id", "a1", load)
+
+        asyncio.run(main())
+        assert len(calls) == 3
+        assert len(cache) == 1
+
+    def test_renamed_resource_is_not_found_under_old_name(self):
+        cache = ResourceCache(max_entries=10, ttl=60)
+        old_load, _ = self.make_loader({"_id": "a1", "org_name": "Shelter"})
+        new_load, _ = self.make_loader({"_id": "a1", "org_name": "Night Shelter"})
+        missing_load, missing_calls = self.make_loader(None)
+
+        async def main():
+            await cache.get("org_name", "Shelter", old_load)
+            cache.invalidate(["a1"])
+            await cache.get("id", "a1", new_load)
+            return await cache.get("org_name", "Shelter", missing_load)
+
+        assert asyncio.run(main()) is None
+        assert len(missing_calls) == 1
+
+    def test_read_racing_a_write_is_not_cached(self):
+        cache = ResourceCache(max_entries=10, ttl=60)
+
+        async def load():
+            # the resource is updated while this read is in flight
+            cache.invalidate(["a1"])
+            return {"_id": "a1", "org_name": "Shelter"}
+
+        asyncio.run(cache.get("id", "a1", load))
+        assert len(cache) == 0
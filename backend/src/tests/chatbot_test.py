@@ -0,0 +1,61 @@
+import pytest
+import httpx
+import json
+from fastapi.testclient import TestClient
+from openai import AsyncOpenAI
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from main import app
+import src.chatbot.service as chatbot_service
+from src.chatbot import stub_server
+
+@pytest.fixture(scope="module")
+def client():
+    """Test client whose chatbot talks to the in-process stub model server"""
+    stub_server.STUB_FIRST_TOKEN_MS = 0
+    stub_server.STUB_TOKEN_MS = 0
+    chatbot_service._client = AsyncOpenAI(
+        api_key="stub",
+        base_url="http://stub/v1",
+        http_client=httpx.AsyncClient(transport=httpx.ASGITransport(app=stub_server.app))
+    )
+    with TestClient(app) as test_client:
+        yield test_client
+    chatbot_service._client = None
+
+
+class TestChatbot:
+    def test_chat(self, client):
+        response = client.post("/chatbot/", json={"message": "where can I get food"})
+        assert response.status_code == 200
+        assert "where can I get food" in response.json()["reply"]
+
+    def test_chat_missing_message(self, client):
+        response = client.post("/chatbot/", json={})
+        assert response.status_code == 422
+
+    def test_stream(self, client):
+        with client.stream("POST", "/chatbot/stream", json={"message": "shelter tonight"}) as response:
+            assert response.status_code == 200
+            assert response.headers["content-type"].startswith("text/event-stream")
+            body = response.read().decode()
+
+        messages = [m for m in body.split("\n\n") if m]
+        tokens = [json.loads(m[len("data: "):])["token"] for m in messages if m.startswith("data: ")]
+        assert "".join(tokens).endswith("shelter tonight")
+        assert messages[-1].startswith("event: done")
+
+    def test_repeated_question_is_cached(self, client):
+        first = client.post("/chatbot/", json={"message": "Shelter tonight?"}).json()
+        hits = client.get("/chatbot/metrics").json()["cache"]["hits"]
+        second = client.post("/chatbot/", json={"message": "shelter   TONIGHT"}).json()
+        assert second == first
+        assert client.get("/chatbot/metrics").json()["cache"]["hits"] == hits + 1
+
+    def test_metrics(self, client):
+        client.post("/chatbot/stream", json={"message": "hello"})
+        metrics = client.get("/chatbot/metrics").json()
+        assert metrics["time_to_first_token"]["count"] >= 1
+        assert metrics["total_latency"]["count"] >= 1
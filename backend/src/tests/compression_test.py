@@ -0,0 +1,112 @@
+import sys
+import os
+import gzip
+
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.middleware.compression import CompressionMiddleware
+from src.utils.cache import TTLCache
+from src.utils.compression import accepts_identity, compress, negotiate
+
+
+class TestNegotiate:
+    def test_prefers_first_available_on_ties(self):
+        assert negotiate("gzip, br", ("br", "gzip")) == "br"
+        assert negotiate("gzip, br", ("gzip",)) == "gzip"
+
+    def test_weights(self):
+        assert negotiate("br;q=0.5, gzip;q=0.9", ("br", "gzip")) == "gzip"
+
+    def test_refused(self):
+        assert negotiate("gzip;q=0", ("gzip",)) is None
+        assert negotiate("identity", ("br", "gzip")) is None
+        assert negotiate(None) is None
+
+    def test_accepts_identity(self):
+        assert accepts_identity(None)
+        assert accepts_identity("gzip;q=0")
+        assert accepts_identity("*;q=0, identity")
+        assert not accepts_identity("identity;q=0")
+        assert not accepts_identity("gzip, *;q=0")
+
+    def test_wildcard(self):
+        assert negotiate("*", ("gzip",)) == "gzip"
+        assert negotiate("*, gzip;q=0", ("br", "gzip")) == "br"
+
+
+class TestCompress:
+    def test_gzip_round_trip(self):
+        data = b'{"resources": []}' * 100
+        assert gzip.decompress(compress(data, "gzip")) == data
+
+    def test_gzip_is_deterministic(self):
+        data = b"catalog" * 100
+        assert compress(data, "gzip", 9) == compress(data, "gzip", 9)
+
+
+def _app(cache):
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100, cache=cache)
+
+    @app.get("/big")
+    def big():
+        return {"resources": ["Nashville Food Project"] * 50}
+
+    @app.get("/small")
+    def small():
+        return {"ok": True}
+
+    @app.get("/tagged")
+    def tagged():
+        return PlainTextResponse("catalog " * 100, headers={"ETag": '"v1"'})
+
+    @app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([b"data: x" * 100, b"data: y" * 100]), media_type="text/event-stream")
+
+    return app
+
+
+class TestCompressionMiddleware:
+    def test_compresses_large_bodies(self):
+        client = TestClient(_app(TTLCache(8, 60)))
+        response = client.get("/big", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "Accept-Encoding" in response.headers["vary"]
+        assert response.json()["resources"][0] == "Nashville Food Project"
+
+    def test_skips_small_bodies_and_unsupported_clients(self):
+        client = TestClient(_app(TTLCache(8, 60)))
+
+        assert "content-encoding" not in client.get("/small", headers={"Accept-Encoding": "gzip"}).headers
+        assert "content-encoding" not in client.get("/big", headers={"Accept-Encoding": "identity"}).headers
+
+    def test_uncompressed_responses_vary(self):
+        client = TestClient(_app(TTLCache(8, 60)))
+
+        for path, accept_encoding in (("/small", "gzip"), ("/big", "identity"), ("/big", "")):
+            response = client.get(path, headers={"Accept-Encoding": accept_encoding})
+            assert "content-encoding" not in response.headers
+            assert "Accept-Encoding" in response.headers["vary"]
+
+    def test_streams_pass_through(self):
+        client = TestClient(_app(TTLCache(8, 60)))
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text.startswith("data: x")
+
+    def test_caches_by_etag(self):
+        cache = TTLCache(8, 60)
+        client = TestClient(_app(cache))
+
+        first = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+        second = client.get("/tagged", headers={"Accept-Encoding": "gzip"})
+
+        assert first.headers["etag"] == 'W/"v1"'
+        assert second.text == first.text
+        assert (cache.misses, cache.hits) == (1, 1)
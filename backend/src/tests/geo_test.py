@@ -0,0 +1,36 @@
+import math
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.utils.geo import haversine_km, simplify_track
+
+
+class TestHaversine:
+    def test_same_point(self):
+        assert haversine_km(36.16, -86.78, 36.16, -86.78) == 0
+
+    def test_one_degree_of_latitude(self):
+        assert math.isclose(haversine_km(36.0, -86.0, 37.0, -86.0), 111.19, rel_tol=1e-3)
+
+
+class TestSimplifyTrack:
+    def test_short_track_is_kept(self):
+        points = [(36.0, -86.0), (36.1, -86.1), (36.2, -86.2)]
+        assert simplify_track(points, max_points=5) == [0, 1, 2]
+
+    def test_respects_budget_and_keeps_endpoints(self):
+        points = [(36.0 + i * 0.001, -86.0 + math.sin(i / 5) * 0.01) for i in range(1000)]
+        keep = simplify_track(points, max_points=50)
+        assert len(keep) == 50
+        assert keep[0] == 0 and keep[-1] == 999
+        assert keep == sorted(keep)
+
+    def test_keeps_corner(self):
+        # an L-shaped walk: the corner is the most important point
+        points = [(36.0 + i * 0.001, -86.0) for i in range(10)] + [(36.009, -86.0 + i * 0.001) for i in range(1, 10)]
+        assert simplify_track(points, max_points=3) == [0, 9, 18]
+
+    def test_straight_line_collapses_to_endpoints(self):
+        points = [(36.0 + i * 0.001, -86.0) for i in range(100)]
+        assert simplify_track(points, max_points=10) == [0, 99]
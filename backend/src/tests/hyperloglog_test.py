@@ -0,0 +1,46 @@
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.analytics.hyperloglog import HyperLogLog
+
+
+class TestHyperLogLog:
+    def test_empty(self):
+        assert HyperLogLog().count() == 0
+
+    def test_duplicates_counted_once(self):
+        sketch = HyperLogLog()
+        for _ in range(100):
+            sketch.add("device-1")
+        assert sketch.count() == 1
+
+    @pytest.mark.parametrize("n", [100, 10_000, 100_000])
+    def test_estimate_within_error(self, n):
+        sketch = HyperLogLog()
+        for i in range(n):
+            sketch.add(f"device-{i}")
+        assert abs(sketch.count() - n) / n < 0.05
+
+    def test_merge_is_union(self):
+        a, b = HyperLogLog(), HyperLogLog()
+        for i in range(5000):
+            a.add(f"device-{i}")
+        for i in range(2500, 7500):
+            b.add(f"device-{i}")
+        a.merge(b)
+        assert abs(a.count() - 7500) / 7500 < 0.05
+
+    def test_round_trip_bytes(self):
+        sketch = HyperLogLog()
+        for i in range(1000):
+            sketch.add(f"device-{i}")
+        restored = HyperLogLog.from_bytes(sketch.to_bytes())
+        assert restored.precision == sketch.precision
+        assert restored.count() == sketch.count()
+
+    def test_merge_rejects_different_precision(self):
+        with pytest.raises(ValueError):
+            HyperLogLog(precision=10).merge(HyperLogLog(precision=12))
@@ -0,0 +1,36 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.utils.lazy import LazyModule, LazyObject
+
+
+class TestLazyObject:
+    def test_built_on_first_use(self):
+        calls = []
+
+        def factory():
+            calls.append(1)
+            return {"value": 1}
+
+        lazy = LazyObject(factory)
+        assert calls == []
+        assert lazy.get("value") == 1
+        assert lazy.get("value") == 1
+        assert calls == [1]
+
+
+class TestLazyModule:
+    def test_imported_on_attribute_access(self):
+        sys.modules.pop("colorsys", None)
+        colorsys = LazyModule("colorsys")
+        assert "colorsys" not in sys.modules
+        assert colorsys.rgb_to_hsv(1, 0, 0) == (0, 1, 1)
+        assert "colorsys" in sys.modules
+
+    def test_usable_in_except_clause(self):
+        json_module = LazyModule("json")
+        try:
+            raise json_module.JSONDecodeError("bad", "", 0)
+        except json_module.JSONDecodeError:
+            pass
@@ -0,0 +1,95 @@
+import asyncio
+import sys
+import os
+
+import httpx
+import openai
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import src.chatbot.limiter as limiter
+from src.chatbot.limiter import LLMLimiter, LLMOverloaded
+
+
+def _rate_limit_error(retry_after: str | None = None) -> openai.RateLimitError:
+    headers = {"retry-after": retry_after} if retry_after else {}
+    response = httpx.Response(429, headers=headers, request=httpx.Request("POST", "http://stub/v1/chat/completions"))
+    return openai.RateLimitError("rate limited", response=response, body=None)
+
+
+class TestLLMLimiter:
+    def test_limits_concurrency(self):
+        llm = LLMLimiter(max_concurrent=2, max_queue=10, queue_timeout=5)
+        peak = 0
+
+        async def call():
+            nonlocal peak
+            async with llm.slot():
+                peak = max(peak, llm.active)
+                await asyncio.sleep(0.01)
+
+        async def main():
+            await asyncio.gather(*(call() for _ in range(6)))
+
+        asyncio.run(main())
+        assert peak == 2
+        assert llm.wait_time.count == 6
+
+    def test_rejects_when_queue_full(self):
+        llm = LLMLimiter(max_concurrent=1, max_queue=1, queue_timeout=5)
+
+        async def call():
+            async with llm.slot():
+                await asyncio.sleep(0.05)
+
+        async def main():
+            return await asyncio.gather(*(call() for _ in range(3)), return_exceptions=True)
+
+        results = asyncio.run(main())
+        rejected = [r for r in results if isinstance(r, LLMOverloaded)]
+        assert len(rejected) == 1
+        assert rejected[0].retry_after >= 1
+        assert llm.rejected == 1
+
+    def test_queue_timeout(self):
+        llm = LLMLimiter(max_concurrent=1, max_queue=10, queue_timeout=0.01)
+
+        async def call():
+            async with llm.slot():
+                await asyncio.sleep(0.1)
+
+        async def main():
+            return await asyncio.gather(call(), call(), return_exceptions=True)
+
+        results = asyncio.run(main())
+        assert isinstance(results[1], LLMOverloaded)
+        assert llm.timed_out == 1
+        assert llm.queued == 0
+
+    def test_retries_rate_limits(self, monkeypatch):
+        monkeypatch.setattr(limiter, "LLM_RETRY_BASE_SECONDS", 0.001)
+        llm = LLMLimiter(max_concurrent=1, max_queue=1, queue_timeout=1)
+        attempts = 0
+
+        async def flaky():
+            nonlocal attempts
+            attempts += 1
+            if attempts < 3:
+                raise _rate_limit_error()
+            return "ok"
+
+        assert asyncio.run(llm.call(flaky)) == "ok"
+        assert llm.retries == 2
+
+    def test_gives_up_with_overloaded(self, monkeypatch):
+        monkeypatch.setattr(limiter, "LLM_RETRY_BASE_SECONDS", 0.001)
+        monkeypatch.setattr(limiter, "LLM_RETRY_MAX_SECONDS", 0.001)
+        llm = LLMLimiter(max_concurrent=1, max_queue=1, queue_timeout=1)
+
+        async def limited():
+            raise _rate_limit_error(retry_after="7")
+
+        with pytest.raises(LLMOverloaded) as excinfo:
+            asyncio.run(llm.call(limited))
+        assert excinfo.value.retry_after == 7
+        assert llm.retries == limiter.LLM_MAX_RETRIES
@@ -0,0 +1,206 @@
+import asyncio
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import src.vendor.location_buffer as location_buffer_module
+import src.vendor.spatial_index as spatial_index
+from src.vendor.location_buffer import LocationBuffer
+
+
+class FakeVendors:
+    """Stands in for the vendor_users collection, recording writes and failing on demand."""
+
+    def __init__(self, fail: bool = False, active: list[dict] | None = None):
+        self.fail = fail
+        self.active = active or []
+        self.bulk_writes = []
+        self.updates = []
+        # called while a find is "waiting on MongoDB"
+        self.during_find = None
+
+    async def bulk_write(self, ops, ordered=True):
+        await asyncio.sleep(0)
+        if self.fail:
+            raise ConnectionError("MongoDB is down")
+        self.bulk_writes.append(ops)
+
+    async def update_one(self, query, update):
+        await asyncio.sleep(0)
+        if self.fail:
+            raise ConnectionError("MongoDB is down")
+        self.updates.append((query, update))
+
+    def find(self, query, projection):
+        return self
+
+    async def to_list(self, length=None):
+        if self.during_find:
+            self.during_find()
+        return [dict(vendor, location=dict(vendor["location"])) for vendor in self.active]
+
+
+@pytest.fixture
+def vendors(monkeypatch):
+    fake = FakeVendors()
+    monkeypatch.setattr(location_buffer_module, "get_vendor_users_collection", lambda: fake)
+    monkeypatch.setattr(spatial_index, "get_vendor_users_collection", lambda: fake)
+    return fake
+
+
+class TestLocationBuffer:
+    def test_keeps_latest_location_per_vendor(self):
+        buffer = LocationBuffer()
+        buffer.put("supa-1", "0001", 36.1, -86.7)
+        buffer.put("supa-1", "0001", 36.2, -86.8)
+
+        assert len(buffer) == 1
+        assert buffer.get("supa-1") == {"latitude": 36.2, "longitude": -86.8}
+        assert buffer.get("supa-2") is None
+        assert buffer.locations_by_vendor_id() == {"0001": {"latitude": 36.2, "longitude": -86.8}}
+
+    def test_apply(self):
+        buffer = LocationBuffer()
+        buffer.put("supa-1", "0001", 36.2, -86.8)
+
+        vendor = buffer.apply({"supabase_id": "supa-1", "location": {"latitude": 0, "longitude": 0}})
+        assert vendor["location"] == {"latitude": 36.2, "longitude": -86.8}
+
+        other = {"supabase_id": "supa-2", "location": {"latitude": 0, "longitude": 0}}
+        assert buffer.apply(other)["location"] == {"latitude": 0, "longitude": 0}
+
+    def test_flush_writes_one_update_per_vendor(self, vendors):
+        buffer = LocationBuffer()
+        buffer.put("supa-1", "0001", 36.1, -86.7)
+        buffer.put("supa-1", "0001", 36.2, -86.8)
+        buffer.put("supa-2", "0002", 36.3, -86.9)
+
+        assert asyncio.run(buffer.flush()) == 2
+        assert len(vendors.bulk_writes) == 1 and len(vendors.bulk_writes[0]) == 2
+        assert len(buffer) == 0
+        assert asyncio.run(buffer.flush()) == 0
+
+    def test_failed_flush_keeps_locations(self, vendors):
+        buffer = LocationBuffer()
+        buffer.put("supa-1", "0001", 36.1, -86.7)
+        buffer.put("supa-2", "0002", 36.3, -86.9)
+        vendors.fail = True
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(buffer.flush())
+        assert len(buffer) == 2
+
+        vendors.fail = False
+        assert asyncio.run(buffer.flush()) == 2
+
+    def test_failed_flush_does_not_overwrite_newer_ping(self, vendors):
+        buffer = LocationBuffer()
+        buffer.put("supa-1", "0001", 36.1, -86.7)
+
+        async def flush_while_pinging():
+            vendors.fail = True
+            flush = asyncio.create_task(buffer.flush())
+            # the flush has taken the batch and is waiting on MongoDB
+            await asyncio.sleep(0)
+            assert len(buffer) == 0
+            buffer.put("supa-1", "0001", 36.5, -86.5)
+            with pytest.raises(ConnectionError):
+                await flush
+
+        asyncio.run(flush_while_pinging())
+        assert buffer.get("supa-1") == {"latitude": 36.5, "longitude": -86.5}
+
+    def test_flush_vendor(self, vendors):
+        buffer = LocationBuffer()
+        buffer.put("supa-1", "0001", 36.1, -86.7)
+        buffer.put("supa-2", "0002", 36.3, -86.9)
+
+        asyncio.run(buffer.flush_vendor("supa-1"))
+        asyncio.run(buffer.flush_vendor("supa-3"))
+
+        assert len(vendors.updates) == 1
+        query, update = vendors.updates[0]
+        assert query["supabase_id"] == "supa-1"
+        assert update["$set"]["location"] == {"latitude": 36.1, "longitude": -86.7}
+        assert buffer.get("supa-1") is None
+        assert buffer.get("supa-2") is not None
+
+    def test_failed_flush_vendor_keeps_location(self, vendors):
+        buffer = LocationBuffer()
+        buffer.put("supa-1", "0001", 36.1, -86.7)
+        vendors.fail = True
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(buffer.flush_vendor("supa-1"))
+        assert buffer.get("supa-1") == {"latitude": 36.1, "longitude": -86.7}
+
+    def test_full_buffer_triggers_flush(self, monkeypatch):
+        monkeypatch.setattr(location_buffer_module, "LOCATION_BUFFER_MAX_PENDING", 2)
+        buffer = LocationBuffer()
+        triggered = []
+        monkeypatch.setattr(buffer._task, "trigger", lambda: triggered.append(1))
+
+        buffer.put("supa-1", "0001", 36.1, -86.7)
+        assert not triggered
+        buffer.put("supa-2", "0002", 36.3, -86.9)
+        assert triggered
+
+    def test_stop_saves_what_is_buffered(self, vendors):
+        buffer = LocationBuffer()
+
+        async def main():
+            buffer.start()
+            buffer.put("supa-1", "0001", 36.1, -86.7)
+            await buffer.stop()
+
+        asyncio.run(main())
+        assert len(vendors.bulk_writes) == 1
+        assert len(buffer) == 0
+
+
+class TestIndexRefresh:
+    def test_buffered_locations_override_mongodb(self, vendors, monkeypatch):
+        buffer = LocationBuffer()
+        monkeypatch.setattr(spatial_index, "location_buffer", buffer)
+        vendors.active = [
+            {"vendor_id": "0001", "name": "Vendor One", "location": {"latitude": 36.1, "longitude": -86.7}},
+            {"vendor_id": "0002", "name": "Vendor Two", "location": {"latitude": 36.3, "longitude": -86.9}},
+        ]
+        buffer.put("supa-1", "0001", 36.2, -86.8)
+
+        asyncio.run(spatial_index.refresh_active_vendor_index(force=True))
+
+        entries = {entry["vendor_id"]: entry for entry in spatial_index.active_vendor_index.entries()}
+        assert (entries["0001"]["latitude"], entries["0001"]["longitude"]) == (36.2, -86.8)
+        assert (entries["0002"]["latitude"], entries["0002"]["longitude"]) == (36.3, -86.9)
+        spatial_index.active_vendor_index.clear()
+
+    def test_changes_during_the_query_are_kept(self, vendors):
+        index = spatial_index.active_vendor_index
+        index.upsert("0001", 36.1, -86.7, name="Vendor One")
+        index.upsert("0002", 36.3, -86.9, name="Vendor Two")
+        # the query's results predate 0002 clocking out and 0003 clocking in
+        vendors.active = [
+            {"vendor_id": "0001", "name": "Vendor One", "location": {"latitude": 36.1, "longitude": -86.7}},
+            {"vendor_id": "0002", "name": "Vendor Two", "location": {"latitude": 36.3, "longitude": -86.9}},
+        ]
+
+        def clock_in_and_out():
+            index.remove("0002")
+            index.upsert("0003", 36.2, -86.8, name="Vendor Three")
+        vendors.during_find = clock_in_and_out
+
+        asyncio.run(spatial_index.refresh_active_vendor_index(force=True))
+
+        assert "0001" in index
+        assert "0002" not in index
+        assert "0003" in index
+        index.clear()
+
+        # the next refresh goes by MongoDB again
+        vendors.during_find = None
+        asyncio.run(spatial_index.refresh_active_vendor_index(force=True))
+        assert "0002" in index and "0003" not in index
+        index.clear()
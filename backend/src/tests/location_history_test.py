@@ -0,0 +1,146 @@
+import asyncio
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import src.vendor.location_history as location_history_module
+from src.vendor.location_history import LocationHistory
+
+NASHVILLE = (36.1627, -86.7816)
+START = datetime(2025, 11, 1, 12, 0, tzinfo=timezone.utc)
+
+# about 11 m and 111 m north of NASHVILLE
+NEARBY = (NASHVILLE[0] + 0.0001, NASHVILLE[1])
+FARTHER = (NASHVILLE[0] + 0.001, NASHVILLE[1])
+
+
+class FakeLocations:
+    """The vendor_locations collection; fails the points at `failing` indexes like an unordered insert_many."""
+
+    def __init__(self):
+        self.inserted = []
+        self.failing: list[int] = []
+        self.down = False
+
+    async def insert_many(self, documents, ordered=True):
+        if self.down:
+            raise ConnectionError("MongoDB is down")
+        self.inserted.extend(doc for i, doc in enumerate(documents) if i not in self.failing)
+        if self.failing:
+            raise BulkWriteError({
+                "writeErrors": [{"index": i, "code": 2, "errmsg": "failed"} for i in self.failing],
+                "nInserted": len(documents) - len(self.failing)
+            })
+
+
+@pytest.fixture
+def locations(monkeypatch):
+    fake = FakeLocations()
+    monkeypatch.setattr(location_history_module, "get_vendor_locations_collection", lambda: fake)
+    return fake
+
+
+def at(seconds: float) -> datetime:
+    return START + timedelta(seconds=seconds)
+
+
+class TestDownsampling:
+    @pytest.fixture(autouse=True)
+    def thresholds(self, monkeypatch):
+        monkeypatch.setattr(location_history_module, "LOCATION_HISTORY_MIN_SECONDS", 15)
+        monkeypatch.setattr(location_history_module, "LOCATION_HISTORY_MIN_METERS", 25)
+        monkeypatch.setattr(location_history_module, "LOCATION_HISTORY_HEARTBEAT_SECONDS", 300)
+
+    def test_first_ping_is_recorded(self):
+        assert LocationHistory().record("0001", *NASHVILLE, ts=at(0))
+
+    def test_pings_too_close_in_time_are_dropped(self):
+        history = LocationHistory()
+        history.record("0001", *NASHVILLE, ts=at(0))
+
+        assert not history.record("0001", *FARTHER, ts=at(14))
+        assert history.record("0001", *FARTHER, ts=at(15))
+
+    def test_small_moves_wait_for_the_heartbeat(self):
+        history = LocationHistory()
+        history.record("0001", *NASHVILLE, ts=at(0))
+
+        assert not history.record("0001", *NEARBY, ts=at(60))
+        assert not history.record("0001", *NEARBY, ts=at(299))
+        assert history.record("0001", *NEARBY, ts=at(300))
+
+    def test_moves_past_the_distance_threshold_are_recorded(self):
+        history = LocationHistory()
+        history.record("0001", *NASHVILLE, ts=at(0))
+
+        assert history.record("0001", *FARTHER, ts=at(20))
+
+    def test_thresholds_are_per_vendor(self):
+        history = LocationHistory()
+        history.record("0001", *NASHVILLE, ts=at(0))
+
+        assert history.record("0002", *NASHVILLE, ts=at(1))
+
+    def test_dropped_pings_do_not_move_the_reference_point(self):
+        history = LocationHistory()
+        history.record("0001", *NASHVILLE, ts=at(0))
+        history.record("0001", *NEARBY, ts=at(60))
+
+        # measured from the last recorded ping at t=0, not the dropped one at t=60
+        assert history.record("0001", *NEARBY, ts=at(300))
+
+
+class TestFlush:
+    def test_flush(self, locations):
+        history = LocationHistory()
+        history.record("0001", *NASHVILLE, ts=at(0))
+        history.record("0002", *NASHVILLE, ts=at(0))
+
+        assert asyncio.run(history.flush()) == 2
+        assert [point["vendor_id"] for point in locations.inserted] == ["0001", "0002"]
+        assert asyncio.run(history.flush()) == 0
+
+    def test_partial_failure_requeues_only_failed_points(self, locations):
+        history = LocationHistory()
+        for i in range(4):
+            history.record(f"000{i}", *NASHVILLE, ts=at(0))
+        locations.failing = [2]
+
+        with pytest.raises(BulkWriteError):
+            asyncio.run(history.flush())
+
+        locations.failing = []
+        assert asyncio.run(history.flush()) == 1
+        assert sorted(point["vendor_id"] for point in locations.inserted) == ["0000", "0001", "0002", "0003"]
+
+    def test_failed_flush_keeps_points(self, locations):
+        history = LocationHistory()
+        history.record("0001", *NASHVILLE, ts=at(0))
+        locations.down = True
+
+        with pytest.raises(ConnectionError):
+            asyncio.run(history.flush())
+        history.record("0002", *NASHVILLE, ts=at(1))
+
+        locations.down = False
+        asyncio.run(history.flush())
+        assert [point["vendor_id"] for point in locations.inserted] == ["0001", "0002"]
+
+    def test_pending_points_are_capped(self, locations, monkeypatch):
+        monkeypatch.setattr(location_history_module, "LOCATION_HISTORY_MAX_PENDING", 3)
+        history = LocationHistory()
+        locations.down = True
+
+        for i in range(5):
+            history.record(f"000{i}", *NASHVILLE, ts=at(i))
+            with pytest.raises(ConnectionError):
+                asyncio.run(history.flush())
+
+        assert history.dropped == 2
+        locations.down = False
+        asyncio.run(history.flush())
+        assert [point["vendor_id"] for point in locations.inserted] == ["0002", "0003", "0004"]
@@ -0,0 +1,177 @@
+import asyncio
+import sys
+import os
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import src.utils.locks as locks
+import src.vendor.sweeper as sweeper
+import src.controllers.resource_changes as resource_changes
+import src.analytics.rollups as rollups
+from src.utils.locks import acquire_lease, release_lease
+from src.vendor.spatial_index import active_vendor_index
+
+
+class FakeLocks:
+    """
+    The locks collection, with the semantics acquire_lease relies on: an
+    upsert whose filter doesn't match an existing _id tries to insert it and
+    hits the unique _id index.
+    """
+
+    def __init__(self):
+        self.docs = {}
+
+    def _matches(self, doc, query):
+        for condition in query["$or"]:
+            if "owner" in condition and doc["owner"] == condition["owner"]:
+                return True
+            if "expires_at" in condition and doc["expires_at"] <= condition["expires_at"]["$lte"]:
+                return True
+        return False
+
+    async def update_one(self, query, update, upsert=False):
+        doc = self.docs.get(query["_id"])
+        if doc is not None and not self._matches(doc, query):
+            raise DuplicateKeyError("E11000 duplicate key error")
+        self.docs[query["_id"]] = {"_id": query["_id"], **update["$set"]}
+
+    async def delete_one(self, query):
+        doc = self.docs.get(query["_id"])
+        if doc is not None and doc["owner"] == query["owner"]:
+            del self.docs[query["_id"]]
+
+
+@pytest.fixture
+def lock_store(monkeypatch):
+    store = FakeLocks()
+    monkeypatch.setattr(locks, "get_locks_collection", lambda: store)
+    return store
+
+
+def as_worker(monkeypatch, worker_id):
+    monkeypatch.setattr(locks, "WORKER_ID", worker_id)
+
+
+class TestLease:
+    def test_only_one_worker_holds_a_lease(self, lock_store, monkeypatch):
+        as_worker(monkeypatch, "worker-a")
+        assert asyncio.run(acquire_lease("job", ttl_seconds=60))
+
+        as_worker(monkeypatch, "worker-b")
+        assert not asyncio.run(acquire_lease("job", ttl_seconds=60))
+        assert asyncio.run(acquire_lease("other-job", ttl_seconds=60))
+        assert lock_store.docs["job"]["owner"] == "worker-a"
+
+    def test_holder_renews(self, lock_store, monkeypatch):
+        as_worker(monkeypatch, "worker-a")
+        asyncio.run(acquire_lease("job", ttl_seconds=60))
+        first_expiry = lock_store.docs["job"]["expires_at"]
+
+        assert asyncio.run(acquire_lease("job", ttl_seconds=120))
+        assert lock_store.docs["job"]["expires_at"] > first_expiry
+
+    def test_expired_lease_is_taken_over(self, lock_store, monkeypatch):
+        as_worker(monkeypatch, "worker-a")
+        asyncio.run(acquire_lease("job", ttl_seconds=60))
+        # worker-a stops renewing, e.g. because it crashed
+        lock_store.docs["job"]["expires_at"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+
+        as_worker(monkeypatch, "worker-b")
+        assert asyncio.run(acquire_lease("job", ttl_seconds=60))
+        assert lock_store.docs["job"]["owner"] == "worker-b"
+
+        as_worker(monkeypatch, "worker-a")
+        assert not asyncio.run(acquire_lease("job", ttl_seconds=60))
+
+    def test_release(self, lock_store, monkeypatch):
+        as_worker(monkeypatch, "worker-a")
+        asyncio.run(acquire_lease("job", ttl_seconds=60))
+
+        as_worker(monkeypatch, "worker-b")
+        asyncio.run(release_lease("job"))
+        assert not asyncio.run(acquire_lease("job", ttl_seconds=60))
+
+        as_worker(monkeypatch, "worker-a")
+        asyncio.run(release_lease("job"))
+        as_worker(monkeypatch, "worker-b")
+        assert asyncio.run(acquire_lease("job", ttl_seconds=60))
+
+
+class FakeVendors:
+    def __init__(self):
+        self.updates = []
+
+    async def update_many(self, query, update):
+        self.updates.append((query, update))
+
+        class Result:
+            modified_count = 1
+        return Result()
+
+
+class TestSweeper:
+    @pytest.fixture
+    def vendors(self, monkeypatch):
+        fake = FakeVendors()
+        monkeypatch.setattr(sweeper, "get_vendor_users_collection", lambda: fake)
+        yield fake
+        active_vendor_index.clear()
+
+    def test_sweeps_only_while_holding_the_lease(self, lock_store, vendors, monkeypatch):
+        as_worker(monkeypatch, "worker-a")
+        asyncio.run(sweeper.sweep_expired_sessions())
+        asyncio.run(sweeper.sweep_expired_sessions())
+        assert len(vendors.updates) == 2
+
+        as_worker(monkeypatch, "worker-b")
+        asyncio.run(sweeper.sweep_expired_sessions())
+        assert len(vendors.updates) == 2
+
+        # worker-b takes over once worker-a's lease runs out
+        lock_store.docs[sweeper._LEASE_NAME]["expires_at"] = datetime.now(timezone.utc) - timedelta(seconds=1)
+        asyncio.run(sweeper.sweep_expired_sessions())
+        assert len(vendors.updates) == 3
+
+        query, update = vendors.updates[-1]
+        assert query["is_clocked_in"] is True
+        assert update["$set"] == {"is_clocked_in": False}
+
+    def test_every_worker_prunes_its_index(self, lock_store, vendors, monkeypatch):
+        as_worker(monkeypatch, "worker-a")
+        asyncio.run(acquire_lease(sweeper._LEASE_NAME, ttl_seconds=60))
+
+        expired = datetime.now() - timedelta(hours=sweeper.AUTO_CLOCK_OUT_HOURS, minutes=1)
+        active_vendor_index.upsert("0001", 36.16, -86.78, name="Expired", clocked_in_at=expired)
+        active_vendor_index.upsert("0002", 36.17, -86.79, name="Recent", clocked_in_at=datetime.now())
+
+        as_worker(monkeypatch, "worker-b")
+        asyncio.run(sweeper.sweep_expired_sessions())
+
+        assert "0001" not in active_vendor_index
+        assert "0002" in active_vendor_index
+        assert vendors.updates == []
+
+
+class TestReleaseOnStop:
+    @pytest.mark.parametrize("module, task", [
+        (sweeper, "auto_clock_out_task"),
+        (resource_changes, "change_log_compaction_task"),
+        (rollups, "rollup_task"),
+    ])
+    def test_stopping_a_job_releases_its_lease(self, lock_store, monkeypatch, module, task):
+        as_worker(monkeypatch, "worker-a")
+        job = getattr(module, task)
+
+        async def run():
+            job.start()
+            await acquire_lease(module._LEASE_NAME, ttl_seconds=60)
+            await job.stop()
+        asyncio.run(run())
+
+        # another worker can take over straight away instead of waiting for the lease to expire
+        as_worker(monkeypatch, "worker-b")
+        assert asyncio.run(acquire_lease(module._LEASE_NAME, ttl_seconds=60))
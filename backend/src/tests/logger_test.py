@@ -0,0 +1,78 @@
+import json
+import logging
+import queue
+import sys
+import os
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.config.logger import ContextFilter, JsonFormatter, request_id_var, _parse_sample_rates, _QueueHandler
+from src.middleware.request_id import RequestIdMiddleware
+
+
+def _record(name: str, level: int = logging.INFO, msg: str = "hello") -> logging.LogRecord:
+    return logging.LogRecord(name, level, __file__, 1, msg, None, None)
+
+
+class TestContextFilter:
+    def test_parse_sample_rates(self):
+        assert _parse_sample_rates("a.b=0.1, c=0,bad,") == {"a.b": 0.1, "c": 0.0}
+
+    def test_sampling_applies_to_logger_and_children(self):
+        context = ContextFilter({"backend.src.routes": 0.0})
+        assert not context.filter(_record("backend.src.routes.resource_routes"))
+        assert context.filter(_record("backend.src.routesx"))
+        assert context.filter(_record("backend.src.chatbot"))
+
+    def test_warnings_are_never_sampled_out(self):
+        context = ContextFilter({"backend": 0.0})
+        assert context.filter(_record("backend.src.routes", logging.WARNING))
+
+    def test_request_id_is_attached(self):
+        token = request_id_var.set("abc123")
+        try:
+            record = _record("backend")
+            ContextFilter({}).filter(record)
+        finally:
+            request_id_var.reset(token)
+        entry = json.loads(JsonFormatter().format(record))
+        assert entry["request_id"] == "abc123"
+        assert entry["message"] == "hello"
+
+
+class TestQueueHandler:
+    def test_args_are_merged_before_enqueueing(self):
+        handler = _QueueHandler(queue.Queue())
+        fields = {"email": "old@example.com"}
+        handler.emit(logging.LogRecord("backend", logging.INFO, __file__, 1, "updating %s", (fields,), None))
+        fields["email"] = "new@example.com"
+
+        record = handler.queue.get_nowait()
+        assert record.getMessage() == "updating {'email': 'old@example.com'}"
+        assert record.args is None
+
+
+class TestRequestIdMiddleware:
+    def setup_method(self):
+        app = FastAPI()
+        app.add_middleware(RequestIdMiddleware)
+
+        @app.get("/")
+        def root():
+            return {"request_id": request_id_var.get()}
+
+        self.client = TestClient(app)
+
+    def test_generates_request_id(self):
+        response = self.client.get("/")
+        assert response.headers["x-request-id"] == response.json()["request_id"]
+
+    def test_keeps_incoming_request_id(self):
+        response = self.client.get("/", headers={"X-Request-ID": "upstream-1"})
+        assert response.json()["request_id"] == "upstream-1"
+
+    def test_rejects_malformed_request_id(self):
+        response = self.client.get("/", headers={"X-Request-ID": "bad id\n"})
+        assert response.json()["request_id"] != "bad id\n"
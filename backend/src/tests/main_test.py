@@ -0,0 +1,75 @@
+import asyncio
+import sys
+import os
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import main
+from main import app, lifespan
+
+JOBS = [
+    "auto_clock_out_task", "location_buffer", "location_history", "event_buffer",
+    "rollup_task", "engagement_counters", "change_log_compaction_task",
+]
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Swaps MongoDB and the background jobs for stand-ins that record what the lifespan did."""
+    calls = []
+
+    async def noop():
+        pass
+
+    async def close_db():
+        calls.append("close_db")
+
+    monkeypatch.setattr(main.MongoDB, "connect_db", noop)
+    monkeypatch.setattr(main.MongoDB, "close_db", close_db)
+    for setup in ("ensure_clock_in_index", "ensure_location_history_collection", "ensure_analytics_collections", "ensure_change_log"):
+        monkeypatch.setattr(main, setup, noop)
+
+    async def refresh(force=False):
+        pass
+    monkeypatch.setattr(main, "refresh_active_vendor_index", refresh)
+
+    for name in JOBS:
+        job = getattr(main, name)
+
+        async def stop(name=name):
+            calls.append(name)
+        monkeypatch.setattr(job, "start", lambda: None)
+        monkeypatch.setattr(job, "stop", stop)
+    return calls
+
+
+def run_lifespan():
+    async def run():
+        async with lifespan(app):
+            pass
+    asyncio.run(run())
+
+
+class TestShutdown:
+    def test_stops_every_job_then_closes_mongodb(self, calls):
+        run_lifespan()
+        assert calls == JOBS + ["close_db"]
+
+    def test_failing_job_does_not_stop_the_rest(self, calls, monkeypatch):
+        async def broken():
+            calls.append("location_history")
+            raise ConnectionError("MongoDB is down")
+        monkeypatch.setattr(main.location_history, "stop", broken)
+
+        run_lifespan()
+        assert calls == JOBS + ["close_db"]
+
+    def test_mongodb_is_closed_on_unexpected_errors(self, calls, monkeypatch):
+        async def cancelled():
+            raise asyncio.CancelledError()
+        monkeypatch.setattr(main.event_buffer, "stop", cancelled)
+
+        with pytest.raises(asyncio.CancelledError):
+            run_lifespan()
+        assert calls[-1] == "close_db"
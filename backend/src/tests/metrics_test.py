@@ -0,0 +1,81 @@
+import sys
+import os
+
+from fastapi import APIRouter, FastAPI
+from fastapi.testclient import TestClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.middleware.metrics import MetricsMiddleware, request_duration, requests_total
+from src.utils.metrics import Counter, Gauge, Histogram, HistogramVec, Registry
+
+
+class TestHistogram:
+    def test_quantiles(self):
+        histogram = Histogram((0.1, 0.2, 0.4))
+        for value in (0.05, 0.15, 0.15, 0.3):
+            histogram.observe(value)
+        assert histogram.count == 4
+        assert 0.1 <= histogram.quantile(0.5) <= 0.2
+        assert histogram.snapshot()["count"] == 4
+
+
+class TestRegistry:
+    def test_render(self):
+        registry = Registry()
+        counter = Counter("jobs_total", "Jobs run.", ("status",), registry=registry)
+        counter.inc("ok")
+        counter.inc("ok")
+        Gauge("queue_depth", "Jobs waiting.", func=lambda: 3, registry=registry)
+        HistogramVec("job_seconds", "Job duration.", buckets=(0.1, 1.0), registry=registry).labels().observe(0.5)
+
+        text = registry.render()
+        assert "# TYPE jobs_total counter" in text
+        assert 'jobs_total{status="ok"} 2' in text
+        assert "queue_depth 3" in text
+        assert 'job_seconds_bucket{le="0.1"} 0' in text
+        assert 'job_seconds_bucket{le="1"} 1' in text
+        assert 'job_seconds_bucket{le="+Inf"} 1' in text
+        assert "job_seconds_count 1" in text
+
+    def test_label_values_are_escaped(self):
+        registry = Registry()
+        Counter("paths_total", "Paths.", ("path",), registry=registry).inc('a"b')
+        assert 'paths_total{path="a\\"b"} 1' in registry.render()
+
+
+class TestMetricsMiddleware:
+    def test_labels_by_route_template(self):
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/things/{thing_id}")
+        def get_thing(thing_id: str):
+            return {"id": thing_id}
+
+        client = TestClient(app)
+        before = requests_total.values.get(("GET", "/things/{thing_id}", "200"), 0)
+        client.get("/things/1")
+        client.get("/things/2")
+        client.get("/missing")
+
+        assert requests_total.values[("GET", "/things/{thing_id}", "200")] == before + 2
+        assert ("GET", "/things/1", "200") not in requests_total.values
+        assert requests_total.values[("GET", "<unmatched>", "404")] >= 1
+        assert request_duration.labels("GET", "/things/{thing_id}").count >= 2
+
+    def test_routes_from_included_routers(self):
+        router = APIRouter(prefix="/widgets")
+
+        @router.get("/{widget_id}")
+        def get_widget(widget_id: str):
+            return {"id": widget_id}
+
+        app = FastAPI()
+        app.add_middleware(MetricsMiddleware)
+        app.include_router(router)
+
+        client = TestClient(app)
+        before = requests_total.values.get(("GET", "/widgets/{widget_id}", "200"), 0)
+        client.get("/widgets/1")
+
+        assert requests_total.values[("GET", "/widgets/{widget_id}", "200")] == before + 1
@@ -0,0 +1,60 @@
+import sys
+import os
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+import src.config.mongo_monitoring as mongo_monitoring
+from src.config.mongo_monitoring import CommandMonitor, command_duration, slow_commands, redact, _plan_stages
+
+
+def _started(command_name, command, request_id=1):
+    return SimpleNamespace(command_name=command_name, command=command, connection_id=("localhost", 27017),
+                           request_id=request_id, database_name="test")
+
+
+def _succeeded(command_name, micros, request_id=1):
+    return SimpleNamespace(command_name=command_name, duration_micros=micros, connection_id=("localhost", 27017),
+                           request_id=request_id, database_name="test")
+
+
+class TestRedact:
+    def test_values_are_hidden(self):
+        shape = redact({"org_name": "Room In The Inn", "_id": {"$in": [1, 2]}, "$or": [{"a": 1}, {"b": {"$gt": 2}}]})
+        assert shape == {"org_name": "?", "_id": {"$in": "?"}, "$or": [{"a": "?"}, {"b": {"$gt": "?"}}]}
+
+    def test_pipeline(self):
+        assert redact([{"$match": {"removed": False}}, {"$limit": 10}]) == [{"$match": {"removed": "?"}}, {"$limit": "?"}]
+
+
+class TestCommandMonitor:
+    def test_records_duration_by_collection(self):
+        monitor = CommandMonitor()
+        before = command_duration.labels("monitor_test", "find").count
+        monitor.started(_started("find", {"find": "monitor_test", "filter": {"removed": False}}))
+        monitor.succeeded(_succeeded("find", 2000))
+        assert command_duration.labels("monitor_test", "find").count == before + 1
+
+    def test_ignores_commands_without_collection(self):
+        monitor = CommandMonitor()
+        monitor.started(_started("ping", {"ping": 1}))
+        monitor.succeeded(_succeeded("ping", 100))
+        assert ("admin", "ping") not in command_duration.children
+
+    def test_logs_slow_commands(self, monkeypatch, caplog):
+        monkeypatch.setattr(mongo_monitoring, "MONGO_SLOW_COMMAND_MS", 10)
+        monitor = CommandMonitor()
+        monitor.started(_started("update", {"update": "monitor_test", "updates": [{"q": {"email": "a@b.c"}, "u": {}}]}, 2))
+        monitor.succeeded(_succeeded("update", 50_000, 2))
+
+        assert slow_commands.values[("monitor_test", "update")] >= 1
+        assert '{"email": "?"}' in caplog.text
+        assert "a@b.c" not in caplog.text
+
+
+class TestPlanStages:
+    def test_find(self):
+        explain = {"queryPlanner": {"winningPlan": {"stage": "FETCH", "inputStage": {"stage": "IXSCAN", "indexName": "removed_1"}}}}
+        assert _plan_stages(explain) == ["FETCH", "IXSCAN removed_1"]
+
+    def test_collection_scan(self):
+        assert _plan_stages({"queryPlanner": {"winningPlan": {"stage": "COLLSCAN"}}}) == ["COLLSCAN"]
@@ -13,6 +13,7 @@ load_dotenv()
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from main import app
 import src.config.database as db_module
+import src.controllers.resource_changes as resource_changes
 from src.admin.middleware import get_current_admin
 
 TEST_DB = "the-contributor-test"
@@ -31,6 +32,8 @@ def client():
     db = sync_client[TEST_DB]
     db["resources"].delete_many({})
     db["pending"].delete_many({})
+    db["resource_changes"].delete_many({})
+    db["counters"].delete_many({})
     sync_client.close()
 
     db_module.DB_NAME = "the-contributor"
@@ -93,7 +96,139 @@ class TestGetResources:
         assert "resources" in data
         assert data["active"] is False
         assert isinstance(data["resources"], list)
-    
+
+    def test_not_modified(self, client):
+        """
+        SAME ETAG GIVES A 304 UNTIL THE CATALOG CHANGES
+        """
+        etag = client.get("/resources/").headers["etag"]
+
+        assert client.get("/resources/", headers={"If-None-Match": etag}).status_code == 304
+        assert client.get("/resources/?fields=full", headers={"If-None-Match": etag}).status_code == 200
+
+    def test_compressed(self, client):
+        """
+        LARGE RESPONSES ARE COMPRESSED WHEN THE CLIENT ACCEPTS IT
+        """
+        response = client.get("/resources/?fields=full", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        if len(response.content) >= 1024:
+            assert response.headers["content-encoding"] == "gzip"
+
+    def test_write_during_coalesced_read(self, monkeypatch):
+        """
+        A REQUEST AFTER A WRITE DOESN'T SHARE A READ STARTED BEFORE IT
+        """
+        import asyncio
+        from starlette.requests import Request
+        import src.routes.resource_routes as resource_routes
+
+        seq = {"value": 1}
+        reads = []
+
+        async def fake_current_seq():
+            return seq["value"]
+
+        async def fake_get_resources(collection, active, check_removed, fields):
+            read_at = seq["value"]
+            reads.append(read_at)
+            await asyncio.sleep(0.05)
+            return {"success": True, "active": active, "resources": [{"seq": read_at}]}
+
+        monkeypatch.setattr(resource_routes, "current_seq", fake_current_seq)
+        monkeypatch.setattr(resource_routes, "get_resources", fake_get_resources)
+        monkeypatch.setattr(resource_routes, "get_resources_collection", lambda: None)
+
+        def request():
+            return Request({"type": "http", "method": "GET", "path": "/resources/", "headers": [], "query_string": b""})
+
+        async def main():
+            first = asyncio.create_task(resource_routes.route_get_resources(request()))
+            await asyncio.sleep(0.01)
+            seq["value"] = 2
+            second = await resource_routes.route_get_resources(request())
+            return await first, second
+
+        first, second = asyncio.run(main())
+
+        assert reads == [1, 2]
+        assert '"resources-1-' in first.headers["etag"] and json.loads(first.body)["resources"] == [{"seq": 1}]
+        assert '"resources-2-' in second.headers["etag"] and json.loads(second.body)["resources"] == [{"seq": 2}]
+
+
+class TestResourceFields:
+    """
+    GET /resources/?fields= PARAMETER
+    """
+
+    @pytest.fixture(scope="class")
+    def org_name(self, client):
+        org_name = unique_org_name()
+        response = client.post("/resources/",
+            json={
+                "name": TEST_RESOURCE_NAME,
+                "email": TEST_RESOURCE_EMAIL,
+                "phone": TEST_RESOURCE_PHONE,
+                "org_name": org_name,
+                "category": "Urgent Needs",
+                "subcategory": "Food",
+                "services": "Hot meals every weekday",
+                "removed": False,
+                "created_at": "2024-01-01T00:00:00",
+                "city": "Nashville"
+            })
+        assert response.status_code == 200
+        return org_name
+
+    def _find(self, resources, org_name):
+        return next(r for r in resources if r.get("org_name") == org_name)
+
+    def test_summary_by_default(self, client, org_name):
+        """
+        LIST RETURNS THE SUMMARY FIELDS UNLESS ASKED OTHERWISE
+        """
+        response = client.get("/resources/")
+
+        assert response.status_code == 200
+        resource = self._find(response.json()["resources"], org_name)
+        assert resource["city"] == "Nashville"
+        assert isinstance(resource["_id"], str)
+        for field in ("services", "name", "email", "phone"):
+            assert field not in resource
+
+    def test_full(self, client, org_name):
+        """
+        fields=full RETURNS WHOLE DOCUMENTS
+        """
+        response = client.get("/resources/?fields=full")
+
+        assert response.status_code == 200
+        resource = self._find(response.json()["resources"], org_name)
+        assert resource["services"] == "Hot meals every weekday"
+        assert resource["email"] == TEST_RESOURCE_EMAIL
+
+    def test_summary_plus_fields(self, client, org_name):
+        """
+        SUMMARY CAN BE EXTENDED WITH EXTRA FIELDS
+        """
+        response = client.get("/resources/?fields=summary,services")
+
+        assert response.status_code == 200
+        resource = self._find(response.json()["resources"], org_name)
+        assert resource["services"] == "Hot meals every weekday"
+        assert resource["category"] == "Urgent Needs"
+        assert "email" not in resource
+
+    def test_unknown_field(self, client):
+        """
+        UNKNOWN FIELDS ARE REJECTED
+        """
+        response = client.get("/resources/?fields=org_name,password")
+
+        assert response.status_code == 400
+        assert "password" in response.json()["detail"]
+
 
 class TestCreateResource:
     """
@@ -240,6 +375,242 @@ class TestGetOneResource:
         assert data_name["resource"] is None
 
 
+class TestBatchResources:
+    """
+    POST /resources/batch ENDPOINT
+    """
+
+    def _create(self, client, org_name):
+        response = client.post("/resources/",
+            json={
+                "name": TEST_RESOURCE_NAME,
+                "email": TEST_RESOURCE_EMAIL,
+                "phone": TEST_RESOURCE_PHONE,
+                "org_name": org_name,
+                "category": "Urgent Needs",
+                "subcategory": "Personal Care",
+                "group": "Showers",
+                "removed": False,
+                "created_at": "2024-01-01T00:00:00",
+            }
+        )
+        return response.json()["resource"]["_id"]
+
+    def test_batch_in_request_order(self, client):
+        """
+        RESOURCES COME BACK IN REQUEST ORDER, MISSING ONES ARE LISTED
+        """
+        first, second = unique_org_name(), unique_org_name()
+        first_id = self._create(client, first)
+        self._create(client, second)
+        missing_id = "507f1f77bcf86cd799439011"
+
+        response = client.post("/resources/batch",
+            json={"ids": [missing_id, first_id], "org_names": [second, "No Such Org"]})
+
+        assert response.status_code == 200
+        data = response.json()
+        assert [r["org_name"] for r in data["resources"]] == [first, second]
+        assert data["resources"][0]["_id"] == first_id
+        assert data["missing"] == {"ids": [missing_id], "org_names": ["No Such Org"]}
+
+    def test_batch_fields(self, client):
+        """
+        BATCH SUPPORTS THE fields PROJECTION
+        """
+        org_name = unique_org_name()
+        self._create(client, org_name)
+
+        response = client.post("/resources/batch", json={"org_names": [org_name], "fields": "summary"})
+
+        assert response.status_code == 200
+        resource = response.json()["resources"][0]
+        assert resource["org_name"] == org_name
+        assert "email" not in resource
+
+    def test_batch_leaves_out_removed(self, client):
+        """
+        REMOVED RESOURCES ARE MISSING UNLESS active IS FALSE
+        """
+        org_name = unique_org_name()
+        resource_id = self._create(client, org_name)
+        client.patch(f"/resources/{resource_id}", json={"removed": True})
+
+        data = client.post("/resources/batch", json={"ids": [resource_id], "org_names": [org_name]}).json()
+        assert data["resources"] == []
+        assert data["missing"] == {"ids": [resource_id], "org_names": [org_name]}
+
+        data = client.post("/resources/batch", json={"ids": [resource_id], "active": False}).json()
+        assert [r["_id"] for r in data["resources"]] == [resource_id]
+
+    def test_batch_empty(self, client):
+        """
+        EMPTY BATCH IS REJECTED
+        """
+        response = client.post("/resources/batch", json={})
+
+        assert response.status_code == 400
+
+    def test_batch_too_large(self, client):
+        """
+        BATCH OVER THE LIMIT IS REJECTED
+        """
+        response = client.post("/resources/batch", json={"org_names": [f"Org {i}" for i in range(1000)]})
+
+        assert response.status_code == 400
+
+
+class TestResourceChanges:
+    """
+    GET /resources/changes ENDPOINT
+    """
+
+    @pytest.fixture(autouse=True)
+    def no_settle_delay(self, monkeypatch):
+        monkeypatch.setattr(resource_changes, "CHANGE_LOG_SETTLE_SECONDS", 0)
+
+    def _sync(self, client, since):
+        """Follow has_more to the end; returns the final seq and all upserts and deletions."""
+        upserts, deleted = {}, []
+        while True:
+            data = client.get(f"/resources/changes?since={since}").json()
+            assert data["full_resync"] is False
+            upserts.update({r["_id"]: r for r in data["upserts"]})
+            deleted.extend(data["deleted"])
+            since = data["seq"]
+            if not data["has_more"]:
+                return since, upserts, deleted
+
+    def test_changes_since_last_sync(self, client):
+        """
+        CREATES AND REMOVALS SHOW UP AS UPSERTS AND TOMBSTONES
+        """
+        since, _, _ = self._sync(client, 0)
+
+        org_name = unique_org_name()
+        create_response = client.post("/resources/",
+            json={
+                "name": TEST_RESOURCE_NAME,
+                "email": TEST_RESOURCE_EMAIL,
+                "phone": TEST_RESOURCE_PHONE,
+                "org_name": org_name,
+                "removed": False,
+                "created_at": "2024-01-01T00:00:00",
+            }
+        )
+        resource_id = create_response.json()["resource"]["_id"]
+
+        since, upserts, deleted = self._sync(client, since)
+        assert upserts[resource_id]["org_name"] == org_name
+        assert "email" not in upserts[resource_id]
+        assert deleted == []
+
+        client.patch(f"/resources/{resource_id}", json={"removed": True})
+
+        _, upserts, deleted = self._sync(client, since)
+        assert resource_id not in upserts
+        assert deleted == [resource_id]
+
+    def test_documents_without_removed_flag(self, client):
+        """
+        OLDER DOCUMENTS WITHOUT A `removed` FIELD STILL SYNC
+        """
+        since, _, _ = self._sync(client, 0)
+
+        sync_client = SyncMongoClient(os.getenv("MONGODB_URI"))
+        resource_id = str(sync_client[TEST_DB]["resources"].insert_one({"org_name": unique_org_name()}).inserted_id)
+        sync_client.close()
+        client.portal.call(resource_changes.record_changes, [resource_id])
+
+        _, upserts, deleted = self._sync(client, since)
+        assert "removed" not in upserts[resource_id]
+        assert deleted == []
+
+    def test_since_in_the_future(self, client):
+        """
+        AN UNKNOWN CURSOR ASKS FOR A FULL RESYNC
+        """
+        response = client.get("/resources/changes?since=999999999")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["full_resync"] is True
+        assert data["seq"] == 0
+
+
+class TestResourceBundle:
+    """
+    GET /resources/bundle ENDPOINT
+    """
+
+    def test_bundle(self, client):
+        """
+        BUNDLE HAS THE ACTIVE CATALOG WITHOUT SUBMITTER DETAILS
+        """
+        response = client.get("/resources/bundle", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        data = response.json()
+        assert data["version"] == int(response.headers["x-catalog-version"])
+        for resource in data["resources"]:
+            assert "email" not in resource
+
+    def test_not_modified(self, client):
+        """
+        SAME ETAG GIVES A 304
+        """
+        etag = client.get("/resources/bundle").headers["etag"]
+
+        response = client.get("/resources/bundle", headers={"If-None-Match": etag})
+
+        assert response.status_code == 304
+
+    def test_range(self, client):
+        """
+        DOWNLOADS CAN BE RESUMED WITH RANGE
+        """
+        response = client.get("/resources/bundle", headers={"Range": "bytes=0-9"})
+
+        assert response.status_code == 206
+        assert response.headers["content-range"].startswith("bytes 0-9/")
+
+    def test_uncompressed(self, client):
+        """
+        CLIENTS THAT TAKE NEITHER ENCODING GET THE PLAIN FILE, OR A 406 IF THEY REFUSE THAT TOO
+        """
+        response = client.get("/resources/bundle", headers={"Accept-Encoding": "gzip;q=0, identity"})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert response.headers["etag"].endswith('-identity"')
+        assert "resources" in json.loads(response.content)
+
+        response = client.get("/resources/bundle", headers={"Accept-Encoding": "gzip;q=0, br;q=0, identity;q=0"})
+        assert response.status_code == 406
+
+    def test_prune_keeps_recently_superseded_bundles(self, tmp_path, monkeypatch):
+        """
+        OLD BUNDLES ARE ONLY DELETED ONCE THEY WERE SUPERSEDED LONG ENOUGH AGO
+        """
+        import time
+        from src.controllers import resource_bundle
+
+        monkeypatch.setattr(resource_bundle, "CATALOG_BUNDLE_GRACE_SECONDS", 300)
+        bundle = resource_bundle.CatalogBundle(str(tmp_path))
+        now = time.time()
+        for version, age in ((1, 3600), (2, 1000), (3, 60), (4, 0), (5, 0)):
+            path = bundle.path(version, "gzip")
+            open(path, "wb").close()
+            os.utime(path, (now - age, now - age))
+
+        bundle._prune(4)
+
+        remaining = sorted(int(name.split("-")[1].split(".")[0]) for name in os.listdir(tmp_path))
+        # 1 was superseded by 2 long ago; 2 only a minute ago, by 3; 5 is newer
+        assert remaining == [2, 3, 4, 5]
+
+
 class TestUpdateResource:
     """
     PATCH /resources/{resource_id} ENDPOINT
@@ -273,6 +644,35 @@ class TestUpdateResource:
         data = response.json()
         assert data["success"] is True
         assert data["modified_count"] == 1
+
+    def test_update_invalidates_cached_resource(self, client):
+        """
+        GET AFTER UPDATE RETURNS THE NEW VALUES, NOT THE CACHED ONES
+        """
+        org_name = unique_org_name()
+        create_response = client.post("/resources/",
+            json={
+                "name": TEST_RESOURCE_NAME,
+                "email": TEST_RESOURCE_EMAIL,
+                "phone": TEST_RESOURCE_PHONE,
+                "org_name": org_name,
+                "category": "Urgent Needs",
+                "subcategory": "Personal Care",
+                "group": "Showers",
+                "removed": False,
+                "created_at": "2024-01-01T00:00:00",
+            }
+        )
+        resource_id = create_response.json()["resource"]["_id"]
+
+        # warm the cache under both keys
+        assert client.get(f"/resources/{resource_id}").json()["resource"]["email"] == TEST_RESOURCE_EMAIL
+        assert client.get(f"/resources/{org_name}?search_by=org_name").json()["resource"]["email"] == TEST_RESOURCE_EMAIL
+
+        client.patch(f"/resources/{resource_id}", json={"email": "cached@example.com"})
+
+        assert client.get(f"/resources/{resource_id}").json()["resource"]["email"] == "cached@example.com"
+        assert client.get(f"/resources/{org_name}?search_by=org_name").json()["resource"]["email"] == "cached@example.com"
     
     def test_update_nonexistent_resource(self, client):
         """
@@ -0,0 +1,45 @@
+import sys
+import os
+import json
+from datetime import datetime, timezone
+
+import pytest
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.schemas.resource import CategoryChoices
+from src.utils.responses import FastJSONResponse, dumps
+
+
+class TestFastJSONResponse:
+    def test_matches_fastapi_encoding(self):
+        content = {
+            "success": True,
+            "resources": [
+                {
+                    "_id": "507f1f77bcf86cd799439011",
+                    "org_name": "Café Nashville",
+                    "created_at": datetime(2025, 11, 1, 8, 30, tzinfo=timezone.utc),
+                    "category": CategoryChoices.URGENT,
+                    "coordinates": {"latitude": 36.16, "longitude": -86.78},
+                    "phone": None,
+                }
+            ],
+        }
+        expected = JSONResponse(jsonable_encoder(content)).body
+        assert FastJSONResponse(content).body == expected
+
+    def test_object_id_as_string(self):
+        object_id = ObjectId()
+        assert json.loads(dumps({"_id": object_id})) == {"_id": str(object_id)}
+
+    def test_media_type(self):
+        response = FastJSONResponse({"resources": []})
+        assert response.headers["content-type"] == "application/json"
+        assert json.loads(response.body) == {"resources": []}
+
+    def test_unknown_type_raises(self):
+        with pytest.raises(TypeError):
+            dumps({"value": object()})
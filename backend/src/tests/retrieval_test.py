@@ -0,0 +1,77 @@
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.chatbot.retrieval import ResourceIndex, summarize, tokenize
+
+
+def _resource(_id, org_name, **fields):
+    return {"_id": _id, "org_name": org_name, **fields}
+
+
+class TestResourceIndex:
+    def setup_method(self):
+        self.index = ResourceIndex()
+        self.index.upsert(_resource("1", "Room In The Inn", category="Shelter", services="Overnight shelters and showers"))
+        self.index.upsert(_resource("2", "Second Harvest", category="Food", services="Hot meals and food boxes"))
+        self.index.upsert(_resource("3", "Legal Aid Society", category="Legal", services="Help with evictions"))
+
+    def test_tokenize_folds_plurals_and_drops_stopwords(self):
+        assert tokenize("Where are the Shelters?") == ["shelter"]
+
+    def test_best_match_first(self):
+        results = self.index.search("I need a shelter tonight", 2)
+        assert len(results) == 1
+        assert results[0][1].startswith("Room In The Inn")
+
+    def test_no_match(self):
+        assert self.index.search("zebra", 5) == []
+
+    def test_upsert_replaces_terms(self):
+        version = self.index.version
+        self.index.upsert(_resource("2", "Second Harvest", category="Food", services="Groceries"))
+        assert self.index.version > version
+        assert self.index.search("hot meals", 5) == []
+        assert self.index.search("groceries", 5)[0][1].startswith("Second Harvest")
+
+    def test_unchanged_upsert_keeps_version(self):
+        version = self.index.version
+        self.index.upsert(_resource("2", "Second Harvest", category="Food", services="Hot meals and food boxes"))
+        self.index.remove("4")
+        assert self.index.version == version
+
+    def test_reload_of_unchanged_catalog_keeps_version(self, monkeypatch):
+        import asyncio
+        import src.chatbot.retrieval as retrieval
+
+        resources = [
+            _resource("1", "Room In The Inn", category="Shelter", services="Overnight shelters and showers"),
+            _resource("2", "Second Harvest", category="Food", services="Hot meals and food boxes"),
+        ]
+
+        class FakeCollection:
+            def find(self, query, projection):
+                return self
+
+            async def to_list(self, length=None):
+                return resources
+
+        monkeypatch.setattr(retrieval, "get_resources_collection", lambda: FakeCollection())
+
+        asyncio.run(self.index.refresh())
+        assert len(self.index) == 2
+        assert self.index.search("eviction", 5) == []
+
+        version = self.index.version
+        self.index.mark_dirty(None)
+        asyncio.run(self.index.refresh())
+        assert self.index.version == version
+
+    def test_remove(self):
+        self.index.remove("3")
+        assert len(self.index) == 2
+        assert self.index.search("eviction", 5) == []
+
+    def test_summary_is_clipped(self):
+        summary = summarize(_resource("4", "Long", services="x" * 1000))
+        assert len(summary) < 250
@@ -0,0 +1,59 @@
+import random
+import sys
+import os
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from src.vendor.spatial_index import VendorGrid
+from src.utils.geo import haversine_km
+
+NASHVILLE = (36.1627, -86.7816)
+
+
+def brute_force_nearest(points, lat, lng, k):
+    return sorted(haversine_km(lat, lng, p_lat, p_lng) for p_lat, p_lng in points.values())[:k]
+
+
+class TestVendorGrid:
+    def test_empty_index(self):
+        grid = VendorGrid()
+        assert grid.nearest(*NASHVILLE, k=5) == []
+
+    def test_upsert_move_remove(self):
+        grid = VendorGrid()
+        grid.upsert("0001", *NASHVILLE, name="Vendor One")
+        assert "0001" in grid
+
+        grid.move("0001", 36.2, -86.7)
+        entry = grid.nearest(36.2, -86.7, k=1)[0][1]
+        assert entry["name"] == "Vendor One"
+        assert (entry["latitude"], entry["longitude"]) == (36.2, -86.7)
+
+        assert grid.move("9999", 36.2, -86.7) is False
+        assert "9999" not in grid
+
+        grid.remove("0001")
+        assert len(grid) == 0
+        assert grid.nearest(*NASHVILLE, k=1) == []
+
+    def test_fewer_vendors_than_k(self):
+        grid = VendorGrid()
+        grid.upsert("0001", 36.0, -86.0)
+        grid.upsert("0002", 37.0, -87.0)
+        assert len(grid.nearest(*NASHVILLE, k=10)) == 2
+
+    def test_matches_brute_force(self):
+        rng = random.Random(42)
+        grid = VendorGrid(cell_degrees=0.01)
+        points = {}
+        for i in range(2000):
+            lat = NASHVILLE[0] + rng.uniform(-0.3, 0.3)
+            lng = NASHVILLE[1] + rng.uniform(-0.3, 0.3)
+            points[f"{i:04d}"] = (lat, lng)
+            grid.upsert(f"{i:04d}", lat, lng)
+
+        for _ in range(50):
+            lat = NASHVILLE[0] + rng.uniform(-0.4, 0.4)
+            lng = NASHVILLE[1] + rng.uniform(-0.4, 0.4)
+            k = rng.randint(1, 20)
+            result = [distance for distance, _ in grid.nearest(lat, lng, k)]
+            assert result == brute_force_nearest(points, lat, lng, k)
@@ -74,3 +74,19 @@ class TestPublicRoutes:
         response = client.get("/vendors/active")
         assert response.status_code == 200
         assert "vendors" in response.json()
+
+    def test_get_nearest_vendors(self, client):
+        response = client.get("/vendors/nearest", params={"lat": 36.16, "lng": -86.78, "k": 3})
+        assert response.status_code == 200
+        vendors = response.json()["vendors"]
+        assert len(vendors) <= 3
+        distances = [v["distance_km"] for v in vendors]
+        assert distances == sorted(distances)
+
+    def test_get_nearest_vendors_missing_coordinates(self, client):
+        response = client.get("/vendors/nearest", params={"lat": 36.16})
+        assert response.status_code == 422
+
+    def test_get_nearest_vendors_invalid_k(self, client):
+        response = client.get("/vendors/nearest", params={"lat": 36.16, "lng": -86.78, "k": 0})
+        assert response.status_code == 422
@@ -0,0 +1,74 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from src.config.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class PeriodicTask:
+    """
+    Runs an async callable every `interval` seconds on the event loop until stopped.
+
+    `trigger()` wakes the task early, e.g. when a buffer fills up before the
+    interval has passed. Exceptions raised by the callable are logged and the
+    task keeps running.
+
+    `on_stop`, if given, is awaited once the task has been stopped, e.g. to
+    release a lease the callable holds.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        interval: float,
+        func: Callable[[], Awaitable],
+        on_stop: Callable[[], Awaitable] | None = None,
+    ):
+        self.name = name
+        self.interval = interval
+        self.func = func
+        self.on_stop = on_stop
+        self._task: asyncio.Task | None = None
+        self._wakeup: asyncio.Event | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self):
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name=self.name)
+
+    def trigger(self):
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def stop(self):
+        """Cancel the task and wait for it to finish, then run `on_stop`. Does not run the callable again."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        self._wakeup = None
+        if self.on_stop is not None:
+            await self.on_stop()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+            try:
+                await self.func()
+            except Exception as e:
+                logger.error(f"Background task '{self.name}' failed: {e}", exc_info=True)
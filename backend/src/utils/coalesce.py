@@ -0,0 +1,45 @@
+"""
+Single-flight coalescing for hot read routes.
+
+When an app update or a push notification goes out, many clients make the
+same request at the same moment. Routes that wrap their database reads in
+`coalesce()` run one read per distinct request at a time and hand its result
+to everyone who asked while it was running.
+
+Routes whose key can't tell pre-write data from post-write data call
+`note_write()` after each write, so a read issued once the write has
+returned doesn't join one that started before it.
+"""
+from typing import Awaitable, Callable, Hashable
+
+from src.utils.metrics import Counter
+from src.utils.singleflight import SingleFlight
+
+read_requests = SingleFlight()
+
+coalesced_requests = Counter(
+    "http_coalesced_requests_total",
+    "Read requests that shared an identical in-flight request's result, by route.",
+    ("route",),
+)
+
+# writes noted per route by this worker
+_write_generations: dict[str, int] = {}
+
+
+def note_write(route: str):
+    """Call after a write that `route` reads, once it has completed."""
+    _write_generations[route] = _write_generations.get(route, 0) + 1
+
+
+async def coalesce(route: str, key: Hashable, func: Callable[[], Awaitable]):
+    """
+    Run `func`, or wait for the identical call already running for `route` and `key`.
+
+    The result is shared between the callers, so it must not be modified.
+    """
+    flight = (route, _write_generations.get(route, 0), key)
+    # in_flight() and do() see the same state: nothing awaits in between
+    if read_requests.in_flight(flight):
+        coalesced_requests.inc(route)
+    return await read_requests.do(flight, func)
@@ -0,0 +1,73 @@
+"""
+gzip and brotli encoding of response bodies, and Accept-Encoding negotiation.
+
+brotli is optional: without the `brotli` package installed, everything is
+served gzip-compressed.
+"""
+import gzip
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+# preferred first, used to break ties between equally weighted encodings
+ENCODINGS = ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def compress(data: bytes, encoding: str, level: int | None = None) -> bytes:
+    """
+    Compress `data` for a Content-Encoding of "gzip" or "br".
+
+    `level` is the gzip level (1-9) or brotli quality (0-11); None picks a
+    default that suits compressing a response on the fly.
+    """
+    if encoding == "gzip":
+        # mtime=0 so the same input always gives the same bytes
+        return gzip.compress(data, compresslevel=6 if level is None else level, mtime=0)
+    if encoding == "br" and brotli is not None:
+        return brotli.compress(data, quality=5 if level is None else level)
+    raise ValueError(f"Unsupported encoding '{encoding}'")
+
+
+def negotiate(accept_encoding: str | None, available: tuple[str, ...] = ENCODINGS) -> str | None:
+    """
+    Pick the encoding to use from the request's Accept-Encoding header.
+
+    Returns the available encoding the client weights highest (ties go to
+    the one listed first in `available`), or None if it accepts none of them.
+    """
+    if not accept_encoding:
+        return None
+
+    weights = _weights(accept_encoding)
+    best, best_weight = None, 0.0
+    for encoding in available:
+        weight = weights.get(encoding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = encoding, weight
+    return best
+
+
+def accepts_identity(accept_encoding: str | None) -> bool:
+    """Whether the client takes an uncompressed body; only "identity;q=0" or "*;q=0" rule it out."""
+    if not accept_encoding:
+        return True
+    weights = _weights(accept_encoding)
+    return weights.get("identity", weights.get("*", 1.0)) > 0
+
+
+def _weights(accept_encoding: str) -> dict[str, float]:
+    weights = {}
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.partition(";")
+        name = name.strip()
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[name] = weight
+    return weights
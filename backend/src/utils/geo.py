@@ -0,0 +1,83 @@
+import heapq
+import math
+
+EARTH_RADIUS_KM = 6371.0088
+
+# length of one degree of latitude (and of longitude at the equator)
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine_km(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance in kilometres between two lat/lng points."""
+    phi1 = math.radians(lat1)
+    phi2 = math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lng2 - lng1)
+
+    a = math.sin(d_phi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def _deviation(point: tuple, start: tuple, end: tuple, lng_scale: float) -> float:
+    """Distance (in scaled degrees) from `point` to the segment start-end, all (lat, lng)."""
+    px, py = point[1] * lng_scale, point[0]
+    ax, ay = start[1] * lng_scale, start[0]
+    bx, by = end[1] * lng_scale, end[0]
+
+    dx, dy = bx - ax, by - ay
+    length_sq = dx * dx + dy * dy
+    if length_sq == 0:
+        return math.hypot(px - ax, py - ay)
+
+    t = max(0.0, min(1.0, ((px - ax) * dx + (py - ay) * dy) / length_sq))
+    return math.hypot(px - (ax + t * dx), py - (ay + t * dy))
+
+
+def simplify_track(points: list[tuple], max_points: int) -> list[int]:
+    """
+    Pick at most `max_points` points of a track that best preserve its shape.
+
+    Greedy Ramer-Douglas-Peucker: start with the two endpoints and keep adding
+    the point that deviates most from the simplified line until the budget is
+    used up or the remaining points lie on the line.
+
+    Args:
+        points: (latitude, longitude) tuples in track order
+        max_points: point budget, at least 2
+
+    Returns:
+        sorted indices of the points to keep
+    """
+    n = len(points)
+    if n <= max_points:
+        return list(range(n))
+    if max_points < 2:
+        return [0][:max_points]
+
+    # equirectangular projection around the track's first point is plenty for city-scale tracks
+    lng_scale = math.cos(math.radians(points[0][0]))
+
+    def farthest(start: int, end: int):
+        best_index, best_deviation = None, 0.0
+        for i in range(start + 1, end):
+            deviation = _deviation(points[i], points[start], points[end], lng_scale)
+            if deviation > best_deviation:
+                best_index, best_deviation = i, deviation
+        return best_index, best_deviation
+
+    keep = {0, n - 1}
+    segments = []
+
+    def push(start: int, end: int):
+        index, deviation = farthest(start, end)
+        if index is not None:
+            heapq.heappush(segments, (-deviation, start, end, index))
+
+    push(0, n - 1)
+    while segments and len(keep) < max_points:
+        _, start, end, index = heapq.heappop(segments)
+        keep.add(index)
+        push(start, index)
+        push(index, end)
+
+    return sorted(keep)
@@ -0,0 +1,65 @@
+"""
+Deferred imports and construction for heavy third-party SDKs.
+
+Importing supabase, openai, gspread and friends takes hundreds of
+milliseconds each, which every worker used to pay at startup whether or
+not it ever served a route that needs them. These proxies put that off
+until first use.
+"""
+import importlib
+import threading
+from typing import Any, Callable
+
+
+class LazyModule:
+    """
+    Stands in for a module and imports it on first attribute access.
+
+    Works in `except` clauses too, e.g. `except auth_errors.AuthApiError:`,
+    since the expression is only evaluated when an exception is raised.
+    """
+
+    def __init__(self, name: str):
+        self._name = name
+        self._module = None
+
+    def __getattr__(self, attr: str) -> Any:
+        if self._module is None:
+            self._module = importlib.import_module(self._name)
+        return getattr(self._module, attr)
+
+    def __repr__(self) -> str:
+        return f"<lazy module {self._name!r}{' (loaded)' if self._module else ''}>"
+
+
+class LazyObject:
+    """
+    Stands in for an object built by `factory`, which is called on first
+    attribute access. Callers use it exactly like the object, e.g.
+    `supabase.auth.get_user(...)`.
+    """
+
+    def __init__(self, factory: Callable[[], Any]):
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_target", None)
+        object.__setattr__(self, "_lock", threading.Lock())
+
+    def _resolve(self) -> Any:
+        target = object.__getattribute__(self, "_target")
+        if target is None:
+            with object.__getattribute__(self, "_lock"):
+                target = object.__getattribute__(self, "_target")
+                if target is None:
+                    target = object.__getattribute__(self, "_factory")()
+                    object.__setattr__(self, "_target", target)
+        return target
+
+    def __getattr__(self, attr: str) -> Any:
+        return getattr(self._resolve(), attr)
+
+    def __setattr__(self, attr: str, value: Any):
+        setattr(self._resolve(), attr, value)
+
+    def __repr__(self) -> str:
+        target = object.__getattribute__(self, "_target")
+        return f"<lazy {target!r}>" if target is not None else "<lazy object (not built yet)>"
@@ -0,0 +1,41 @@
+import os
+import socket
+import uuid
+from datetime import datetime, timedelta, timezone
+
+from pymongo.errors import DuplicateKeyError
+
+from src.config.database import get_locks_collection
+
+# identifies this worker process as the owner of a lease
+WORKER_ID = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+
+
+async def acquire_lease(name: str, ttl_seconds: float) -> bool:
+    """
+    Take or renew a named lease shared by all workers.
+
+    A lease is a document in the "locks" collection owned by one worker until
+    it expires, so periodic jobs can make sure only one worker runs them.
+    Calling this again before the lease expires renews it.
+
+    Returns:
+        bool: True if this worker now holds the lease
+    """
+    now = datetime.now(timezone.utc)
+    try:
+        # matches only if we already own the lease or it has expired; otherwise
+        # the upsert collides with the existing document's _id
+        await get_locks_collection().update_one(
+            {"_id": name, "$or": [{"owner": WORKER_ID}, {"expires_at": {"$lte": now}}]},
+            {"$set": {"owner": WORKER_ID, "expires_at": now + timedelta(seconds=ttl_seconds)}},
+            upsert=True
+        )
+        return True
+    except DuplicateKeyError:
+        return False
+
+
+async def release_lease(name: str):
+    """Give up a lease held by this worker so another worker can take it immediately."""
+    await get_locks_collection().delete_one({"_id": name, "owner": WORKER_ID})
@@ -0,0 +1,22 @@
+from typing import Callable
+
+# callbacks taking the ids of the changed resources, or None when it isn't
+# known which resources changed (e.g. after seeding from Google Sheets)
+_listeners: list[Callable[[list[str] | None], None]] = []
+
+
+def on_resources_changed(listener: Callable[[list[str] | None], None]):
+    """Register a callback to run whenever resources are created or updated. Usable as a decorator."""
+    _listeners.append(listener)
+    return listener
+
+
+def resources_changed(resource_ids: list[str] | None = None):
+    """
+    Notify listeners (in-memory indexes and caches) that resources were written.
+
+    Listeners must be quick and must not raise; they should only mark state
+    as stale and refresh it later.
+    """
+    for listener in _listeners:
+        listener(resource_ids)
@@ -0,0 +1,62 @@
+import asyncio
+import contextlib
+from typing import Awaitable, Callable, Hashable
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key into one.
+
+    The first caller for a key runs the work; callers arriving while it is
+    still running wait for and share its result (or exception) instead of
+    repeating it.
+    """
+
+    def __init__(self):
+        self._calls: dict[Hashable, asyncio.Future] = {}
+        # number of callers that shared another caller's result
+        self.coalesced = 0
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._calls
+
+    @contextlib.contextmanager
+    def lead(self, key: Hashable):
+        """
+        Register the current caller as the one doing the work for `key`.
+
+        Yields a future the caller must resolve with its result. Use this
+        directly when the work can't be wrapped in a single awaitable, e.g.
+        a streamed reply; otherwise use `do()`.
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            yield future
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+                # marks the exception as retrieved, in case nobody was waiting for it
+                future.exception()
+            raise
+        finally:
+            # e.g. the leader was cancelled: followers run the work themselves
+            if not future.done():
+                future.cancel()
+            if self._calls.get(key) is future:
+                del self._calls[key]
+
+    async def do(self, key: Hashable, func: Callable[[], Awaitable]):
+        while (future := self._calls.get(key)) is not None:
+            self.coalesced += 1
+            try:
+                return await asyncio.shield(future)
+            except asyncio.CancelledError:
+                if not future.cancelled():
+                    # we were cancelled, not the leader
+                    raise
+
+        with self.lead(key) as future:
+            result = await func()
+            future.set_result(result)
+            return result
@@ -1,14 +1,15 @@
 from fastapi import APIRouter, HTTPException
-import gspread
 from datetime import datetime
 import asyncio
 from src.config.logger import get_logger
+from src.utils.lazy import LazyModule
 from src.controllers.resource_controller import seed_db
 from src.config.database import get_resources_collection
 from src.utils.utils import fetch_all_tabs, JSON_KEY_PATH, SHEET_ID
 
 router = APIRouter()
 logger = get_logger(__name__)
+gspread = LazyModule("gspread")
 
 
 @router.get("/sync_resources")
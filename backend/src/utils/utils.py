@@ -1,8 +1,5 @@
 import os
-import gspread
-from google.oauth2.service_account import Credentials
 from dotenv import load_dotenv, find_dotenv
-from opencage.geocoder import OpenCageGeocode
 from datetime import datetime, timezone
 from src.schemas.resource import Coordinates
 from src.config.logger import get_logger
@@ -21,6 +18,10 @@ def fetch_all_tabs() -> list[dict]:
     Opens the Google Sheet, iterates all tabs, and returns a flat list
     of raw resource dicts with 'subcategory' injected from the tab name.
     """
+    # the Google SDKs are slow to import and only needed when syncing from the sheet
+    import gspread
+    from google.oauth2.service_account import Credentials
+
     creds = Credentials.from_service_account_file(JSON_KEY_PATH, scopes=SCOPES)
     gc = gspread.authorize(creds)
     spreadsheet = gc.open_by_key(SHEET_ID)
@@ -39,6 +40,8 @@ def fetch_all_tabs() -> list[dict]:
     return all_resources
 
 def _geocode_address(address: str):
+    from opencage.geocoder import OpenCageGeocode
+
     geocoder = OpenCageGeocode()
     results = geocoder.geocode(address)
 
@@ -191,14 +194,14 @@ def extract_field_data(raw_data):
         'org_email': raw_data.get('q16_orgEmail')
     }
 
-    print(f'optional field data before checking for empty/None: {optional_fields}')
+    logger.debug("optional field data before checking for empty/None: %s", optional_fields)
     
     # Only add optional fields if they have values (not empty string or None)
     for key, value in optional_fields.items():
         if value:  # This filters out None and empty strings
             resource_data[key] = value
 
-    print(f"resource data after filtering: {resource_data}")
+    logger.debug("resource data after filtering: %s", resource_data)
     
     return resource_data
 
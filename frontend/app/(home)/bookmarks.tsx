@@ -9,6 +9,9 @@ import { useFocusEffect, useRouter } from "expo-router";
 import { ChevronLeft } from "lucide-react-native";
 import { useApi } from "@/lib/api";
 
+/** Most org names POST /resources/batch takes at once. */
+const BATCH_SIZE = 100;
+
 export default function Bookmarks() {
     const { bookmarkedOrgNames } = useBookmarks();
     const { makeRequest } = useApi();
@@ -37,21 +40,29 @@ export default function Bookmarks() {
             }
             let cancelled = false;
             setResolvedResources(undefined);
-            makeRequest("resources/", { method: "GET" }).then((result) => {
+            const batches: string[][] = [];
+            for (let i = 0; i < bookmarkedOrgNames.length; i += BATCH_SIZE) {
+                batches.push(bookmarkedOrgNames.slice(i, i + BATCH_SIZE));
+            }
+            Promise.all(
+                batches.map((org_names) =>
+                    makeRequest("resources/batch", {
+                        method: "POST",
+                        headers: { "Content-Type": "application/json" },
+                        body: JSON.stringify({ org_names, fields: "summary,services,phone" }),
+                    })
+                )
+            ).then((results) => {
                 if (cancelled) return;
-                if (result.error != null) {
+                if (results.some((result) => result.error != null)) {
                     setResolvedResources([]);
                     return;
                 }
-                const raw = result.resources;
-                const list = Array.isArray(raw)
-                    ? raw.filter((r: unknown): r is Resource => r != null && typeof r === "object")
-                    : [];
-                const byName = new Map(list.map((r) => [r.org_name, r]));
-                const ordered = bookmarkedOrgNames
-                    .map((name) => byName.get(name))
-                    .filter((r): r is Resource => r != null);
-                setResolvedResources(ordered);
+                // already in bookmark order; bookmarks that no longer exist are left out
+                const list = results
+                    .flatMap((result) => (Array.isArray(result.resources) ? result.resources : []))
+                    .filter((r: unknown): r is Resource => r != null && typeof r === "object");
+                setResolvedResources(list);
             });
             return () => {
                 cancelled = true;
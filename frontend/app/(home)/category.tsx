@@ -31,7 +31,7 @@ export default function Category() {
 
     const [resources, setResources] = useState<Resource[] | undefined>(undefined);
     useEffect(() => {
-        makeRequest("resources/", {
+        makeRequest("resources/?fields=summary,services,phone", {
             method: "GET"
         }).then((result) => {
             if (result.error != null) {
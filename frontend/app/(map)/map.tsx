@@ -160,7 +160,7 @@ export default function Map() {
     const { makeRequest } = useApi();
 
     useEffect(() => {
-        makeRequest("resources/", { method: "GET" }).then((result) => {
+        makeRequest("resources/?fields=summary,services,phone", { method: "GET" }).then((result) => {
             if (result.error != null) { setMapData([]); return; }
             const raw = result.resources;
             const list = Array.isArray(raw) ? raw.filter((r: unknown): r is Resource => r != null && typeof r === "object") : [];